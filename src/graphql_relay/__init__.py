@@ -15,6 +15,7 @@ from .connection.connection import (
     ConnectionConstructor,
     ConnectionCursor,
     ConnectionType,
+    CursorCodec,
     Edge,
     EdgeConstructor,
     EdgeType,
@@ -22,19 +23,77 @@ from .connection.connection import (
     PageInfo,
     PageInfoConstructor,
     PageInfoType,
+    TotalCount,
 )
 
 # Helpers for creating connections from arrays
 from .connection.array_connection import (
     connection_from_array,
     connection_from_array_slice,
+    cursor_cache,
     cursor_for_object_in_connection,
     cursor_to_offset,
+    get_connection_window,
     get_offset_with_default,
+    offset_to_compact_cursor,
     offset_to_cursor,
+    offsets_to_cursors,
+    use_compact_cursors,
+    ConnectionWindow,
+    OffsetEdge,
+    OffsetEdges,
     SizedSliceable,
+    SliceConnection,
 )
 
+# Cache for the lengths of result sets used by connections
+from .connection.count_cache import CountCache
+
+# Cache for converting between offsets and cursors
+from .connection.cursor_cache import CursorCache
+
+# Index for looking up the offsets of objects in sequences
+from .connection.object_index import ObjectIndex
+
+# Pluggable codecs for converting between cursors and offsets or keys
+from .connection.cursor_codec import (
+    cursor_codecs,
+    get_cursor_codec,
+    register_cursor_codec,
+    BaseCursorCodec,
+    CompactCursorCodec,
+    KeysetCursorCodec,
+    OffsetCursorCodec,
+)
+
+# Helpers for creating connections from asynchronous data sources
+from .connection.async_connection import (
+    connection_from_async_iterator,
+    connection_from_async_slice,
+    AsyncSizedSliceable,
+)
+
+# Helper for creating connections from iterables without a length
+from .connection.iterable_connection import connection_from_iterable
+
+# Helpers for creating connections using keyset pagination
+from .connection.keyset_connection import (
+    connection_from_keyset,
+    cursor_to_key,
+    key_to_cursor,
+    KeysetSource,
+)
+
+# Helpers for creating connections from sorted sequences using binary search
+from .connection.sorted_connection import (
+    connection_from_sorted_array,
+    cursor_for_object_in_sorted_connection,
+    SortedSequenceSource,
+)
+
+# Helpers for creating only the parts of connections that are queried
+from .connection.selection import get_connection_selection, ConnectionSelection
+
 # Helper for creating mutations with client mutation IDs
 from .mutation.mutation import (
     mutation_with_client_mutation_id,
@@ -44,7 +103,10 @@ from .mutation.mutation import (
 )
 
 # Helper for creating node definitions
-from .node.node import node_definitions, GraphQLNodeDefinitions
+from .node.node import node_definitions, FetchByIds, GraphQLNodeDefinitions
+
+# Loader for fetching objects in batches per tick of the event loop
+from .node.data_loader import DataLoader, BatchLoadFn
 
 #  Helper for creating plural identifying root fields
 from .node.plural import plural_identifying_root_field
@@ -58,25 +120,51 @@ __version_js__ = version_js
 __version_info_js__ = version_info_js
 
 __all__ = [
+    "AsyncSizedSliceable",
     "backward_connection_args",
+    "BaseCursorCodec",
+    "BatchLoadFn",
     "Connection",
+    "CompactCursorCodec",
     "ConnectionArguments",
     "ConnectionConstructor",
     "ConnectionCursor",
+    "ConnectionSelection",
     "ConnectionType",
+    "ConnectionWindow",
+    "CountCache",
+    "CursorCache",
+    "CursorCodec",
     "connection_args",
     "connection_from_array",
     "connection_from_array_slice",
+    "connection_from_async_iterator",
+    "connection_from_async_slice",
+    "connection_from_iterable",
+    "connection_from_keyset",
+    "connection_from_sorted_array",
     "connection_definitions",
+    "cursor_cache",
+    "cursor_codecs",
     "cursor_for_object_in_connection",
+    "cursor_for_object_in_sorted_connection",
+    "cursor_to_key",
     "cursor_to_offset",
+    "DataLoader",
     "Edge",
     "EdgeConstructor",
     "EdgeType",
+    "FetchByIds",
     "forward_connection_args",
     "from_global_id",
+    "get_connection_selection",
+    "get_connection_window",
+    "get_cursor_codec",
     "get_offset_with_default",
     "global_id_field",
+    "key_to_cursor",
+    "KeysetCursorCodec",
+    "KeysetSource",
     "GraphQLConnectionDefinitions",
     "GraphQLNodeDefinitions",
     "MutationFn",
@@ -84,15 +172,26 @@ __all__ = [
     "mutation_with_client_mutation_id",
     "node_definitions",
     "NullResult",
+    "ObjectIndex",
+    "offset_to_compact_cursor",
     "offset_to_cursor",
+    "offsets_to_cursors",
+    "OffsetCursorCodec",
+    "OffsetEdge",
+    "OffsetEdges",
     "PageInfo",
     "PageInfoConstructor",
     "PageInfoType",
     "page_info_type",
     "plural_identifying_root_field",
+    "register_cursor_codec",
     "ResolvedGlobalId",
     "SizedSliceable",
+    "SliceConnection",
+    "SortedSequenceSource",
     "to_global_id",
+    "use_compact_cursors",
+    "TotalCount",
     "version",
     "version_info",
     "version_js",
@@ -1,4 +1,16 @@
-from typing import Any, Iterator, Optional, Sequence
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from itertools import count, repeat
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
 
 try:
     from typing import Protocol
@@ -12,20 +24,38 @@ from .connection import (
     ConnectionConstructor,
     ConnectionCursor,
     ConnectionType,
+    CursorCodec,
     Edge,
     EdgeConstructor,
+    EdgeType,
     PageInfo,
     PageInfoConstructor,
+    PageInfoType,
+    TotalCount,
+    _total_count_fields,
 )
+from .count_cache import CountCache
+from .cursor_cache import CursorCache
+from .object_index import ObjectIndex
+from .selection import ConnectionSelection
 
 __all__ = [
     "connection_from_array",
     "connection_from_array_slice",
+    "cursor_cache",
     "cursor_for_object_in_connection",
     "cursor_to_offset",
+    "get_connection_window",
     "get_offset_with_default",
+    "offset_to_compact_cursor",
     "offset_to_cursor",
+    "offsets_to_cursors",
+    "use_compact_cursors",
+    "ConnectionWindow",
+    "OffsetEdge",
+    "OffsetEdges",
     "SizedSliceable",
+    "SliceConnection",
 ]
 
 
@@ -46,6 +76,12 @@ def connection_from_array(
     connection_type: ConnectionConstructor = Connection,
     edge_type: EdgeConstructor = Edge,
     page_info_type: PageInfoConstructor = PageInfo,
+    lazy_cursors: bool = False,
+    lazy_edges: bool = False,
+    selection: Optional[ConnectionSelection] = None,
+    total_count: Optional[Callable[[], int]] = None,
+    count_cache: Optional[CountCache] = None,
+    cursor_codec: Optional[CursorCodec] = None,
 ) -> ConnectionType:
     """Create a connection object from a sequence of objects.
 
@@ -58,15 +94,47 @@ def connection_from_array(
 
     The result will use the default types provided in the `connectiontypes` module
     if you don't pass custom types as arguments.
+
+    If `lazy_cursors` is set, the edges will be `OffsetEdge` objects which only
+    compute their cursors when these are actually requested. If `lazy_edges` is
+    set, a `SliceConnection` will be returned which creates these edges only
+    when they are actually requested.
+
+    If you pass the `selection` determined by `get_connection_selection`, only
+    the parts of the connection that are actually queried will be created.
+
+    If you pass a `total_count` function, it will be attached to the connection
+    as a `TotalCount`, and since the length of the data is needed anyway, it will
+    also be used instead of `len` to get that length, so that the data is counted
+    only once. Otherwise, if you pass a `CountCache` as `count_cache`, the length
+    of the data will be taken from that cache, so that it is not counted again
+    for every page.
+
+    If you pass a `cursor_codec`, it will be used instead of `offset_to_cursor`
+    and `cursor_to_offset` for converting between offsets and cursors.
     """
+    if total_count is not None:
+        if not isinstance(total_count, TotalCount):
+            total_count = TotalCount(total_count)
+        array_length = total_count()
+    elif count_cache is not None:
+        array_length = count_cache.get_count(data)
+    else:
+        array_length = len(data)
     return connection_from_array_slice(
         data,
         args,
         slice_start=0,
-        array_length=len(data),
+        array_length=array_length,
+        array_slice_length=array_length,
         connection_type=connection_type,
         edge_type=edge_type,
         page_info_type=page_info_type,
+        lazy_cursors=lazy_cursors,
+        lazy_edges=lazy_edges,
+        selection=selection,
+        total_count=total_count,
+        cursor_codec=cursor_codec,
     )
 
 
@@ -79,6 +147,11 @@ def connection_from_array_slice(
     connection_type: ConnectionConstructor = Connection,
     edge_type: EdgeConstructor = Edge,
     page_info_type: PageInfoConstructor = PageInfo,
+    lazy_cursors: bool = False,
+    lazy_edges: bool = False,
+    selection: Optional[ConnectionSelection] = None,
+    total_count: Optional[Callable[[], int]] = None,
+    cursor_codec: Optional[CursorCodec] = None,
 ) -> ConnectionType:
     """Create a connection object from a slice of the result set.
 
@@ -97,6 +170,33 @@ def connection_from_array_slice(
     If you do not provide a `slice_start`, we assume that the slice starts at
     the beginning of the result set, and if you do not provide an `array_length`,
     we assume that the slice ends at the end of the result set.
+
+    If `lazy_cursors` is set, the edges will be `OffsetEdge` objects instead of
+    objects created with `edge_type`. These only store the offset of the node
+    and compute the cursor when it is actually requested, which saves the work
+    of encoding the cursors if these are not queried.
+
+    If `lazy_edges` is set, instead of a connection object created with
+    `connection_type`, a `SliceConnection` will be returned, which only keeps
+    the slice of nodes for the page and the offset where it starts, and creates
+    `OffsetEdge` objects for its edges only when they are actually iterated.
+
+    If you pass the `selection` determined by `get_connection_selection` for the
+    connection field, only the parts of the connection that are actually queried
+    will be created. If the edges are not queried, a `SliceConnection` will be
+    returned, and if the nodes are not queried either, the data will not even be
+    sliced, which makes the result of queries that only check whether there are
+    more pages available in constant time. If the edges are queried, but not their
+    cursors, the edges will be `OffsetEdge` objects with lazily computed cursors.
+
+    If you pass a `total_count` function returning the length of the full result
+    set, it will be attached to the connection object as a `TotalCount` which
+    calls the function at most once, and only when the `totalCount` field is
+    queried. If you do not pass an `array_length`, the total count will be used
+    as the array length as well, and therefore will be computed immediately.
+
+    If you pass a `cursor_codec`, it will be used instead of `offset_to_cursor`
+    and `cursor_to_offset` for converting between offsets and cursors.
     """
     args = args or {}
     before = args.get("before")
@@ -106,17 +206,19 @@ def connection_from_array_slice(
     if array_slice_length is None:
         array_slice_length = len(array_slice)
     slice_end = slice_start + array_slice_length
+    if total_count is not None and not isinstance(total_count, TotalCount):
+        total_count = TotalCount(total_count)
     if array_length is None:
-        array_length = slice_end
+        array_length = slice_end if total_count is None else total_count()
 
     start_offset = max(slice_start, 0)
     end_offset = min(slice_end, array_length)
 
-    after_offset = get_offset_with_default(after, -1)
+    after_offset = get_offset_with_default(after, -1, cursor_codec)
     if 0 <= after_offset < array_length:
         start_offset = max(start_offset, after_offset + 1)
 
-    before_offset = get_offset_with_default(before, end_offset)
+    before_offset = get_offset_with_default(before, end_offset, cursor_codec)
     if 0 <= before_offset < array_length:
         end_offset = min(end_offset, before_offset)
 
@@ -131,54 +233,476 @@ def connection_from_array_slice(
 
         start_offset = max(start_offset, end_offset - last)
 
+    if selection is not None:
+        if not selection.edges:
+            lazy_edges = True
+            if not selection.nodes:
+                array_slice = []
+        elif not selection.cursors:
+            lazy_cursors = True
+
     # If supplied slice is too large, trim it down before mapping over it.
     trimmed_slice = array_slice[start_offset - slice_start : end_offset - slice_start]
 
-    edges = [
-        edge_type(node=value, cursor=offset_to_cursor(start_offset + index))
-        for index, value in enumerate(trimmed_slice)
-    ]
-
-    first_edge_cursor = edges[0].cursor if edges else None
-    last_edge_cursor = edges[-1].cursor if edges else None
     lower_bound = after_offset + 1 if after else 0
     upper_bound = before_offset if before else array_length
+    has_previous_page = isinstance(last, int) and start_offset > lower_bound
+    has_next_page = isinstance(first, int) and end_offset < upper_bound
+
+    if lazy_edges:
+        last_offset = end_offset - 1
+        encode = offset_to_cursor if cursor_codec is None else cursor_codec.encode
+        return SliceConnection(
+            trimmed_slice,
+            start_offset,
+            page_info_type(
+                startCursor=encode(start_offset)
+                if last_offset >= start_offset
+                else None,
+                endCursor=encode(last_offset) if last_offset >= start_offset else None,
+                hasPreviousPage=has_previous_page,
+                hasNextPage=has_next_page,
+            ),
+            **_total_count_fields(total_count),
+            cursor_codec=cursor_codec,
+        )
+
+    edges: List[EdgeType]
+    if lazy_cursors:
+        edges = [
+            OffsetEdge(value, start_offset + index, cursor_codec)
+            for index, value in enumerate(trimmed_slice)
+        ]
+    else:
+        num_edges = len(trimmed_slice)
+        cursors = (
+            offsets_to_cursors(start_offset, num_edges)
+            if cursor_codec is None
+            else cursor_codec.encode_batch(
+                range(start_offset, start_offset + num_edges)
+            )
+        )
+        edges = [
+            edge_type(node=value, cursor=cursor)
+            for value, cursor in zip(trimmed_slice, cursors)
+        ]
 
     return connection_type(
         edges=edges,
         pageInfo=page_info_type(
-            startCursor=first_edge_cursor,
-            endCursor=last_edge_cursor,
-            hasPreviousPage=isinstance(last, int) and start_offset > lower_bound,
-            hasNextPage=isinstance(first, int) and end_offset < upper_bound,
+            startCursor=edges[0].cursor if edges else None,
+            endCursor=edges[-1].cursor if edges else None,
+            hasPreviousPage=has_previous_page,
+            hasNextPage=has_next_page,
         ),
+        **_total_count_fields(total_count),
     )
 
 
+class OffsetEdge:
+    """An edge that computes its cursor from its offset only when requested.
+
+    The cursor is created with `offset_to_cursor`, or with the given codec.
+    """
+
+    __slots__ = "node", "offset", "cursor_codec"
+
+    node: Any
+    offset: int
+    cursor_codec: Optional[CursorCodec]
+
+    def __init__(
+        self, node: Any, offset: int, cursor_codec: Optional[CursorCodec] = None
+    ) -> None:
+        self.node = node
+        self.offset = offset
+        self.cursor_codec = cursor_codec
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(node={self.node!r}, offset={self.offset})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, OffsetEdge):
+            return self.node == other.node and self.offset == other.offset
+        return NotImplemented
+
+    @property
+    def cursor(self) -> ConnectionCursor:
+        cursor_codec = self.cursor_codec
+        if cursor_codec is None:
+            return offset_to_cursor(self.offset)
+        return cursor_codec.encode(self.offset)
+
+
+class OffsetEdges(Sequence[OffsetEdge]):
+    """A sequence of edges that are created from a slice of nodes on demand."""
+
+    __slots__ = "nodes", "start_offset", "cursor_codec"
+
+    nodes: Sequence
+    start_offset: int
+    cursor_codec: Optional[CursorCodec]
+
+    def __init__(
+        self,
+        nodes: Sequence,
+        start_offset: int = 0,
+        cursor_codec: Optional[CursorCodec] = None,
+    ) -> None:
+        self.nodes = nodes
+        self.start_offset = start_offset
+        self.cursor_codec = cursor_codec
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"nodes={self.nodes!r}, start_offset={self.start_offset})"
+        )
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self) -> Iterator[OffsetEdge]:
+        return map(
+            OffsetEdge, self.nodes, count(self.start_offset), repeat(self.cursor_codec)
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> OffsetEdge:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "OffsetEdges":
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[OffsetEdge, "OffsetEdges"]:
+        size = len(self.nodes)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(size)
+            if step != 1:
+                raise ValueError("Edges can only be sliced contiguously.")
+            return OffsetEdges(
+                self.nodes[start:stop], self.start_offset + start, self.cursor_codec
+            )
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Edge index out of range.")
+        return OffsetEdge(
+            self.nodes[index], self.start_offset + index, self.cursor_codec
+        )
+
+
+class SliceConnection:
+    """A connection that keeps its page as a slice of nodes instead of edges.
+
+    The edges are created only when they are requested, so that no edge objects
+    need to be allocated for the page as a whole.
+    """
+
+    __slots__ = "nodes", "start_offset", "pageInfo", "totalCount", "cursor_codec"
+
+    nodes: Sequence
+    start_offset: int
+    pageInfo: PageInfoType
+    totalCount: Optional[TotalCount]
+    cursor_codec: Optional[CursorCodec]
+
+    def __init__(
+        self,
+        nodes: Sequence,
+        start_offset: int,
+        pageInfo: PageInfoType,
+        totalCount: Optional[TotalCount] = None,
+        cursor_codec: Optional[CursorCodec] = None,
+    ) -> None:
+        self.nodes = nodes
+        self.start_offset = start_offset
+        self.pageInfo = pageInfo
+        self.totalCount = totalCount
+        self.cursor_codec = cursor_codec
+
+    def __repr__(self) -> str:
+        total_count = (
+            "" if self.totalCount is None else f", totalCount={self.totalCount!r}"
+        )
+        return (
+            f"{self.__class__.__name__}(nodes={self.nodes!r},"
+            f" start_offset={self.start_offset}, pageInfo={self.pageInfo!r}"
+            f"{total_count})"
+        )
+
+    @property
+    def edges(self) -> OffsetEdges:
+        return OffsetEdges(self.nodes, self.start_offset, self.cursor_codec)
+
+
+class ConnectionWindow(NamedTuple):
+    """The window of the result set that needs to be fetched for a connection.
+
+    The window contains the rows starting at `offset`, at most `limit` of them,
+    or all remaining rows if `limit` is None. If `reverse` is set, the window
+    contains the last `limit` rows starting at `offset` instead of the first.
+    If `needs_count` is set, the length of the full result set is needed.
+    """
+
+    offset: int
+    limit: Optional[int]
+    reverse: bool
+    needs_count: bool
+
+
+def get_connection_window(
+    args: Optional[ConnectionArguments] = None,
+    array_length: Optional[int] = None,
+    cursor_codec: Optional[CursorCodec] = None,
+) -> ConnectionWindow:
+    """Get the window of the result set that is needed for a connection.
+
+    Given the connection arguments and the length of the full result set if it is
+    already known, this function returns the window of rows that must be fetched,
+    so that only these rows can be loaded and passed to
+    `connection_from_array_slice` with `window.offset` as the `slice_start`,
+    and with the `array_length` if it is known.
+
+    If the length of the result set is not known, the window may contain one more
+    row than will be returned in order to determine whether there is a next page.
+    If the window must be taken from the end of the result set, `reverse` and
+    `needs_count` will be set, and the length of the result set must be passed
+    as `array_length`, with the offset of the first fetched row as `slice_start`.
+
+    If the cursors have been created with a `cursor_codec`, it must be passed
+    to this function as well.
+    """
+    args = args or {}
+    before = args.get("before")
+    after = args.get("after")
+    first = args.get("first")
+    last = args.get("last")
+
+    if isinstance(first, int) and first < 0:
+        raise ValueError("Argument 'first' must be a non-negative integer.")
+    if isinstance(last, int) and last < 0:
+        raise ValueError("Argument 'last' must be a non-negative integer.")
+
+    start_offset = 0
+    end_offset = array_length
+
+    after_offset = get_offset_with_default(after, -1, cursor_codec)
+    if 0 <= after_offset and (array_length is None or after_offset < array_length):
+        start_offset = after_offset + 1
+
+    before_offset = get_offset_with_default(before, -1, cursor_codec)
+    if 0 <= before_offset and (array_length is None or before_offset < array_length):
+        end_offset = before_offset
+        bounded = True
+    else:
+        bounded = array_length is not None
+
+    if isinstance(first, int):
+        first_end_offset = start_offset + first
+        if end_offset is None or first_end_offset < end_offset:
+            end_offset = first_end_offset
+
+    if end_offset is None:
+        # neither the length nor an upper bound is known
+        if isinstance(last, int):
+            return ConnectionWindow(start_offset, last, True, True)
+        return ConnectionWindow(start_offset, None, False, False)
+
+    if bounded:
+        if isinstance(last, int):
+            start_offset = max(start_offset, end_offset - last)
+        return ConnectionWindow(
+            start_offset, max(end_offset - start_offset, 0), False, False
+        )
+
+    # look ahead one row to determine whether there is a next page
+    return ConnectionWindow(start_offset, end_offset - start_offset + 1, False, False)
+
+
 PREFIX = "arrayconnection:"
 
+# All offset cursors start with the Base64 encoding of the prefix without the
+# separator, since the length of this part is divisible by three.
+_PREFIX_BASE64 = base64(PREFIX[:-1])
+_PREFIX_BASE64_BYTES = _PREFIX_BASE64.encode("ascii")
 
-def offset_to_cursor(offset: int) -> ConnectionCursor:
-    """Create the cursor string from an offset."""
+# Cursors that are longer than this will be rejected without decoding them.
+MAX_CURSOR_LENGTH = 64
+
+
+def _offset_to_cursor(offset: int) -> ConnectionCursor:
+    """Create the cursor string from an offset without using the cache."""
     return base64(f"{PREFIX}{offset}")
 
 
-def cursor_to_offset(cursor: ConnectionCursor) -> Optional[int]:
-    """Extract the offset from the cursor string."""
+def _cursor_to_offset(cursor: ConnectionCursor) -> Optional[int]:
+    """Extract the offset from the cursor string without using the cache."""
+    if isinstance(cursor, str) and cursor.startswith(COMPACT_PREFIX):
+        return _compact_cursor_to_offset(cursor)
     try:
         return int(unbase64(cursor)[len(PREFIX) :])
     except ValueError:
         return None
 
 
+# The version tag of the compact cursor format.
+COMPACT_PREFIX = "c"
+
+
+def offset_to_compact_cursor(offset: int) -> ConnectionCursor:
+    """Create a compact cursor string from an offset.
+
+    Compact cursors consist of the version tag `COMPACT_PREFIX` and the offset
+    as a zigzag-encoded varint in URL-safe Base64 encoding without padding.
+    They are accepted by `cursor_to_offset` just like the default cursors.
+    """
+    value = offset << 1 if offset >= 0 else ~offset << 1 | 1
+    varint = bytearray()
+    while value > 0x7F:
+        varint.append(value & 0x7F | 0x80)
+        value >>= 7
+    varint.append(value)
+    return COMPACT_PREFIX + urlsafe_b64encode(varint).rstrip(b"=").decode("ascii")
+
+
+def _compact_cursor_to_offset(cursor: ConnectionCursor) -> Optional[int]:
+    """Extract the offset from a compact cursor string."""
+    encoded = cursor[len(COMPACT_PREFIX) :]
+    try:
+        varint = urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+    except ValueError:
+        return None
+    value = shift = 0
+    for byte in varint:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+    offset = ~(value >> 1) if value & 1 else value >> 1
+    # make sure the cursor is well-formed by comparing it with the canonical one
+    return offset if offset_to_compact_cursor(offset) == cursor else None
+
+
+# The cache used for converting between offsets and cursors.
+# You can change its size using `cursor_cache.configure()`.
+cursor_cache = CursorCache(_offset_to_cursor, _cursor_to_offset)
+
+
+def use_compact_cursors(compact: bool = True) -> None:
+    """Switch between the compact and the default cursor format.
+
+    This changes the format of the cursors created by all helpers using offsets.
+    The cursors of both formats will be accepted regardless of this setting,
+    so that clients holding cursors in the old format continue to work.
+    """
+    cursor_cache.configure(
+        encode=offset_to_compact_cursor if compact else _offset_to_cursor
+    )
+
+
+def offset_to_cursor(offset: int) -> ConnectionCursor:
+    """Create the cursor string from an offset."""
+    return cursor_cache.offset_to_cursor(offset)
+
+
+def cursor_to_offset(
+    cursor: ConnectionCursor, max_length: Optional[int] = None
+) -> Optional[int]:
+    """Extract the offset from the cursor string.
+
+    Both the default and the compact cursor format are accepted. Cursors that
+    are longer than `max_length` (by default `MAX_CURSOR_LENGTH`) or that do not
+    start like the cursors of these formats are rejected without decoding them.
+    """
+    if len(cursor) > (MAX_CURSOR_LENGTH if max_length is None else max_length):
+        return None
+    if not cursor.startswith(
+        (_PREFIX_BASE64, COMPACT_PREFIX)
+        if isinstance(cursor, str)
+        else _PREFIX_BASE64_BYTES
+    ):
+        return None
+    return cursor_cache.cursor_to_offset(cursor)
+
+
+# Cursors for consecutive offsets are encoded in blocks sharing the same leading
+# digits. The prefix with the separator and the leading digits of the offsets
+# has a length divisible by three, so its Base64 encoding can be concatenated
+# with the encoding of the trailing one to three digits, which is precomputed.
+_TRAILING_DIGITS_BASE64 = {
+    size: [base64(f"{number:0{size}d}") for number in range(10**size)]
+    for size in (1, 2, 3)
+}
+
+
+def offsets_to_cursors(start: int, count: int) -> List[ConnectionCursor]:
+    """Create the cursor strings for `count` consecutive offsets from `start`.
+
+    This gives the same cursors as calling `offset_to_cursor` for every offset,
+    but is much faster for whole pages, since the cursors for the low offsets are
+    copied from the cache, and the cursors for the other offsets are put together
+    from parts that are encoded only once for each block of offsets.
+    """
+    if count <= 0:
+        return []
+    stop = start + count
+    table = cursor_cache.table
+    if 0 <= start < len(table):
+        cursors = table[start:stop]
+        offset = start + len(cursors)
+    else:
+        cursors = []
+        offset = start
+    encode = cursor_cache.encoder
+    if encode is not _offset_to_cursor:  # another cursor format is used
+        cursors.extend(map(encode, range(offset, stop)))
+        return cursors
+    while offset < stop:
+        num_digits = len(str(offset))
+        num_trailing_digits = (len(PREFIX) + num_digits) % 3 or 3
+        if offset < 0 or num_digits <= num_trailing_digits:
+            # negative and small offsets cannot be encoded in blocks
+            cursors.append(_offset_to_cursor(offset))
+            offset += 1
+            continue
+        block_size = 10**num_trailing_digits
+        leading, trailing = divmod(offset, block_size)
+        block_stop = min(stop, offset - trailing + block_size)
+        head = base64(f"{PREFIX}{leading}")
+        cursors.extend(
+            head + tail
+            for tail in _TRAILING_DIGITS_BASE64[num_trailing_digits][
+                trailing : trailing + block_stop - offset
+            ]
+        )
+        offset = block_stop
+    return cursors
+
+
 def cursor_for_object_in_connection(
-    data: Sequence, obj: Any
+    data: Sequence,
+    obj: Any,
+    index: Optional[ObjectIndex] = None,
+    cursor_codec: Optional[CursorCodec] = None,
 ) -> Optional[ConnectionCursor]:
     """Return the cursor associated with an object in a sequence.
 
     This function uses the `index` method of the sequence if it exists,
     otherwise searches the object by iterating via the `__getitem__` method.
+
+    If you need to look up many objects in the same sequence, you can pass an
+    `ObjectIndex` for the sequence as `index`, which will then be used instead.
+
+    If you pass a `cursor_codec`, it will be used instead of `offset_to_cursor`
+    for converting the offset of the object to a cursor.
     """
+    encode = offset_to_cursor if cursor_codec is None else cursor_codec.encode
+    if index is not None:
+        if index.data is not data:
+            raise ValueError("The index must have been created for the given data.")
+        offset = index.offset_of(obj)
+        return None if offset is None else encode(offset)
+
     try:
         offset = data.index(obj)
     except AttributeError:
@@ -192,15 +716,17 @@ def cursor_for_object_in_connection(
         except IndexError:
             return None
         else:
-            return offset_to_cursor(offset)
+            return encode(offset)
     except ValueError:
         return None
     else:
-        return offset_to_cursor(offset)
+        return encode(offset)
 
 
 def get_offset_with_default(
-    cursor: Optional[ConnectionCursor] = None, default_offset: int = 0
+    cursor: Optional[ConnectionCursor] = None,
+    default_offset: int = 0,
+    cursor_codec: Optional[CursorCodec] = None,
 ) -> int:
     """Get offset from a given cursor and a default.
 
@@ -211,5 +737,9 @@ def get_offset_with_default(
     if not isinstance(cursor, str):
         return default_offset
 
-    offset = cursor_to_offset(cursor)
-    return default_offset if offset is None else offset
+    offset = (
+        cursor_to_offset(cursor)
+        if cursor_codec is None
+        else cursor_codec.decode(cursor)
+    )
+    return offset if isinstance(offset, int) else default_offset
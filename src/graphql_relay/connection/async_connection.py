@@ -0,0 +1,163 @@
+from asyncio import gather
+from collections import deque
+from typing import Any, AsyncIterable, Callable, Deque, Optional
+
+try:
+    from typing import Protocol
+except ImportError:  # Python < 3.8
+    from typing_extensions import Protocol  # type: ignore
+
+from .array_connection import (
+    connection_from_array_slice,
+    cursor_to_offset,
+    get_connection_window,
+    SizedSliceable,
+)
+from .iterable_connection import _connection_from_stream_slice, _get_stream_slice
+from .connection import (
+    Connection,
+    ConnectionArguments,
+    ConnectionConstructor,
+    ConnectionType,
+    CursorCodec,
+    Edge,
+    EdgeConstructor,
+    PageInfo,
+    PageInfoConstructor,
+)
+
+__all__ = [
+    "connection_from_async_iterator",
+    "connection_from_async_slice",
+    "AsyncSizedSliceable",
+]
+
+
+class AsyncSizedSliceable(Protocol):
+    async def length(self) -> int:
+        ...
+
+    async def slice(self, start: int, stop: Optional[int]) -> SizedSliceable:
+        ...
+
+
+async def connection_from_async_slice(
+    data: AsyncSizedSliceable,
+    args: Optional[ConnectionArguments] = None,
+    connection_type: ConnectionConstructor = Connection,
+    edge_type: EdgeConstructor = Edge,
+    page_info_type: PageInfoConstructor = PageInfo,
+    cursor_codec: Optional[CursorCodec] = None,
+) -> ConnectionType:
+    """Create a connection object from an asynchronous data source.
+
+    This is the asynchronous counterpart of `connection_from_array`. Instead of
+    a sliceable object with a length, it takes an object with an asynchronous
+    `length` method returning the length of the full result set, and an
+    asynchronous `slice` method returning the objects from `start` to `stop`
+    (or to the end if `stop` is None) as a sliceable object with a length.
+
+    Only the slice that is needed for the connection will be awaited, and unless
+    the slice can only be determined by the length of the result set, the length
+    and the slice will be awaited concurrently.
+
+    If you pass a `cursor_codec`, it will be used instead of `offset_to_cursor`
+    and `cursor_to_offset` for converting between offsets and cursors.
+    """
+    window = get_connection_window(args, cursor_codec=cursor_codec)
+    if window.needs_count:
+        array_length = await data.length()
+        array_slice: Optional[SizedSliceable] = None
+    else:
+        array_length, array_slice = await gather(
+            data.length(),
+            data.slice(
+                window.offset,
+                None if window.limit is None else window.offset + window.limit,
+            ),
+        )
+
+    # Now that the length is known, we can determine the exact window.
+    # Cursors that are out of range can only be detected using the length,
+    # in that case we need to fetch the slice again with the correct window.
+    slice_start = window.offset
+    window = get_connection_window(args, array_length, cursor_codec)
+    start, stop = window.offset, window.offset + (window.limit or 0)
+    if (
+        array_slice is None
+        or start < slice_start
+        or stop > slice_start + len(array_slice)
+    ):
+        slice_start = start
+        array_slice = await data.slice(start, stop)
+
+    # Invalid cursors must be dropped, since `connection_from_array_slice`
+    # would otherwise use the bounds of the trimmed slice in their place.
+    if args:
+        decode = cursor_to_offset if cursor_codec is None else cursor_codec.decode
+        for name in ("after", "before"):
+            cursor = args.get(name)
+            if isinstance(cursor, str) and not isinstance(decode(cursor), int):
+                args = {**args, name: None}
+
+    return connection_from_array_slice(
+        array_slice,
+        args,
+        slice_start=slice_start,
+        array_length=array_length,
+        connection_type=connection_type,
+        edge_type=edge_type,
+        page_info_type=page_info_type,
+        cursor_codec=cursor_codec,
+    )
+
+
+async def connection_from_async_iterator(
+    iterator: AsyncIterable[Any],
+    args: Optional[ConnectionArguments] = None,
+    connection_type: ConnectionConstructor = Connection,
+    edge_type: EdgeConstructor = Edge,
+    page_info_type: PageInfoConstructor = PageInfo,
+    total_count: Optional[Callable[[], int]] = None,
+    cursor_codec: Optional[CursorCodec] = None,
+) -> ConnectionType:
+    """Create a connection object from an asynchronous iterator.
+
+    This is the asynchronous counterpart of `connection_from_iterable`. It accepts
+    any asynchronous iterable, such as an async generator or a streaming database
+    cursor, and consumes only as many items as are needed for the connection.
+    As soon as the page and the one additional item needed to determine whether
+    there is a next page have been consumed, the iterator will be closed by calling
+    its `aclose` method if it has one, so that resources can be released early.
+    Like there, you can pass a `total_count` function that is only called if the
+    total count is queried. Like there, you can also pass a `cursor_codec`.
+    """
+    start_offset, stop_offset, buffer_size = _get_stream_slice(args, cursor_codec)
+
+    values: Deque[Any] = deque(maxlen=buffer_size)
+    offset = 0
+    if stop_offset is None or stop_offset > start_offset:
+        async_iterator = iterator.__aiter__()
+        try:
+            async for value in async_iterator:
+                if offset >= start_offset:
+                    values.append(value)
+                offset += 1
+                if offset == stop_offset:
+                    break
+        finally:
+            aclose = getattr(async_iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+    seen_end_offset = max(offset, start_offset)
+
+    return _connection_from_stream_slice(
+        list(values),
+        seen_end_offset,
+        args,
+        connection_type=connection_type,
+        edge_type=edge_type,
+        page_info_type=page_info_type,
+        total_count=total_count,
+        cursor_codec=cursor_codec,
+    )
@@ -1,4 +1,14 @@
-from typing import Any, Dict, List, NamedTuple, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
 
 from graphql import (
     get_named_type,
@@ -12,6 +22,7 @@ from graphql import (
     GraphQLList,
     GraphQLNonNull,
     GraphQLObjectType,
+    GraphQLResolveInfo,
     GraphQLString,
     ThunkMapping,
 )
@@ -34,6 +45,7 @@ __all__ = [
     "ConnectionConstructor",
     "ConnectionCursor",
     "ConnectionType",
+    "CursorCodec",
     "Edge",
     "EdgeConstructor",
     "EdgeType",
@@ -41,6 +53,7 @@ __all__ = [
     "PageInfo",
     "PageInfoConstructor",
     "PageInfoType",
+    "TotalCount",
 ]
 
 
@@ -97,6 +110,28 @@ The following kinds of arguments are expected (all optional):
 ConnectionArguments = Dict[str, Any]
 
 
+class CursorCodec(Protocol):
+    """A codec for converting between cursors and the values they point to.
+
+    For connections using offsets, the values are the offsets of the edges;
+    for connections using keyset pagination, the values are the sort keys.
+    The `decode` method must return None if the cursor is invalid. The batch
+    variants convert several values or cursors at once, which can be faster.
+    """
+
+    def encode(self, value: Any) -> ConnectionCursor:
+        ...
+
+    def decode(self, cursor: ConnectionCursor) -> Optional[Any]:
+        ...
+
+    def encode_batch(self, values: Iterable[Any]) -> List[ConnectionCursor]:
+        ...
+
+    def decode_batch(self, cursors: Iterable[ConnectionCursor]) -> List[Optional[Any]]:
+        ...
+
+
 def connection_definitions(
     node_type: Union[GraphQLNamedOutputType, GraphQLNonNull[GraphQLNamedOutputType]],
     name: Optional[str] = None,
@@ -104,10 +139,25 @@ def connection_definitions(
     resolve_cursor: Optional[GraphQLFieldResolver] = None,
     edge_fields: Optional[ThunkMapping[GraphQLField]] = None,
     connection_fields: Optional[ThunkMapping[GraphQLField]] = None,
+    include_nodes: bool = False,
+    include_total_count: bool = False,
 ) -> GraphQLConnectionDefinitions:
     """Return GraphQLObjectTypes for a connection with the given name.
 
     The nodes of the returned object types will be of the specified type.
+
+    If `include_nodes` is set, the connection type will also get a `nodes` field
+    as a shortcut for clients that do not need the cursors of the edges. This
+    field is resolved using the `nodes` attribute of the connection object if
+    it exists, like in a `SliceConnection`, so that no edges need to be created,
+    otherwise the nodes will be taken from the edges. Note that `resolve_node`
+    is only applied to the `node` field of the edges.
+
+    If `include_total_count` is set, the connection type will also get a
+    `totalCount` field, which is resolved using the `totalCount` attribute of the
+    connection object. This can be a number or a function returning the number,
+    like the `TotalCount` attached by the connection helpers when you pass them a
+    `total_count` function, so that the count is only computed when queried.
     """
     name = name or get_named_type(node_type).name
 
@@ -140,6 +190,28 @@ def connection_definitions(
             "edges": GraphQLField(
                 GraphQLList(edge_type), description="A list of edges."
             ),
+            **(
+                {
+                    "nodes": GraphQLField(
+                        GraphQLList(node_type),
+                        resolve=_resolve_connection_nodes,
+                        description="A list of nodes.",
+                    )
+                }
+                if include_nodes
+                else {}
+            ),
+            **(
+                {
+                    "totalCount": GraphQLField(
+                        GraphQLInt,
+                        resolve=_resolve_connection_total_count,
+                        description="The total number of items in the connection.",
+                    )
+                }
+                if include_total_count
+                else {}
+            ),
             **resolve_thunk(connection_fields or {}),
         },
     )
@@ -147,6 +219,84 @@ def connection_definitions(
     return GraphQLConnectionDefinitions(edge_type, connection_type)
 
 
+def _resolve_connection_nodes(
+    connection: Any, _info: GraphQLResolveInfo, **_args: Any
+) -> Optional[Sequence[Any]]:
+    """Resolve the nodes of a connection, preferably without using its edges."""
+    if isinstance(connection, dict):
+        nodes = connection.get("nodes")
+        if nodes is None:
+            edges = connection.get("edges")
+            if edges is not None:
+                nodes = [
+                    edge["node"] if isinstance(edge, dict) else edge.node
+                    for edge in edges
+                ]
+    else:
+        nodes = getattr(connection, "nodes", None)
+        if nodes is None:
+            edges = connection.edges
+            if edges is not None:
+                nodes = [edge.node for edge in edges]
+    return nodes
+
+
+def _resolve_connection_total_count(
+    connection: Any, _info: GraphQLResolveInfo, **_args: Any
+) -> Optional[int]:
+    """Resolve the total count of a connection, computing it only if needed."""
+    if isinstance(connection, dict):
+        total_count = connection.get("totalCount")
+    else:
+        total_count = getattr(connection, "totalCount", None)
+    return total_count() if callable(total_count) else total_count
+
+
+class TotalCount:
+    """The total number of items in a connection, computed only when needed.
+
+    The given function for counting the items is called at most once, when the
+    count is requested for the first time, and the result is then cached.
+    """
+
+    __slots__ = "_count", "_value"
+
+    _count: Optional[Callable[[], int]]
+    _value: int
+
+    def __init__(self, count: Callable[[], int]) -> None:
+        self._count = count
+
+    def __repr__(self) -> str:
+        value = "<not counted>" if self._count else self._value
+        return f"{self.__class__.__name__}({value})"
+
+    def __call__(self) -> int:
+        count = self._count
+        if count is not None:
+            self._value = count()
+            self._count = None
+        return self._value
+
+    __int__ = __index__ = __call__
+
+    @property
+    def counted(self) -> bool:
+        """Whether the total count has already been computed."""
+        return self._count is None
+
+
+def _total_count_fields(
+    total_count: Optional[Callable[[], int]]
+) -> Dict[str, Optional[TotalCount]]:
+    """Get the fields for attaching a lazy total count to a connection object."""
+    if total_count is None:
+        return {}
+    if not isinstance(total_count, TotalCount):
+        total_count = TotalCount(total_count)
+    return {"totalCount": total_count}
+
+
 class PageInfoType(Protocol):
     @property
     def startCursor(self) -> Optional[ConnectionCursor]:
@@ -207,7 +357,7 @@ class Edge(NamedTuple):
 
 class ConnectionType(Protocol):
     @property
-    def edges(self) -> List[EdgeType]:
+    def edges(self) -> Sequence[EdgeType]:
         ...
 
     @property
@@ -228,8 +378,9 @@ class ConnectionConstructor(Protocol):
 class Connection(NamedTuple):
     """A type designed to be exposed as a `Connection` over GraphQL."""
 
-    edges: List[Edge]
+    edges: List[EdgeType]
     pageInfo: PageInfo
+    totalCount: Optional[TotalCount] = None
 
 
 # The common page info type used by all connections.
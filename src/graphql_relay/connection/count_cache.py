@@ -0,0 +1,102 @@
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Dict, NamedTuple, Optional
+from weakref import ref
+
+__all__ = ["CountCache"]
+
+
+class _CountEntry(NamedTuple):
+    source: Callable[[], Any]  # returns the counted source if still alive
+    length: int
+    expires: float
+
+
+class CountCache:
+    """A cache for the lengths of result sets used by connections.
+
+    Counting the full result set can be expensive for sliceable objects backed by
+    a database, but `connection_from_array` needs the length for every page.
+    If you pass a `CountCache` as `count_cache`, the length of the same source
+    object will be counted only once per `ttl` seconds. The cache is keyed by the
+    identity of the source object and holds at most `maxsize` counts. Sources
+    which cannot be weakly referenced, like lists, are counted without caching,
+    since the cache would otherwise keep them alive. The cache can be shared
+    by concurrent threads.
+
+    If `approximate` is set, an expired count will still be served while the
+    source is being recounted, e.g. by a concurrent request, instead of counting
+    the same source several times at once. The pages may then be determined using
+    a slightly outdated count, which is usually acceptable for large feeds.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        approximate: bool = False,
+        maxsize: int = 128,
+        timer: Callable[[], float] = monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.approximate = approximate
+        self.maxsize = maxsize
+        self.timer = timer
+        self._entries: Dict[int, _CountEntry] = {}
+        self._counting: Dict[int, int] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_count(self, source: Any, count: Optional[Callable[[], int]] = None) -> int:
+        """Get the cached length of the given source.
+
+        If the length is not cached or has expired, the given `count` function is
+        called to count the source, or the length of the source is taken if no
+        such function has been passed.
+        """
+        try:
+            source_ref = ref(source)
+        except TypeError:  # the source cannot be weakly referenced
+            return count() if count else len(source)
+        key = id(source)
+        counting = self._counting
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.source() is not source:
+                # the key has been reused by another object
+                entry = None
+                del self._entries[key]
+            now = self.timer()
+            if entry is not None and (
+                entry.expires > now or (self.approximate and counting.get(key))
+            ):
+                return entry.length
+            counting[key] = counting.get(key, 0) + 1
+
+        try:
+            value = count() if count else len(source)
+        finally:
+            with self._lock:
+                if counting[key] > 1:
+                    counting[key] -= 1
+                else:
+                    del counting[key]
+
+        maxsize = self.maxsize
+        if maxsize > 0:
+            with self._lock:
+                entries = self._entries
+                entries.pop(key, None)
+                while len(entries) >= maxsize:
+                    del entries[next(iter(entries))]
+                entries[key] = _CountEntry(source_ref, value, now + self.ttl)
+        return value
+
+    def invalidate(self, source: Any = None) -> None:
+        """Remove the count of the given source or all counts from the cache."""
+        with self._lock:
+            if source is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(id(source), None)
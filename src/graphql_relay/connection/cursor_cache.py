@@ -0,0 +1,110 @@
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from .connection import ConnectionCursor
+
+__all__ = ["CursorCache"]
+
+
+class _CursorCacheState(NamedTuple):
+    table: List[ConnectionCursor]
+    offsets: Dict[ConnectionCursor, int]
+    encode: Callable[[int], ConnectionCursor]
+    decode: Callable[[ConnectionCursor], Optional[int]]
+
+
+class CursorCache:
+    """A cache for converting between offsets and cursors in both directions.
+
+    The cursors for the offsets below `table_size` are precomputed in a table,
+    since these are the ones needed most often. The conversions for all other
+    offsets and cursors are memoized in LRU caches holding at most `maxsize`
+    entries each. The cache can be safely used from multiple threads and can be
+    reconfigured at any time. It always returns the same results as the given
+    `encode` and `decode` functions which it uses for the actual conversion.
+    """
+
+    _maxsize: int
+    _state: _CursorCacheState
+
+    def __init__(
+        self,
+        encode: Callable[[int], ConnectionCursor],
+        decode: Callable[[ConnectionCursor], Optional[int]],
+        table_size: int = 1000,
+        maxsize: int = 10000,
+    ) -> None:
+        self._encode = encode
+        self._decode = decode
+        self.configure(table_size, maxsize)
+
+    @property
+    def table_size(self) -> int:
+        return len(self._state.table)
+
+    @property
+    def table(self) -> List[ConnectionCursor]:
+        """The precomputed cursors for the offsets below the table size."""
+        return self._state.table
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def encoder(self) -> Callable[[int], ConnectionCursor]:
+        """The function used for creating cursors from offsets."""
+        return self._encode
+
+    def configure(
+        self,
+        table_size: Optional[int] = None,
+        maxsize: Optional[int] = None,
+        encode: Optional[Callable[[int], ConnectionCursor]] = None,
+    ) -> None:
+        """Change the size of the table and the LRU caches and clear them.
+
+        You can also change the function used for creating cursors from offsets.
+        """
+        if table_size is None:
+            table_size = self.table_size
+        if maxsize is None:
+            maxsize = self._maxsize
+        if table_size < 0 or maxsize < 0:
+            raise ValueError("The cache sizes must be non-negative integers.")
+        if encode is None:
+            encode = self._encode
+        else:
+            self._encode = encode
+        table = [encode(offset) for offset in range(table_size)]
+        offsets = {cursor: offset for offset, cursor in enumerate(table)}
+        self._maxsize = maxsize
+        # replace the complete state at once, so that other threads see
+        # either the old or the new state, but never a mixture of both
+        self._state = _CursorCacheState(
+            table,
+            offsets,
+            lru_cache(maxsize, typed=True)(encode),
+            lru_cache(maxsize, typed=True)(self._decode),
+        )
+
+    def clear(self) -> None:
+        """Clear the LRU caches, but keep the precomputed table."""
+        state = self._state
+        state.encode.cache_clear()  # type: ignore
+        state.decode.cache_clear()  # type: ignore
+
+    def offset_to_cursor(self, offset: int) -> ConnectionCursor:
+        """Get the cursor for the given offset."""
+        state = self._state
+        if type(offset) is int and 0 <= offset < len(state.table):
+            return state.table[offset]
+        return state.encode(offset)
+
+    def cursor_to_offset(self, cursor: ConnectionCursor) -> Optional[int]:
+        """Get the offset for the given cursor."""
+        state = self._state
+        try:
+            return state.offsets[cursor]
+        except KeyError:
+            return state.decode(cursor)
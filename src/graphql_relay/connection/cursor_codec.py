@@ -0,0 +1,125 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+
+from .array_connection import (
+    cursor_to_offset,
+    offset_to_compact_cursor,
+    offset_to_cursor,
+    offsets_to_cursors,
+)
+from .connection import ConnectionCursor, CursorCodec
+from .keyset_connection import cursor_to_key, key_to_cursor
+
+__all__ = [
+    "cursor_codecs",
+    "get_cursor_codec",
+    "register_cursor_codec",
+    "BaseCursorCodec",
+    "CompactCursorCodec",
+    "KeysetCursorCodec",
+    "OffsetCursorCodec",
+]
+
+
+class BaseCursorCodec(ABC):
+    """Abstract base class for cursor codecs.
+
+    Subclasses only need to implement `encode` and `decode`; the batch variants
+    will then simply convert the given values or cursors one by one.
+    """
+
+    @abstractmethod
+    def encode(self, value: Any) -> ConnectionCursor:
+        """Encode the given value as a cursor."""
+
+    @abstractmethod
+    def decode(self, cursor: ConnectionCursor) -> Optional[Any]:
+        """Decode the given cursor, returning None if it is invalid."""
+
+    def encode_batch(self, values: Iterable[Any]) -> List[ConnectionCursor]:
+        return list(map(self.encode, values))
+
+    def decode_batch(self, cursors: Iterable[ConnectionCursor]) -> List[Optional[Any]]:
+        return list(map(self.decode, cursors))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+
+class OffsetCursorCodec(BaseCursorCodec):
+    """Codec for the default offset cursors.
+
+    This codec uses `offset_to_cursor` and `cursor_to_offset`, so it benefits
+    from the cursor cache and follows the format chosen with `use_compact_cursors`.
+    Consecutive offsets are encoded in a batch using `offsets_to_cursors`.
+    """
+
+    def encode(self, value: int) -> ConnectionCursor:
+        return offset_to_cursor(value)
+
+    def decode(self, cursor: ConnectionCursor) -> Optional[int]:
+        return cursor_to_offset(cursor)
+
+    def encode_batch(self, values: Iterable[int]) -> List[ConnectionCursor]:
+        if isinstance(values, range) and values.step == 1:
+            return offsets_to_cursors(values.start, len(values))
+        return list(map(offset_to_cursor, values))
+
+
+class CompactCursorCodec(BaseCursorCodec):
+    """Codec for compact offset cursors.
+
+    The cursors are always created in the compact format, independent of the
+    global setting made with `use_compact_cursors`. Cursors in the default format
+    are still accepted, so that clients can keep using their existing cursors.
+    """
+
+    def encode(self, value: int) -> ConnectionCursor:
+        return offset_to_compact_cursor(value)
+
+    def decode(self, cursor: ConnectionCursor) -> Optional[int]:
+        return cursor_to_offset(cursor)
+
+
+class KeysetCursorCodec(BaseCursorCodec):
+    """Codec for keyset cursors containing the sort key of a node.
+
+    The sort key can be any value that can be serialized as JSON, or a tuple
+    of such values for composite keys, which will be restored as tuples.
+    """
+
+    def encode(self, value: Any) -> ConnectionCursor:
+        return key_to_cursor(value)
+
+    def decode(self, cursor: ConnectionCursor) -> Optional[Any]:
+        return cursor_to_key(cursor)
+
+
+# The registry of the named cursor codecs.
+cursor_codecs: Dict[str, CursorCodec] = {
+    "offset": OffsetCursorCodec(),
+    "compact": CompactCursorCodec(),
+    "keyset": KeysetCursorCodec(),
+}
+
+
+def register_cursor_codec(name: str, codec: CursorCodec) -> None:
+    """Register a cursor codec under the given name.
+
+    An existing codec with the same name will be replaced.
+    """
+    if not name or not isinstance(name, str):
+        raise TypeError("The name of a cursor codec must be a non-empty string.")
+    cursor_codecs[name] = codec
+
+
+def get_cursor_codec(name: str) -> CursorCodec:
+    """Get the cursor codec that has been registered under the given name.
+
+    This allows choosing the cursor format by name, e.g. in the settings
+    of an application, and passing it as `cursor_codec` to the connection helpers.
+    """
+    try:
+        return cursor_codecs[name]
+    except KeyError:
+        raise ValueError(f"Unknown cursor codec: {name!r}.")
@@ -0,0 +1,185 @@
+from collections import deque
+from itertools import count, islice
+from typing import Any, Callable, Deque, Iterable, List, Optional, Tuple
+
+from .array_connection import get_offset_with_default, offsets_to_cursors
+from .connection import (
+    Connection,
+    ConnectionArguments,
+    ConnectionConstructor,
+    ConnectionType,
+    CursorCodec,
+    Edge,
+    EdgeConstructor,
+    PageInfo,
+    PageInfoConstructor,
+    _total_count_fields,
+)
+
+__all__ = ["connection_from_iterable"]
+
+
+def connection_from_iterable(
+    iterable: Iterable[Any],
+    args: Optional[ConnectionArguments] = None,
+    connection_type: ConnectionConstructor = Connection,
+    edge_type: EdgeConstructor = Edge,
+    page_info_type: PageInfoConstructor = PageInfo,
+    total_count: Optional[Callable[[], int]] = None,
+    cursor_codec: Optional[CursorCodec] = None,
+) -> ConnectionType:
+    """Create a connection object from an iterable of objects.
+
+    Different from `connection_from_array`, this function does not need to know
+    the length of the result set, and it accepts any iterable such as a generator
+    or a database cursor, which will only be consumed as far as needed. When
+    paginating forward, at most `after + first + 1` items will be consumed,
+    the additional item being used to determine whether there is a next page.
+    When paginating backward without an upper bound, the iterable needs to be
+    consumed completely, but only the last `last` items will be kept in memory.
+
+    The cursors are the same as the ones used by `connection_from_array`, but
+    cursors pointing beyond the end of the iterable will result in an empty page.
+
+    Since the iterable will not be counted, you can pass a `total_count` function
+    that will be attached to the connection and only called if it is queried.
+
+    If you pass a `cursor_codec`, it will be used instead of `offset_to_cursor`
+    and `cursor_to_offset` for converting between offsets and cursors.
+    """
+    start_offset, stop_offset, buffer_size = _get_stream_slice(args, cursor_codec)
+
+    values_slice = islice(iterable, start_offset, stop_offset)
+    if buffer_size is None:
+        values = list(values_slice)
+        seen_end_offset = start_offset + len(values)
+    else:
+        # keep only the last values in a ring buffer while counting all values
+        offsets = count(start_offset)
+        buffer: Deque[Tuple[Any, int]] = deque(zip(values_slice, offsets), buffer_size)
+        seen_end_offset = next(offsets)
+        values = [value for value, _offset in buffer]
+
+    return _connection_from_stream_slice(
+        values,
+        seen_end_offset,
+        args,
+        connection_type=connection_type,
+        edge_type=edge_type,
+        page_info_type=page_info_type,
+        total_count=total_count,
+        cursor_codec=cursor_codec,
+    )
+
+
+def _get_stream_slice(
+    args: Optional[ConnectionArguments] = None,
+    cursor_codec: Optional[CursorCodec] = None,
+) -> Tuple[int, Optional[int], Optional[int]]:
+    """Get the slice of a stream that needs to be consumed for a connection.
+
+    Returns the offsets where to start and stop consuming the stream (None meaning
+    that it must be consumed completely), and the size of the ring buffer if only
+    the last values of the consumed slice need to be kept.
+    """
+    args = args or {}
+    before = args.get("before")
+    after = args.get("after")
+    first = args.get("first")
+    last = args.get("last")
+
+    if isinstance(first, int) and first < 0:
+        raise ValueError("Argument 'first' must be a non-negative integer.")
+    if isinstance(last, int) and last < 0:
+        raise ValueError("Argument 'last' must be a non-negative integer.")
+
+    start_offset = max(get_offset_with_default(after, -1, cursor_codec) + 1, 0)
+
+    before_offset = get_offset_with_default(before, -1, cursor_codec)
+    stop_offset: Optional[int] = before_offset if before_offset >= 0 else None
+
+    if isinstance(first, int):
+        first_end_offset = start_offset + first
+        if stop_offset is None:
+            # look ahead one value to determine whether there is a next page
+            stop_offset = first_end_offset + 1
+        elif first_end_offset < stop_offset:
+            stop_offset = first_end_offset
+    if stop_offset is not None and stop_offset < start_offset:
+        stop_offset = start_offset
+
+    buffer_size = last if isinstance(last, int) and not isinstance(first, int) else None
+
+    return start_offset, stop_offset, buffer_size
+
+
+def _connection_from_stream_slice(
+    values: List[Any],
+    seen_end_offset: int,
+    args: Optional[ConnectionArguments] = None,
+    connection_type: ConnectionConstructor = Connection,
+    edge_type: EdgeConstructor = Edge,
+    page_info_type: PageInfoConstructor = PageInfo,
+    total_count: Optional[Callable[[], int]] = None,
+    cursor_codec: Optional[CursorCodec] = None,
+) -> ConnectionType:
+    """Create a connection object from the consumed slice of a stream.
+
+    The values must be the last ones of the slice determined by `_get_stream_slice`,
+    and `seen_end_offset` the offset where the consumption of the stream actually
+    stopped. The list of values will be trimmed down to the page in place.
+    """
+    args = args or {}
+    before = args.get("before")
+    after = args.get("after")
+    first = args.get("first")
+    last = args.get("last")
+
+    after_offset = get_offset_with_default(after, -1, cursor_codec)
+    start_offset = max(after_offset + 1, 0)
+    values_offset = max(seen_end_offset - len(values), start_offset)
+
+    end_offset = seen_end_offset
+    before_offset = get_offset_with_default(before, -1, cursor_codec)
+    if 0 <= before_offset < end_offset:
+        end_offset = before_offset
+    if isinstance(first, int) and start_offset + first < end_offset:
+        end_offset = start_offset + first
+    if end_offset < start_offset:
+        end_offset = start_offset
+
+    if isinstance(last, int) and end_offset - last > start_offset:
+        start_offset = end_offset - last
+
+    del values[: start_offset - values_offset]
+    del values[end_offset - start_offset :]
+
+    cursors = (
+        offsets_to_cursors(start_offset, len(values))
+        if cursor_codec is None
+        else cursor_codec.encode_batch(range(start_offset, start_offset + len(values)))
+    )
+    edges = [
+        edge_type(node=value, cursor=cursor) for value, cursor in zip(values, cursors)
+    ]
+
+    if isinstance(first, int):
+        has_next_page = (
+            end_offset < before_offset
+            if before_offset >= 0
+            else seen_end_offset > end_offset
+        )
+    else:
+        has_next_page = False
+
+    return connection_type(
+        edges=edges,
+        pageInfo=page_info_type(
+            startCursor=edges[0].cursor if edges else None,
+            endCursor=edges[-1].cursor if edges else None,
+            hasPreviousPage=isinstance(last, int)
+            and start_offset > (after_offset + 1 if after else 0),
+            hasNextPage=has_next_page,
+        ),
+        **_total_count_fields(total_count),
+    )
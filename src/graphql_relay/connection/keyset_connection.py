@@ -0,0 +1,169 @@
+from json import dumps, loads
+from typing import Any, Callable, Iterable, Optional
+
+try:
+    from typing import Protocol
+except ImportError:  # Python < 3.8
+    from typing_extensions import Protocol  # type: ignore
+
+from ..utils.base64 import base64, unbase64
+from .connection import (
+    Connection,
+    ConnectionArguments,
+    ConnectionConstructor,
+    ConnectionCursor,
+    ConnectionType,
+    CursorCodec,
+    Edge,
+    EdgeConstructor,
+    PageInfo,
+    PageInfoConstructor,
+    _total_count_fields,
+)
+
+__all__ = [
+    "connection_from_keyset",
+    "cursor_to_key",
+    "key_to_cursor",
+    "KeysetSource",
+    "MAX_KEYSET_CURSOR_LENGTH",
+]
+
+
+class KeysetSource(Protocol):
+    def fetch(
+        self,
+        after: Optional[Any],
+        before: Optional[Any],
+        limit: Optional[int],
+        reverse: bool,
+    ) -> Iterable[Any]:
+        ...
+
+
+def connection_from_keyset(
+    source: KeysetSource,
+    args: Optional[ConnectionArguments] = None,
+    key: Callable[[Any], Any] = lambda node: node,
+    connection_type: ConnectionConstructor = Connection,
+    edge_type: EdgeConstructor = Edge,
+    page_info_type: PageInfoConstructor = PageInfo,
+    total_count: Optional[Callable[[], int]] = None,
+    cursor_codec: Optional[CursorCodec] = None,
+) -> ConnectionType:
+    """Create a connection object using keyset (seek) pagination.
+
+    Instead of offsets, the cursors of this connection contain the sort key of the
+    node at the edge, as returned by the `key` function. The key must be a value
+    that can be serialized as JSON, or a tuple of such values.
+
+    The connection arguments are translated into a single call of the `fetch`
+    method of the given `source`, which must return the nodes with a key greater
+    than `after` and less than `before` (where `None` means unbounded), ordered
+    by their key, ascending or descending if `reverse` is set, and at most `limit`
+    of them if a limit is given. One more node than requested will be fetched in
+    order to determine whether there are more pages, so the cost of fetching a
+    page does not depend on its position in the result set.
+
+    Invalid cursors will be ignored, like in `connection_from_array`.
+
+    Since keyset pagination does not need the total count of the nodes, you can
+    pass a `total_count` function that will only be called if it is queried.
+
+    If you pass a `cursor_codec`, it will be used instead of `key_to_cursor`
+    and `cursor_to_key` for converting between sort keys and cursors.
+    """
+    args = args or {}
+    before = args.get("before")
+    after = args.get("after")
+    first = args.get("first")
+    last = args.get("last")
+
+    if isinstance(first, int) and first < 0:
+        raise ValueError("Argument 'first' must be a non-negative integer.")
+    if isinstance(last, int) and last < 0:
+        raise ValueError("Argument 'last' must be a non-negative integer.")
+
+    decode = cursor_to_key if cursor_codec is None else cursor_codec.decode
+    after_key = decode(after) if isinstance(after, str) else None
+    before_key = decode(before) if isinstance(before, str) else None
+
+    has_previous_page = has_next_page = False
+    if isinstance(first, int):
+        nodes = list(source.fetch(after_key, before_key, first + 1, False))
+        if len(nodes) > first:
+            has_next_page = True
+            del nodes[first:]
+        if isinstance(last, int) and len(nodes) > last:
+            has_previous_page = True
+            del nodes[: len(nodes) - last]
+    elif isinstance(last, int):
+        nodes = list(source.fetch(after_key, before_key, last + 1, True))
+        if len(nodes) > last:
+            has_previous_page = True
+            del nodes[last:]
+        nodes.reverse()
+    else:
+        nodes = list(source.fetch(after_key, before_key, None, False))
+
+    keys = map(key, nodes)
+    cursors = (
+        map(key_to_cursor, keys)
+        if cursor_codec is None
+        else cursor_codec.encode_batch(keys)
+    )
+    edges = [
+        edge_type(node=node, cursor=cursor) for node, cursor in zip(nodes, cursors)
+    ]
+
+    return connection_type(
+        edges=edges,
+        pageInfo=page_info_type(
+            startCursor=edges[0].cursor if edges else None,
+            endCursor=edges[-1].cursor if edges else None,
+            hasPreviousPage=has_previous_page,
+            hasNextPage=has_next_page,
+        ),
+        **_total_count_fields(total_count),
+    )
+
+
+KEYSET_PREFIX = "keyset:"
+
+# Keyset cursors that are longer than this will be rejected without decoding them.
+MAX_KEYSET_CURSOR_LENGTH = 1024
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def key_to_cursor(key: Any) -> ConnectionCursor:
+    """Create the cursor string from a sort key."""
+    return base64(KEYSET_PREFIX + dumps(key, separators=(",", ":")))
+
+
+def cursor_to_key(
+    cursor: ConnectionCursor, max_length: Optional[int] = None
+) -> Optional[Any]:
+    """Extract the sort key from the cursor string.
+
+    Returns None if the cursor is not a valid keyset cursor.
+    Keys that have been tuples will be returned as tuples again.
+
+    Only JSON scalars and flat lists of scalars are accepted as keys. Cursors that
+    are longer than `max_length` (by default `MAX_KEYSET_CURSOR_LENGTH`) are
+    rejected without decoding them.
+    """
+    if len(cursor) > (MAX_KEYSET_CURSOR_LENGTH if max_length is None else max_length):
+        return None
+    cursor = unbase64(cursor)
+    if not cursor.startswith(KEYSET_PREFIX):
+        return None
+    try:
+        key = loads(cursor[len(KEYSET_PREFIX) :])
+    except (ValueError, RecursionError):
+        return None
+    if isinstance(key, list):
+        if not all(isinstance(item, _SCALAR_TYPES) for item in key):
+            return None
+        return tuple(key)
+    return key if isinstance(key, _SCALAR_TYPES) else None
@@ -0,0 +1,103 @@
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
+
+__all__ = ["ObjectIndex"]
+
+
+class ObjectIndex:
+    """An index mapping the objects in a sequence to their offsets.
+
+    Looking up the offset of an object in a sequence with its `index` method
+    needs time proportional to the length of the sequence. This index builds
+    a dictionary from the objects, or the keys returned by the `key` function,
+    to their first offsets in the sequence, so that repeated lookups need
+    constant time. Pass it as `index` to `cursor_for_object_in_connection`.
+
+    The index is maintained incrementally: objects that have been appended to
+    the sequence are indexed when they are first looked up. When an object is
+    found at an offset that does not hold it any more, or is not found after the
+    sequence has grown, so that it may have been inserted, the index is rebuilt.
+    After other changes to the sequence, e.g. when objects have been replaced
+    or removed, you need to call `invalidate` so that the index will be rebuilt.
+    If the sequence contains unhashable objects, it will be searched instead.
+    """
+
+    __slots__ = "data", "key", "_offsets", "_length"
+
+    data: Sequence
+    key: Optional[Callable[[Any], Hashable]]
+
+    def __init__(
+        self, data: Sequence, key: Optional[Callable[[Any], Hashable]] = None
+    ) -> None:
+        self.data = data
+        self.key = key
+        self._offsets: Dict[Hashable, int] = {}
+        self._length = 0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} of {self._length} objects>"
+
+    def invalidate(self) -> None:
+        """Invalidate the index so that it will be rebuilt on the next lookup."""
+        self._offsets = {}
+        self._length = 0
+
+    def _update(self) -> None:
+        """Index the objects that have been appended to the sequence."""
+        data = self.data
+        length = len(data)
+        if length < self._length:
+            self.invalidate()
+        offsets = self._offsets
+        key = self.key
+        for offset in range(self._length, length):
+            obj = data[offset]
+            offsets.setdefault(obj if key is None else key(obj), offset)
+        self._length = length
+
+    def offset_of(self, obj: Any) -> Optional[int]:
+        """Get the offset of the given object in the sequence.
+
+        Returns None if the object is not contained in the sequence.
+        If a `key` function has been given, the object may be anything
+        with the same key as the object in the sequence.
+        """
+        key = self.key
+        obj_key = obj if key is None else key(obj)
+        try:
+            hash(obj_key)
+        except TypeError:  # unhashable objects can only be searched
+            return self._search(obj_key)
+        try:
+            return self._lookup(obj_key)
+        except TypeError:  # the sequence contains unhashable objects
+            return self._search(obj_key)
+
+    def _lookup(self, obj_key: Hashable) -> Optional[int]:
+        """Look up the offset of an object with the given key in the index."""
+        indexed_length = self._length
+        self._update()
+        offset = self._offsets.get(obj_key)
+        if offset is None:
+            if 0 < indexed_length < self._length:
+                # the object may have been inserted instead of appended
+                self.invalidate()
+                self._update()
+                offset = self._offsets.get(obj_key)
+        else:
+            key = self.key
+            found = self.data[offset]
+            if (found if key is None else key(found)) != obj_key:
+                # the sequence has been changed in place
+                self.invalidate()
+                self._update()
+                offset = self._offsets.get(obj_key)
+        return offset
+
+    def _search(self, obj_key: Any) -> Optional[int]:
+        """Search the offset of an object with the given key in the sequence."""
+        key = self.key
+        for offset, obj in enumerate(self.data):
+            if (obj if key is None else key(obj)) == obj_key:
+                return offset
+        return None
@@ -0,0 +1,78 @@
+from typing import cast, Collection, Dict, List, NamedTuple, Set
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLResolveInfo,
+    InlineFragmentNode,
+    SelectionSetNode,
+)
+
+__all__ = ["get_connection_selection", "ConnectionSelection"]
+
+
+class ConnectionSelection(NamedTuple):
+    """The parts of a connection that are needed by the selection set of a query.
+
+    The flags tell whether the `edges` of the connection, its `nodes` or
+    the cursors of the edges are needed. The page info is always needed.
+    """
+
+    edges: bool
+    nodes: bool
+    cursors: bool
+
+
+# Fields of connections and edges that do not need edges or cursors.
+# Any unknown field like a custom field is assumed to need them.
+_connection_fields_without_edges = frozenset(
+    ["pageInfo", "nodes", "totalCount", "__typename"]
+)
+_edge_fields_without_cursors = frozenset(["node", "__typename"])
+
+
+def get_connection_selection(info: GraphQLResolveInfo) -> ConnectionSelection:
+    """Get the parts of a connection that are needed for the given field.
+
+    Given the resolve info of a connection field, this function inspects the
+    selection set of the field and returns which parts of the connection will
+    actually be queried, so that the work of creating the other parts can be
+    skipped by passing the result to `connection_from_array` as `selection`.
+
+    Directives like `@include` and `@skip` are not evaluated, the fields using
+    them are always considered to be selected.
+    """
+    fragments = info.fragments
+    fields = _collect_fields(info.field_nodes, fragments)
+    edges = any(name not in _connection_fields_without_edges for name in fields)
+    edge_fields = _collect_fields(fields.get("edges", []), fragments)
+    cursors = any(name not in _edge_fields_without_cursors for name in edge_fields)
+    return ConnectionSelection(edges=edges, nodes="nodes" in fields, cursors=cursors)
+
+
+def _collect_fields(
+    field_nodes: Collection[FieldNode],
+    fragments: Dict[str, FragmentDefinitionNode],
+) -> Dict[str, List[FieldNode]]:
+    """Collect the sub fields of the given field nodes by their names."""
+    fields: Dict[str, List[FieldNode]] = {}
+    visited_fragments: Set[str] = set()
+
+    def collect(selection_set: SelectionSetNode) -> None:
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                fields.setdefault(selection.name.value, []).append(selection)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                if name not in visited_fragments:
+                    visited_fragments.add(name)
+                    # the query has been validated, so the fragment exists
+                    collect(fragments[name].selection_set)
+            else:
+                collect(cast(InlineFragmentNode, selection).selection_set)
+
+    for field_node in field_nodes:
+        # connections and edges are objects, so their fields have selection sets
+        collect(cast(SelectionSetNode, field_node.selection_set))
+    return fields
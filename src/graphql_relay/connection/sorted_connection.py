@@ -0,0 +1,152 @@
+from typing import Any, Callable, Optional, Sequence
+
+from .connection import (
+    Connection,
+    ConnectionArguments,
+    ConnectionConstructor,
+    ConnectionCursor,
+    ConnectionType,
+    CursorCodec,
+    Edge,
+    EdgeConstructor,
+    PageInfo,
+    PageInfoConstructor,
+)
+from .keyset_connection import connection_from_keyset, cursor_to_key, key_to_cursor
+
+__all__ = [
+    "connection_from_sorted_array",
+    "cursor_for_object_in_sorted_connection",
+    "SortedSequenceSource",
+]
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _bisect_left(data: Sequence, value: Any, key: Callable[[Any], Any]) -> int:
+    """Get the offset of the first item with a key not less than the given value."""
+    lo, hi = 0, len(data)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if key(data[mid]) < value:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _bisect_right(data: Sequence, value: Any, key: Callable[[Any], Any]) -> int:
+    """Get the offset of the first item with a key greater than the given value."""
+    lo, hi = 0, len(data)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if value < key(data[mid]):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class SortedSequenceSource:
+    """A keyset source for a sequence that is sorted by the given key function.
+
+    The nodes after and before a given key are found by binary search, so that
+    fetching a page needs only a logarithmic number of key comparisons.
+    The keys must be unique, and they must be comparable with the keys
+    that are stored in the cursors, e.g. tuples for composite keys.
+    """
+
+    __slots__ = "data", "key"
+
+    data: Sequence
+    key: Callable[[Any], Any]
+
+    def __init__(self, data: Sequence, key: Callable[[Any], Any] = _identity) -> None:
+        self.data = data
+        self.key = key
+
+    def fetch(
+        self,
+        after: Optional[Any],
+        before: Optional[Any],
+        limit: Optional[int],
+        reverse: bool,
+    ) -> Sequence:
+        data, key = self.data, self.key
+        start = 0 if after is None else _bisect_right(data, after, key)
+        end = len(data) if before is None else _bisect_left(data, before, key)
+        if end < start:
+            end = start
+        if limit is not None:
+            if reverse:
+                start = max(start, end - limit)
+            else:
+                end = min(end, start + limit)
+        nodes = data[start:end]
+        return nodes[::-1] if reverse else nodes
+
+
+def connection_from_sorted_array(
+    data: Sequence,
+    args: Optional[ConnectionArguments] = None,
+    key: Callable[[Any], Any] = _identity,
+    connection_type: ConnectionConstructor = Connection,
+    edge_type: EdgeConstructor = Edge,
+    page_info_type: PageInfoConstructor = PageInfo,
+    total_count: Optional[Callable[[], int]] = None,
+    cursor_codec: Optional[CursorCodec] = None,
+) -> ConnectionType:
+    """Create a connection object from a sequence sorted by the given key function.
+
+    This works like `connection_from_keyset` with a `SortedSequenceSource`: the
+    cursors contain the sort keys of the nodes, and the `after` and `before`
+    cursors are resolved by binary search instead of scanning the sequence.
+    Unlike offset cursors, the cursors stay valid when nodes are inserted.
+
+    Cursors with keys that cannot be compared with the keys of the nodes
+    will be ignored, like invalid cursors.
+    """
+    if args:
+        decode = cursor_to_key if cursor_codec is None else cursor_codec.decode
+        for name in ("after", "before"):
+            cursor = args.get(name)
+            if not isinstance(cursor, str):
+                continue
+            try:
+                _bisect_left(data, decode(cursor), key)
+            except TypeError:  # the keys cannot be compared
+                args = {**args, name: None}
+    return connection_from_keyset(
+        SortedSequenceSource(data, key),
+        args,
+        key=key,
+        connection_type=connection_type,
+        edge_type=edge_type,
+        page_info_type=page_info_type,
+        total_count=total_count,
+        cursor_codec=cursor_codec,
+    )
+
+
+def cursor_for_object_in_sorted_connection(
+    data: Sequence,
+    obj: Any,
+    key: Callable[[Any], Any] = _identity,
+    cursor_codec: Optional[CursorCodec] = None,
+) -> Optional[ConnectionCursor]:
+    """Return the cursor associated with an object in a sorted sequence.
+
+    The object is searched by its key using binary search, and the returned
+    cursor is the one used by `connection_from_sorted_array`. Returns None
+    if the sequence does not contain an object with the same key.
+    """
+    value = key(obj)
+    try:
+        offset = _bisect_left(data, value, key)
+    except TypeError:  # the keys cannot be compared
+        return None
+    if offset >= len(data) or key(data[offset]) != value:
+        return None
+    return key_to_cursor(value) if cursor_codec is None else cursor_codec.encode(value)
@@ -0,0 +1,147 @@
+from asyncio import ensure_future, gather, AbstractEventLoop, Future
+from collections.abc import Mapping
+from inspect import isawaitable
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from graphql.pyutils import AwaitableOrValue
+
+try:
+    from asyncio import get_running_loop
+except ImportError:  # Python < 3.7
+    from asyncio import _get_running_loop
+
+    def get_running_loop() -> AbstractEventLoop:
+        loop = _get_running_loop()
+        if loop is None:
+            raise RuntimeError("no running event loop")
+        return loop
+
+
+__all__ = ["DataLoader", "BatchLoadFn"]
+
+# A function loading the values for several keys at once. It may return a mapping
+# from the keys to the values, or a sequence of values in the order of the keys,
+# and it may return synchronously or asynchronously. If an info object has been
+# passed when loading the keys, it is passed to the function as second argument.
+BatchLoadFn = Callable[..., AwaitableOrValue[Any]]
+
+
+class DataLoader:
+    """A loader collecting the keys loaded in the same tick of the event loop.
+
+    All keys that are loaded before the event loop gets control again are passed
+    to the `batch_load` function in one call, and the futures returned by `load`
+    are resolved with the values returned for the keys, or None for missing keys.
+    Unless `cache` is disabled, the futures will be cached, so that every key is
+    loaded only once. Since the cache is not invalidated automatically, a loader
+    should be used only for one request. The loader must be used from within a
+    running event loop.
+
+    You can pass an `info` object like the resolve info of a field with the keys.
+    The `batch_load` function then gets the info passed with the first key of
+    the batch as second argument.
+    """
+
+    def __init__(self, batch_load: BatchLoadFn, cache: bool = True) -> None:
+        self.batch_load = batch_load
+        self._cache: Dict[Hashable, "Future[Any]"] = {}
+        self._use_cache = cache
+        self._queue: List[Tuple[Any, "Future[Any]", Any]] = []
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} with {len(self._cache)} cached values>"
+
+    @staticmethod
+    def can_load(is_awaitable: Optional[Callable[[Any], bool]] = None) -> bool:
+        """Check whether the loader can be used, i.e. an event loop is running.
+
+        You can also pass the `is_awaitable` function of the execution context.
+        The loader will then only be usable if the execution awaits the futures
+        returned by the loader, which is not the case when executing synchronously.
+        """
+        loop = _running_loop()
+        if loop is None:
+            return False
+        return is_awaitable is None or is_awaitable(loop.create_future())
+
+    def load(self, key: Hashable, info: Any = None) -> "Future[Any]":
+        """Load the value for the given key."""
+        if self._use_cache:
+            future = self._cache.get(key)
+            if future is not None:
+                return future
+        loop = get_running_loop()
+        future = loop.create_future()
+        if self._use_cache:
+            self._cache[key] = future
+        if not self._queue:
+            loop.call_soon(self._dispatch)
+        self._queue.append((key, future, info))
+        return future
+
+    def load_many(
+        self, keys: Iterable[Hashable], info: Any = None
+    ) -> Awaitable[List[Any]]:
+        """Load the values for the given keys."""
+        return gather(*(self.load(key, info) for key in keys))
+
+    def prime(self, key: Hashable, value: Any) -> None:
+        """Put the given value for the given key into the cache."""
+        if self._use_cache and key not in self._cache:
+            future = get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    def clear(self, key: Any = None) -> None:
+        """Remove the value for the given key or all values from the cache."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _dispatch(self) -> None:
+        """Load the values for all keys that have been collected in one batch."""
+        queue, self._queue = self._queue, []
+        ensure_future(self._load_batch(queue))
+
+    async def _load_batch(self, queue: List[Tuple[Any, "Future[Any]", Any]]) -> None:
+        keys = list(dict.fromkeys(key for key, _future, _info in queue))
+        info = queue[0][2]
+        try:
+            values = (
+                self.batch_load(keys) if info is None else self.batch_load(keys, info)
+            )
+            if isawaitable(values):
+                values = await values
+            values_by_key = (
+                values if isinstance(values, Mapping) else dict(zip(keys, values))
+            )
+        except Exception as error:
+            # do not cache the failure, so that the keys can be loaded again
+            for key, future, _info in queue:
+                if self._cache.get(key) is future:
+                    del self._cache[key]
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for key, future, _info in queue:
+            if not future.done():
+                future.set_result(values_by_key.get(key))
+
+
+def _running_loop() -> Optional[AbstractEventLoop]:
+    """Get the running event loop or None if no event loop is running."""
+    try:
+        return get_running_loop()
+    except RuntimeError:
+        return None
@@ -1,6 +1,22 @@
-from typing import Any, Callable, NamedTuple, Optional, Union
+from asyncio import ensure_future, gather, Future
+from collections.abc import Mapping
+from concurrent.futures import Executor
+from functools import partial
+from inspect import isawaitable
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from graphql_relay.utils.base64 import base64, unbase64
+from graphql_relay.utils.context import ContextStorage
 
 from graphql import (
     GraphQLArgument,
@@ -12,17 +28,27 @@ from graphql import (
     GraphQLResolveInfo,
     GraphQLTypeResolver,
 )
+from graphql.pyutils import AwaitableOrValue
+
+from .data_loader import DataLoader
 
 __all__ = [
     "from_global_id",
     "global_id_field",
     "node_definitions",
     "to_global_id",
+    "FetchByIds",
     "GraphQLNodeDefinitions",
     "ResolvedGlobalId",
 ]
 
 
+# A function fetching several objects at once, given their IDs and the resolve info.
+# It may return a mapping from the IDs to the objects, or a sequence of objects
+# in the order of the IDs, and it may return synchronously or asynchronously.
+FetchByIds = Callable[[List[str], GraphQLResolveInfo], AwaitableOrValue[Any]]
+
+
 class GraphQLNodeDefinitions(NamedTuple):
 
     node_interface: GraphQLInterfaceType
@@ -31,8 +57,13 @@ class GraphQLNodeDefinitions(NamedTuple):
 
 
 def node_definitions(
-    fetch_by_id: Callable[[str, GraphQLResolveInfo], Any],
+    fetch_by_id: Optional[Callable[[str, GraphQLResolveInfo], Any]] = None,
     type_resolver: Optional[GraphQLTypeResolver] = None,
+    fetch_by_ids: Optional[FetchByIds] = None,
+    type_fetchers: Optional[Dict[str, FetchByIds]] = None,
+    batch_loading: bool = False,
+    executor: Optional[Executor] = None,
+    identity_map: bool = False,
 ) -> GraphQLNodeDefinitions:
     """
     Given a function to map from an ID to an underlying object, and a function
@@ -43,7 +74,61 @@ def node_definitions(
     If the type_resolver is omitted, object resolution on the interface will be
     handled with the `is_type_of` method on object types, as with any GraphQL
     interface without a provided `resolve_type` method.
+
+    If a `fetch_by_ids` function is given, the `nodes` field will fetch all
+    objects with a single call of this function instead of calling `fetch_by_id`
+    for every ID. It gets the distinct IDs and may return a mapping from the IDs
+    to the objects or a sequence with the objects in the order of the given IDs.
+    The objects will be returned in the requested order, with null for IDs that
+    could not be fetched.
+
+    Instead of these functions, you can also pass a registry `type_fetchers`
+    mapping type names to batch functions like `fetch_by_ids`, which get the
+    type-specific IDs. The global IDs passed to the `node` and `nodes` fields
+    will then be decoded with `from_global_id` and grouped by type, and each
+    of the needed batch functions will be called only once. If you pass
+    `fetch_by_id` or `fetch_by_ids` as well, these will be used instead of the
+    `type_fetchers` for the `node` or the `nodes` field, respectively.
+
+    If you set `batch_loading`, a `DataLoader` will be attached to the context
+    of every request executed asynchronously. It collects the IDs of all `node`
+    and `nodes` fields that are resolved in the same tick of the event loop and
+    fetches them with one call of the batch function, which gets the resolve info
+    of the first of these fields. The fetched objects are cached per request.
+    Requests executed synchronously, even from within a running event loop, or
+    with a context that cannot hold the loader, like None, will be resolved
+    without the loader.
+
+    If you pass an `executor`, such as a `ThreadPoolExecutor`, the `nodes` field
+    will run the fetches in the executor concurrently: the batch functions for
+    the different types if `type_fetchers` are given, or the `fetch_by_id` calls
+    if there is no batch function. This allows blocking fetch functions to overlap
+    when the schema is executed synchronously. The `node` field fetches only one
+    object and therefore does not use the executor. Since a `fetch_by_ids`
+    function fetches all objects in one call, it cannot be combined with an
+    `executor`; pass `type_fetchers` instead if you want to use both.
+
+    If you set `identity_map`, the objects fetched by the `node` and `nodes`
+    fields will be remembered by their global IDs in a map attached to the
+    context of the request, so that every ID is fetched only once per request,
+    even if it is requested several times, e.g. in one `nodes` list. This needs
+    a context that can hold the map, i.e. a dict or an object that can be weakly
+    referenced; otherwise the objects will be fetched without the identity map.
     """
+    if executor is not None and fetch_by_ids is not None:
+        raise TypeError("An executor cannot be used with fetch_by_ids.")
+    if type_fetchers is not None:
+        if fetch_by_id is None:
+            fetch_by_id = partial(_fetch_node_by_type, type_fetchers)
+        if fetch_by_ids is None:
+            fetch_by_ids = partial(
+                _fetch_nodes_by_type, type_fetchers, executor=executor
+            )
+    elif fetch_by_id is None:
+        raise TypeError("Either fetch_by_id or type_fetchers must be passed.")
+    if batch_loading and fetch_by_ids is None:
+        raise TypeError("Batch loading needs fetch_by_ids or type_fetchers.")
+
     node_interface = GraphQLInterfaceType(
         "Node",
         description="An object with an ID",
@@ -55,6 +140,118 @@ def node_definitions(
         resolve_type=type_resolver,
     )
 
+    # noinspection PyShadowingBuiltins
+    def resolve_node(_obj: Any, info: GraphQLResolveInfo, id: str) -> Any:
+        return fetch_by_id(id, info)
+
+    resolve_nodes: Callable[..., Any]
+    if fetch_by_ids is None:
+        if executor is None:
+
+            def resolve_nodes(
+                _obj: Any, info: GraphQLResolveInfo, ids: List[str]
+            ) -> Any:
+                return [fetch_by_id(id_, info) for id_ in ids]
+
+        else:
+            node_executor = executor
+
+            def resolve_nodes(
+                _obj: Any, info: GraphQLResolveInfo, ids: List[str]
+            ) -> Any:
+                unique_ids = list(dict.fromkeys(ids))
+                if len(unique_ids) < 2:
+                    return [fetch_by_id(id_, info) for id_ in ids]
+                nodes = node_executor.map(
+                    fetch_by_id, unique_ids, [info] * len(unique_ids)
+                )
+                return _order_nodes(ids, unique_ids, nodes)
+
+    else:
+
+        def resolve_nodes(_obj: Any, info: GraphQLResolveInfo, ids: List[str]) -> Any:
+            unique_ids = list(dict.fromkeys(ids))
+            nodes = fetch_by_ids(unique_ids, info)
+            if isawaitable(nodes):
+
+                async def await_nodes() -> List[Any]:
+                    return _order_nodes(ids, unique_ids, await nodes)
+
+                return await_nodes()
+
+            return _order_nodes(ids, unique_ids, nodes)
+
+    if batch_loading:
+        fetch_batch: FetchByIds = fetch_by_ids  # type: ignore
+        loaders = ContextStorage()
+        resolve_node_unbatched = resolve_node
+        resolve_nodes_unbatched = resolve_nodes
+
+        def get_loader(info: GraphQLResolveInfo) -> Optional[DataLoader]:
+            if not DataLoader.can_load(info.is_awaitable):
+                return None
+            return loaders.get(info.context, lambda: DataLoader(fetch_batch))
+
+        # noinspection PyShadowingBuiltins
+        def resolve_node(_obj: Any, info: GraphQLResolveInfo, id: str) -> Any:
+            loader = get_loader(info)
+            if loader is None:
+                return resolve_node_unbatched(_obj, info, id)
+            return loader.load(id, info)
+
+        def resolve_nodes(_obj: Any, info: GraphQLResolveInfo, ids: List[str]) -> Any:
+            loader = get_loader(info)
+            if loader is None:
+                return resolve_nodes_unbatched(_obj, info, ids)
+            return loader.load_many(ids, info)
+
+    if identity_map:
+        identity_maps = ContextStorage()
+        resolve_node_unmapped = resolve_node
+        resolve_nodes_unmapped = resolve_nodes
+
+        # noinspection PyShadowingBuiltins
+        def resolve_node(_obj: Any, info: GraphQLResolveInfo, id: str) -> Any:
+            nodes = identity_maps.get(info.context, dict)
+            if nodes is None:
+                return resolve_node_unmapped(_obj, info, id)
+            if id not in nodes:
+                node = resolve_node_unmapped(_obj, info, id)
+                if isawaitable(node):
+                    _remember_awaitable(nodes, id, node)
+                else:
+                    nodes[id] = node
+            return nodes[id]
+
+        def resolve_nodes(_obj: Any, info: GraphQLResolveInfo, ids: List[str]) -> Any:
+            nodes = identity_maps.get(info.context, dict)
+            if nodes is None:
+                return resolve_nodes_unmapped(_obj, info, ids)
+            missing_ids = [id_ for id_ in dict.fromkeys(ids) if id_ not in nodes]
+            if missing_ids:
+                fetched = resolve_nodes_unmapped(_obj, info, missing_ids)
+                if isawaitable(fetched):
+                    fetched = ensure_future(fetched)
+                    for index, id_ in enumerate(missing_ids):
+                        _remember_awaitable(nodes, id_, _get_item(fetched, index))
+                else:
+                    for id_, node in zip(missing_ids, fetched):
+                        if isawaitable(node):
+                            _remember_awaitable(nodes, id_, node)
+                        else:
+                            nodes[id_] = node
+            result = [nodes[id_] for id_ in ids]
+            if any(isawaitable(node) for node in result):
+
+                async def await_nodes() -> List[Any]:
+                    return [
+                        (await node) if isawaitable(node) else node for node in result
+                    ]
+
+                return await_nodes()
+
+            return result
+
     # noinspection PyShadowingBuiltins
     node_field = GraphQLField(
         node_interface,
@@ -64,7 +261,7 @@ def node_definitions(
                 GraphQLNonNull(GraphQLID), description="The ID of an object"
             )
         },
-        resolve=lambda _obj, info, id: fetch_by_id(id, info),
+        resolve=resolve_node,
     )
 
     nodes_field = GraphQLField(
@@ -76,12 +273,111 @@ def node_definitions(
                 description="The IDs of objects",
             )
         },
-        resolve=lambda _obj, info, ids: [fetch_by_id(id_, info) for id_ in ids],
+        resolve=resolve_nodes,
     )
 
     return GraphQLNodeDefinitions(node_interface, node_field, nodes_field)
 
 
+def _order_nodes(ids: List[str], unique_ids: List[str], nodes: Any) -> List[Any]:
+    """Put the nodes fetched for the unique IDs in the order of the requested IDs."""
+    nodes_by_id = nodes if isinstance(nodes, Mapping) else dict(zip(unique_ids, nodes))
+    return [nodes_by_id.get(id_) for id_ in ids]
+
+
+def _remember_awaitable(
+    nodes: Dict[str, Any], id_: str, awaitable: Awaitable[Any]
+) -> "Future[Any]":
+    """Remember an awaitable node in the identity map as a future.
+
+    Unlike a coroutine, the future can be awaited several times. It will be
+    removed from the identity map again if it fails, so that it can be refetched.
+    """
+    future = ensure_future(awaitable)
+
+    def forget_failure(future: "Future[Any]") -> None:
+        if (future.cancelled() or future.exception()) and nodes.get(id_) is future:
+            del nodes[id_]
+
+    future.add_done_callback(forget_failure)
+    nodes[id_] = future
+    return future
+
+
+async def _get_item(awaitable: Awaitable[List[Any]], index: int) -> Any:
+    """Get the item with the given index of an awaitable list."""
+    return (await awaitable)[index]
+
+
+def _fetch_nodes_by_type(
+    type_fetchers: Dict[str, FetchByIds],
+    ids: List[str],
+    info: GraphQLResolveInfo,
+    executor: Optional[Executor] = None,
+) -> AwaitableOrValue[List[Any]]:
+    """Fetch the nodes for the given global IDs with one call per type.
+
+    The global IDs are decoded and grouped by type, and the type-specific IDs
+    are passed to the batch function registered for the type. IDs of unknown
+    types will be resolved as None. If any of the batch functions returns an
+    awaitable, all of them will be awaited concurrently. If an executor is given,
+    the batch functions for the different types will be run in the executor.
+    """
+    resolved_ids = [from_global_id(id_) for id_ in ids]
+    ids_by_type: Dict[str, Dict[str, None]] = {}
+    for type_, id_ in resolved_ids:
+        if type_ in type_fetchers:
+            ids_by_type.setdefault(type_, {})[id_] = None
+    types = [(type_, list(ids_of_type)) for type_, ids_of_type in ids_by_type.items()]
+    if executor is None or len(types) < 2:
+        results = [
+            type_fetchers[type_](ids_of_type, info) for type_, ids_of_type in types
+        ]
+    else:
+        futures = [
+            executor.submit(type_fetchers[type_], ids_of_type, info)
+            for type_, ids_of_type in types
+        ]
+        results = [future.result() for future in futures]
+
+    def assemble(results: List[Any]) -> List[Any]:
+        nodes: Dict[Tuple[str, str], Any] = {}
+        for (type_, ids_of_type), nodes_of_type in zip(types, results):
+            ordered_nodes = _order_nodes(ids_of_type, ids_of_type, nodes_of_type)
+            for id_, node in zip(ids_of_type, ordered_nodes):
+                nodes[type_, id_] = node
+        return [nodes.get(resolved_id) for resolved_id in resolved_ids]
+
+    if any(isawaitable(result) for result in results):
+
+        async def await_results() -> List[Any]:
+            awaited = iter(
+                await gather(*(result for result in results if isawaitable(result)))
+            )
+            return assemble(
+                [next(awaited) if isawaitable(result) else result for result in results]
+            )
+
+        return await_results()
+
+    return assemble(results)
+
+
+def _fetch_node_by_type(
+    type_fetchers: Dict[str, FetchByIds], id_: str, info: GraphQLResolveInfo
+) -> AwaitableOrValue[Any]:
+    """Fetch the node for the given global ID using the registered batch function."""
+    nodes = _fetch_nodes_by_type(type_fetchers, [id_], info)
+    if isawaitable(nodes):
+
+        async def await_node() -> Any:
+            return (await nodes)[0]
+
+        return await_node()
+
+    return nodes[0]
+
+
 class ResolvedGlobalId(NamedTuple):
 
     type: str
@@ -96,11 +392,22 @@ def to_global_id(type_: str, id_: Union[str, int]) -> str:
     return base64(f"{type_}:{GraphQLID.serialize(id_)}")
 
 
-def from_global_id(global_id: str) -> ResolvedGlobalId:
+# Global IDs that are longer than this will be rejected without decoding them.
+MAX_GLOBAL_ID_LENGTH = 1024
+
+
+def from_global_id(
+    global_id: str, max_length: Optional[int] = None
+) -> ResolvedGlobalId:
     """
     Takes the "global ID" created by to_global_id, and returns the type name and ID
     used to create it.
+
+    Global IDs that are longer than `max_length` (by default `MAX_GLOBAL_ID_LENGTH`)
+    are treated as invalid right away, without decoding them.
     """
+    if len(global_id) > (MAX_GLOBAL_ID_LENGTH if max_length is None else max_length):
+        return ResolvedGlobalId("", "")
     global_id = unbase64(global_id)
     if ":" not in global_id:
         return ResolvedGlobalId("", global_id)
@@ -1,5 +1,6 @@
 """graphql_relay.utils"""
 
 from .base64 import base64, unbase64
+from .context import ContextStorage
 
-__all__ = ["base64", "unbase64"]
+__all__ = ["base64", "unbase64", "ContextStorage"]
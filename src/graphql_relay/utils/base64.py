@@ -1,24 +1,30 @@
-from base64 import b64encode, b64decode
-import binascii
+from binascii import a2b_base64, b2a_base64
 
 __all__ = ["base64", "unbase64"]
 
 Base64String = str
 
 
+# Note: These functions are on the hot path for all cursors and global IDs,
+# therefore they call the binascii functions directly instead of going through
+# the base64 module, and they avoid type checks where exceptions can be used.
+# The results are the same as with b64encode() and b64decode(validate=False).
+
+
 def base64(s: str) -> Base64String:
     """Encode the string s using Base64."""
-    b: bytes = s.encode("utf-8") if isinstance(s, str) else s
-    return b64encode(b).decode("ascii")
+    try:
+        b: bytes = s.encode("utf-8")
+    except AttributeError:  # the string has already been encoded to bytes
+        b = s  # type: ignore
+    return b2a_base64(b, newline=False).decode("ascii")
 
 
 def unbase64(s: Base64String) -> str:
     """Decode the string s using Base64."""
     try:
-        b: bytes = s.encode("ascii") if isinstance(s, str) else s
-    except UnicodeEncodeError:
-        return ""
-    try:
-        return b64decode(b).decode("utf-8")
-    except (binascii.Error, UnicodeDecodeError):
+        # binascii.Error and UnicodeDecodeError are subclasses of ValueError,
+        # and a ValueError is also raised for strings with non-ASCII characters
+        return a2b_base64(s).decode("utf-8")
+    except ValueError:
         return ""
@@ -0,0 +1,36 @@
+from typing import Any, Callable, Optional
+from weakref import WeakKeyDictionary
+
+__all__ = ["ContextStorage"]
+
+
+class ContextStorage:
+    """Storage for values that are attached to the context of a request.
+
+    The values are stored in the context itself if it is a dictionary, otherwise
+    in a weak dictionary keyed by the context, so that they are released together
+    with the context. Contexts that are neither dictionaries nor can be weakly
+    referenced, like None, cannot hold values.
+    """
+
+    def __init__(self) -> None:
+        self._values: WeakKeyDictionary = WeakKeyDictionary()
+
+    def get(self, context: Any, factory: Callable[[], Any]) -> Optional[Any]:
+        """Get the value attached to the context, creating it if needed.
+
+        Returns None if no value can be attached to the given context.
+        """
+        if isinstance(context, dict):
+            value = context.get(self)
+            if value is None:
+                value = context[self] = factory()
+            return value
+        values = self._values
+        try:
+            value = values.get(context)
+            if value is None:
+                value = values[context] = factory()
+        except TypeError:  # the context cannot be weakly referenced
+            return None
+        return value
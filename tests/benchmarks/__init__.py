@@ -0,0 +1,6 @@
+"""Microbenchmarks for graphql-relay
+
+These are not run as part of the tests, run them like this:
+
+    python -m tests.benchmarks.base64_benchmark
+"""
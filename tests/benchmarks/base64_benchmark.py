@@ -0,0 +1,69 @@
+"""Compare the Base64 codec with the straightforward implementation."""
+
+from base64 import b64decode, b64encode
+from binascii import Error
+from timeit import repeat
+from typing import Callable, List, Tuple
+
+from graphql_relay.utils import base64, unbase64
+
+
+def reference_base64(s: str) -> str:
+    """Encode the string s using Base64 via the base64 module."""
+    b: bytes = s.encode("utf-8") if isinstance(s, str) else s
+    return b64encode(b).decode("ascii")
+
+
+def reference_unbase64(s: str) -> str:
+    """Decode the string s using Base64 via the base64 module."""
+    try:
+        b: bytes = s.encode("ascii") if isinstance(s, str) else s
+    except UnicodeEncodeError:
+        return ""
+    try:
+        return b64decode(b).decode("utf-8")
+    except (Error, UnicodeDecodeError):
+        return ""
+
+
+payloads = {
+    "cursor": "arrayconnection:1234",
+    "global id": "User:c5d0e4c1-77f0-4a4b-8c3d-2f6e51d8a9b0",
+    "unicode": "Användare:Jürgen",
+}
+
+NUMBER = 100_000
+
+
+def best_time(func: Callable[[str], str], arg: str) -> float:
+    return min(repeat(lambda: func(arg), number=NUMBER, repeat=5)) / NUMBER
+
+
+def run() -> List[Tuple[str, str, float, float]]:
+    results = []
+    for name, payload in payloads.items():
+        encoded = base64(payload)
+        assert encoded == reference_base64(payload)
+        assert unbase64(encoded) == reference_unbase64(encoded) == payload
+        for operation, func, reference, arg in (
+            ("base64", base64, reference_base64, payload),
+            ("unbase64", unbase64, reference_unbase64, encoded),
+            ("unbase64 invalid", unbase64, reference_unbase64, encoded[1:]),
+        ):
+            results.append(
+                (name, operation, best_time(reference, arg), best_time(func, arg))
+            )
+    return results
+
+
+def main() -> None:
+    print(f"{'payload':<10} {'operation':<17} {'reference':>10} {'fast':>10}")
+    for name, operation, reference_time, time in run():
+        print(
+            f"{name:<10} {operation:<17} {reference_time * 1e9:8.0f}ns"
+            f" {time * 1e9:8.0f}ns  {reference_time / time:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,39 @@
-from typing import cast, Sequence
+from typing import cast, List, Sequence
 
-from pytest import deprecated_call, raises
+from pytest import deprecated_call, fixture, mark, raises
+
+from graphql import (
+    graphql_sync,
+    GraphQLField,
+    GraphQLObjectType,
+    GraphQLSchema,
+    GraphQLString,
+)
 
 from graphql_relay import (
     connection_from_array,
     connection_from_array_slice,
+    cursor_cache,
     cursor_for_object_in_connection,
+    cursor_to_offset,
+    connection_args,
+    connection_definitions,
+    get_connection_window,
+    offset_to_compact_cursor,
     offset_to_cursor,
+    offsets_to_cursors,
+    use_compact_cursors,
     Connection,
+    ConnectionWindow,
+    ObjectIndex,
+    OffsetEdge,
+    OffsetEdges,
+    SliceConnection,
     Edge,
     PageInfo,
+    TotalCount,
 )
+from graphql_relay.utils import base64
 
 array_abcde = ["A", "B", "C", "D", "E"]
 
@@ -27,6 +50,13 @@ edge_d = Edge(node="D", cursor=cursor_d)
 edge_e = Edge(node="E", cursor=cursor_e)
 
 
+class UncountedList(List[str]):
+    """A list that must not be counted."""
+
+    def __len__(self) -> int:  # pragma: no cover
+        raise RuntimeError("The list must not be counted.")
+
+
 def describe_connection_from_array():
     def warns_for_deprecated_import():
         from importlib import reload
@@ -353,6 +383,21 @@ def describe_connection_from_array():
                 )
                 assert no_letter_cursor is None
 
+            def returns_an_edges_cursor_using_an_object_index():
+                index = ObjectIndex(array_abcde)
+                assert cursor_for_object_in_connection(array_abcde, "B", index) == (
+                    cursor_b
+                )
+                assert cursor_for_object_in_connection(array_abcde, "F", index) is None
+
+            def rejects_an_object_index_for_other_data():
+                index = ObjectIndex(array_abcde[:])
+                with raises(ValueError) as exc_info:
+                    cursor_for_object_in_connection(array_abcde, "B", index)
+                assert str(exc_info.value) == (
+                    "The index must have been created for the given data."
+                )
+
     def describe_extended_functionality():
         """Test functionality that is not part of graphql-relay-js."""
 
@@ -769,3 +814,513 @@ def describe_connection_from_array_slice():
             assert page_info.endCursor == cursor_a
             assert page_info.hasPreviousPage is False
             assert page_info.hasNextPage is False
+
+
+def describe_get_connection_window():
+    def returns_the_full_window_without_arguments():
+        assert get_connection_window() == ConnectionWindow(0, None, False, False)
+        assert get_connection_window({}, 5) == ConnectionWindow(0, 5, False, False)
+
+    def looks_ahead_one_row_if_the_length_is_unknown():
+        assert get_connection_window(dict(first=2)) == ConnectionWindow(
+            0, 3, False, False
+        )
+        assert get_connection_window(dict(first=2, after=cursor_b)) == (
+            ConnectionWindow(2, 3, False, False)
+        )
+
+    def uses_exact_bounds_if_the_length_is_known():
+        assert get_connection_window(dict(first=2), 5) == ConnectionWindow(
+            0, 2, False, False
+        )
+        assert get_connection_window(dict(first=2, after=cursor_b), 5) == (
+            ConnectionWindow(2, 2, False, False)
+        )
+        assert get_connection_window(dict(last=2), 5) == ConnectionWindow(
+            3, 2, False, False
+        )
+
+    def uses_exact_bounds_if_before_is_given():
+        assert get_connection_window(dict(first=2, before=cursor_c)) == (
+            ConnectionWindow(0, 2, False, False)
+        )
+        assert get_connection_window(dict(last=2, before=cursor_d)) == (
+            ConnectionWindow(1, 2, False, False)
+        )
+
+    def needs_the_count_to_paginate_backwards_from_the_end():
+        assert get_connection_window(dict(last=2)) == ConnectionWindow(0, 2, True, True)
+        assert get_connection_window(dict(last=2, after=cursor_a)) == (
+            ConnectionWindow(1, 2, True, True)
+        )
+
+    def ignores_cursors_out_of_range_if_the_length_is_known():
+        assert get_connection_window(dict(first=2, after=cursor_e), 4) == (
+            ConnectionWindow(0, 2, False, False)
+        )
+        assert get_connection_window(dict(last=2, before=cursor_e), 4) == (
+            ConnectionWindow(2, 2, False, False)
+        )
+
+    def throws_an_error_if_first_or_last_is_negative():
+        with raises(ValueError) as exc_info:
+            get_connection_window(dict(first=-1))
+        assert str(exc_info.value) == (
+            "Argument 'first' must be a non-negative integer."
+        )
+        with raises(ValueError) as exc_info:
+            get_connection_window(dict(last=-1))
+        assert str(exc_info.value) == (
+            "Argument 'last' must be a non-negative integer."
+        )
+
+    def fetches_only_the_rows_needed_for_the_connection():
+        cursors = [cursor_a, cursor_b, cursor_c, cursor_d, cursor_e]
+        args_list: List[dict] = [{}]
+        for size in range(4):
+            args_list.extend([dict(first=size), dict(last=size)])
+        args_list.append(dict(first=3, last=2))
+        for args in args_list[:]:
+            for cursor in cursors:
+                args_list.append(dict(args, after=cursor))
+                args_list.append(dict(args, before=cursor))
+        for args in args_list:
+            expected = connection_from_array(array_abcde, args)
+            for array_length in (None, 5):
+                window = get_connection_window(args, array_length)
+                assert window.needs_count is (window.reverse and array_length is None)
+                offset, limit = window.offset, window.limit
+                if window.reverse:
+                    array_length = 5
+                    rows = array_abcde[offset:][-limit:] if limit else []
+                    offset = array_length - len(rows)
+                else:
+                    rows = array_abcde[offset:][:limit]
+                if array_length is not None:
+                    assert len(rows) == len(expected.edges)
+                elif "last" not in args:
+                    assert len(rows) <= len(expected.edges) + 1
+                c = connection_from_array_slice(
+                    rows, args, slice_start=offset, array_length=array_length
+                )
+                assert c == expected
+
+
+def describe_lazy_cursors():
+    def creates_offset_edges():
+        c = connection_from_array(array_abcde, dict(first=2), lazy_cursors=True)
+        assert c == Connection(
+            edges=[OffsetEdge("A", 0), OffsetEdge("B", 1)],
+            pageInfo=PageInfo(
+                startCursor=cursor_a,
+                endCursor=cursor_b,
+                hasPreviousPage=False,
+                hasNextPage=True,
+            ),
+        )
+        assert [edge.cursor for edge in c.edges] == [cursor_a, cursor_b]
+
+    def creates_offset_edges_for_slices():
+        c = connection_from_array_slice(
+            array_abcde[2:], dict(first=2, after=cursor_b), 2, 5, lazy_cursors=True
+        )
+        assert c.edges == [OffsetEdge("C", 2), OffsetEdge("D", 3)]
+        assert [edge.cursor for edge in c.edges] == [cursor_c, cursor_d]
+
+    def encodes_only_the_requested_cursors(monkeypatch):
+        from graphql_relay.connection import array_connection
+
+        encoded_offsets = []
+
+        def offset_to_cursor_spy(offset):
+            encoded_offsets.append(offset)
+            return offset_to_cursor(offset)
+
+        monkeypatch.setattr(array_connection, "offset_to_cursor", offset_to_cursor_spy)
+        c = connection_from_array(array_abcde, {}, lazy_cursors=True)
+        assert encoded_offsets == [0, 4]
+        assert [edge.node for edge in c.edges] == array_abcde
+        assert encoded_offsets == [0, 4]
+        assert c.edges[2].cursor == cursor_c
+        assert encoded_offsets == [0, 4, 2]
+
+    def offset_edges_can_be_compared_and_printed():
+        edge = OffsetEdge("A", 0)
+        assert edge == OffsetEdge("A", 0)
+        assert edge != OffsetEdge("A", 1)
+        assert edge != OffsetEdge("B", 0)
+        assert edge != edge_a
+        assert repr(edge) == "OffsetEdge(node='A', offset=0)"
+
+    def resolves_cursors_of_offset_edges():
+        letter_connection = connection_definitions(GraphQLString, "Letter")[1]
+        query_type = GraphQLObjectType(
+            "Query",
+            lambda: {
+                "letters": GraphQLField(
+                    letter_connection,
+                    args=connection_args,
+                    resolve=lambda _obj, _info, **args: connection_from_array(
+                        array_abcde, args, lazy_cursors=True
+                    ),
+                )
+            },
+        )
+        schema = GraphQLSchema(query_type)
+        source = "{ letters(first: 2) { edges { node cursor } } }"
+        assert graphql_sync(schema, source) == (
+            {
+                "letters": {
+                    "edges": [
+                        {"node": "A", "cursor": cursor_a},
+                        {"node": "B", "cursor": cursor_b},
+                    ]
+                }
+            },
+            None,
+        )
+
+
+def describe_lazy_edges():
+    def creates_a_slice_connection():
+        c = connection_from_array(
+            array_abcde, dict(first=2, after=cursor_a), lazy_edges=True
+        )
+        assert isinstance(c, SliceConnection)
+        assert c.nodes == ["B", "C"]
+        assert c.start_offset == 1
+        assert c.pageInfo == PageInfo(
+            startCursor=cursor_b,
+            endCursor=cursor_c,
+            hasPreviousPage=False,
+            hasNextPage=True,
+        )
+        edges = c.edges
+        assert isinstance(edges, OffsetEdges)
+        assert list(edges) == [OffsetEdge("B", 1), OffsetEdge("C", 2)]
+        assert [edge.cursor for edge in edges] == [cursor_b, cursor_c]
+        assert repr(c) == (
+            "SliceConnection(nodes=['B', 'C'], start_offset=1,"
+            f" pageInfo={c.pageInfo!r})"
+        )
+
+    def creates_an_empty_slice_connection():
+        c = connection_from_array(array_abcde, dict(first=0), lazy_edges=True)
+        assert isinstance(c, SliceConnection)
+        assert c.nodes == []
+        assert list(c.edges) == []
+        assert c.pageInfo == PageInfo(
+            startCursor=None,
+            endCursor=None,
+            hasPreviousPage=False,
+            hasNextPage=True,
+        )
+
+    def matches_connection_from_array():
+        cursors = [cursor_a, cursor_b, cursor_c, cursor_d, cursor_e]
+        args_list: List[dict] = [{}]
+        for size in range(4):
+            args_list.extend([dict(first=size), dict(last=size)])
+        for args in args_list[:]:
+            for cursor in cursors:
+                args_list.append(dict(args, after=cursor))
+                args_list.append(dict(args, before=cursor))
+        for args in args_list:
+            c = connection_from_array(array_abcde, args, lazy_edges=True)
+            expected = connection_from_array(array_abcde, args)
+            assert c.pageInfo == expected.pageInfo
+            assert [(edge.node, edge.cursor) for edge in c.edges] == [
+                (edge.node, edge.cursor) for edge in expected.edges
+            ]
+
+    def offset_edges_behave_like_a_sequence():
+        edges = OffsetEdges(array_abcde[1:4], 1)
+        assert len(edges) == 3
+        assert edges[0] == OffsetEdge("B", 1)
+        assert edges[-1] == OffsetEdge("D", 3)
+        with raises(IndexError):
+            edges[3]
+        with raises(IndexError):
+            edges[-4]
+        sliced_edges = edges[1:]
+        assert isinstance(sliced_edges, OffsetEdges)
+        assert list(sliced_edges) == [OffsetEdge("C", 2), OffsetEdge("D", 3)]
+        with raises(ValueError):
+            edges[::2]
+        assert OffsetEdge("C", 2) in edges
+        assert edges.index(OffsetEdge("C", 2)) == 1
+        assert list(reversed(edges))[0] == OffsetEdge("D", 3)
+        assert repr(edges) == "OffsetEdges(nodes=['B', 'C', 'D'], start_offset=1)"
+
+    def resolves_slice_connections():
+        letter_connection = connection_definitions(GraphQLString, "Letter")[1]
+        query_type = GraphQLObjectType(
+            "Query",
+            lambda: {
+                "letters": GraphQLField(
+                    letter_connection,
+                    args=connection_args,
+                    resolve=lambda _obj, _info, **args: connection_from_array(
+                        array_abcde, args, lazy_edges=True
+                    ),
+                )
+            },
+        )
+        schema = GraphQLSchema(query_type)
+        source = """
+            {
+              letters(last: 2) {
+                edges { node cursor }
+                pageInfo { hasPreviousPage endCursor }
+              }
+            }
+            """
+        assert graphql_sync(schema, source) == (
+            {
+                "letters": {
+                    "edges": [
+                        {"node": "D", "cursor": cursor_d},
+                        {"node": "E", "cursor": cursor_e},
+                    ],
+                    "pageInfo": {"hasPreviousPage": True, "endCursor": cursor_e},
+                }
+            },
+            None,
+        )
+
+
+def describe_total_count():
+    def attaches_total_count_without_counting():
+        counts: List[int] = []
+
+        def count() -> int:
+            counts.append(5)
+            return 5
+
+        c = connection_from_array_slice(
+            array_abcde, dict(first=2), array_length=5, total_count=count
+        )
+        assert isinstance(c, Connection)
+        assert c.edges == [edge_a, edge_b]
+        total_count = c.totalCount
+        assert isinstance(total_count, TotalCount)
+        assert counts == []
+        assert total_count() == 5
+        assert total_count() == 5
+        assert counts == [5]
+
+    def uses_total_count_as_length_of_array():
+        counts: List[int] = []
+
+        def count() -> int:
+            counts.append(5)
+            return 5
+
+        data = UncountedList(array_abcde)
+        c = connection_from_array(data, dict(first=2), total_count=count)
+        assert isinstance(c, Connection)
+        assert c.edges == [edge_a, edge_b]
+        assert c.pageInfo.hasNextPage is True
+        total_count = c.totalCount
+        assert isinstance(total_count, TotalCount)
+        assert counts == [5]
+        assert total_count() == 5
+        assert counts == [5]
+
+    def does_not_attach_total_count_by_default():
+        c = connection_from_array(array_abcde, dict(first=2))
+        assert isinstance(c, Connection)
+        assert c.totalCount is None
+        c = connection_from_array(array_abcde, dict(first=2), lazy_edges=True)
+        assert isinstance(c, SliceConnection)
+        assert c.totalCount is None
+
+    def uses_a_given_total_count_object_as_length_of_array():
+        total_count = TotalCount(lambda: 5)
+        data = UncountedList(array_abcde)
+        c = connection_from_array(data, dict(last=2), total_count=total_count)
+        assert isinstance(c, Connection)
+        assert c.edges == [edge_d, edge_e]
+        assert c.totalCount is total_count
+        assert total_count.counted
+
+    def shares_total_count_with_array_length():
+        counts: List[int] = []
+
+        def count() -> int:
+            counts.append(5)
+            return 5
+
+        c = connection_from_array_slice(
+            array_abcde[1:3],
+            dict(first=2, after=cursor_a),
+            slice_start=1,
+            total_count=count,
+        )
+        assert isinstance(c, Connection)
+        total_count = c.totalCount
+        assert isinstance(total_count, TotalCount)
+        assert c == Connection(
+            edges=[edge_b, edge_c],
+            pageInfo=PageInfo(
+                startCursor=cursor_b,
+                endCursor=cursor_c,
+                hasPreviousPage=False,
+                hasNextPage=True,
+            ),
+            totalCount=total_count,
+        )
+        assert counts == [5]
+        assert total_count() == 5
+        assert counts == [5]
+
+    def attaches_total_count_to_slice_connections():
+        c = connection_from_array(
+            array_abcde, dict(last=2), lazy_edges=True, total_count=lambda: 5
+        )
+        assert isinstance(c, SliceConnection)
+        assert c.totalCount is not None
+        assert c.totalCount() == 5
+        assert repr(c) == (
+            "SliceConnection(nodes=['D', 'E'], start_offset=3,"
+            " pageInfo=PageInfo(startCursor='YXJyYXljb25uZWN0aW9uOjM=',"
+            " endCursor='YXJyYXljb25uZWN0aW9uOjQ=',"
+            " hasPreviousPage=True, hasNextPage=False), totalCount=TotalCount(5))"
+        )
+
+
+def describe_offsets_to_cursors():
+    def returns_the_same_cursors_as_offset_to_cursor():
+        for start, count in [
+            (0, 5),
+            (-3, 6),
+            (95, 10),
+            (995, 10),
+            (9990, 20),
+            (99995, 10),
+            (123456789, 1001),
+        ]:
+            assert offsets_to_cursors(start, count) == [
+                offset_to_cursor(offset) for offset in range(start, start + count)
+            ]
+
+    def returns_the_same_cursors_without_precomputed_cursors():
+        table_size = cursor_cache.table_size
+        cursor_cache.configure(table_size=0)
+        try:
+            assert offsets_to_cursors(0, 2000) == [
+                offset_to_cursor(offset) for offset in range(2000)
+            ]
+        finally:
+            cursor_cache.configure(table_size=table_size)
+
+    def returns_no_cursors_for_empty_ranges():
+        assert offsets_to_cursors(5, 0) == []
+        assert offsets_to_cursors(5, -1) == []
+
+    def returns_a_new_list():
+        cursors = offsets_to_cursors(0, 2)
+        assert cursors == [cursor_a, cursor_b]
+        cursors.clear()
+        assert offsets_to_cursors(0, 2) == [cursor_a, cursor_b]
+
+
+def describe_cursor_to_offset():
+    def decodes_valid_cursors():
+        assert cursor_to_offset(cursor_a) == 0
+        assert cursor_to_offset(cursor_e) == 4
+        assert cursor_to_offset(cursor_e.encode()) == 4  # type: ignore
+        assert cursor_to_offset(offset_to_cursor(10**18)) == 10**18
+
+    def rejects_invalid_cursors():
+        assert cursor_to_offset("") is None
+        assert cursor_to_offset("invalid") is None
+        assert cursor_to_offset(b"invalid") is None  # type: ignore
+        assert cursor_to_offset(base64("arrayconnection:x")) is None
+        assert cursor_to_offset(base64("otherconnection:1")) is None
+
+    def rejects_overly_long_cursors_without_decoding(monkeypatch):
+        from graphql_relay.connection import array_connection
+
+        long_cursor = offset_to_cursor(10**50)
+        assert len(long_cursor) > array_connection.MAX_CURSOR_LENGTH
+        assert cursor_to_offset(long_cursor, max_length=100) == 10**50
+
+        # the cursor cache is not available, so cursors cannot be decoded
+        monkeypatch.setattr(array_connection, "cursor_cache", None)
+        assert cursor_to_offset(long_cursor) is None
+        assert cursor_to_offset(long_cursor + "=" * 10**6) is None
+        assert cursor_to_offset(base64("other" + "x" * 20)) is None
+        assert cursor_to_offset(cursor_a, max_length=len(cursor_a) - 1) is None
+        monkeypatch.setattr(array_connection, "MAX_CURSOR_LENGTH", 8)
+        assert cursor_to_offset(cursor_a) is None
+
+
+@fixture
+def compact_cursors():
+    use_compact_cursors()
+    yield
+    use_compact_cursors(False)
+
+
+def describe_compact_cursors():
+    def creates_compact_cursors():
+        assert offset_to_compact_cursor(0) == "cAA"
+        assert offset_to_compact_cursor(1) == "cAg"
+        assert offset_to_compact_cursor(-1) == "cAQ"
+        assert offset_to_compact_cursor(63) == "cfg"
+        assert offset_to_compact_cursor(64) == "cgAE"
+        assert (
+            len(offset_to_compact_cursor(10**18))
+            < len(offset_to_cursor(10**18)) // 2
+        )
+
+    def decodes_compact_and_legacy_cursors():
+        for offset in [0, 1, 2, 63, 64, 127, 128, 1000, 10**9, 10**18, -1, -100]:
+            assert cursor_to_offset(offset_to_compact_cursor(offset)) == offset
+            assert cursor_to_offset(offset_to_cursor(offset)) == offset
+
+    def rejects_malformed_compact_cursors():
+        assert cursor_to_offset("c") is None
+        assert cursor_to_offset("cA") is None
+        assert cursor_to_offset("cAA=") is None
+        assert cursor_to_offset("cAA!") is None
+        assert cursor_to_offset("c+A") is None
+        assert cursor_to_offset("cgAA") is None  # not canonical
+        assert cursor_to_offset("cgA") is None  # incomplete
+
+    def can_be_switched_on_and_off():
+        assert offset_to_cursor(2) == cursor_c
+        use_compact_cursors()
+        try:
+            assert offset_to_cursor(2) == offset_to_compact_cursor(2)
+            assert offset_to_cursor(2000) == offset_to_compact_cursor(2000)
+        finally:
+            use_compact_cursors(False)
+        assert offset_to_cursor(2) == cursor_c
+
+    @mark.usefixtures("compact_cursors")
+    def are_used_by_connection_helpers():
+        compact_a, compact_b, compact_c = map(offset_to_compact_cursor, range(3))
+        c = connection_from_array(array_abcde, dict(first=2, after=cursor_a))
+        assert c == Connection(
+            edges=[
+                Edge(node="B", cursor=compact_b),
+                Edge(node="C", cursor=compact_c),
+            ],
+            pageInfo=PageInfo(
+                startCursor=compact_b,
+                endCursor=compact_c,
+                hasPreviousPage=False,
+                hasNextPage=True,
+            ),
+        )
+        c = connection_from_array(array_abcde, dict(last=2, before=compact_c))
+        assert [edge.node for edge in c.edges] == ["A", "B"]
+        assert c.pageInfo.startCursor == compact_a
+        assert offsets_to_cursors(999, 3) == [
+            offset_to_compact_cursor(offset) for offset in range(999, 1002)
+        ]
+        c = connection_from_array(array_abcde, dict(first=1), lazy_edges=True)
+        assert [edge.cursor for edge in c.edges] == [compact_a]
+        assert c.pageInfo.endCursor == compact_a
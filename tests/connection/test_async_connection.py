@@ -0,0 +1,262 @@
+from asyncio import sleep
+from typing import AsyncIterator, List, Optional
+
+from pytest import mark, raises
+
+from graphql_relay import (
+    connection_from_array,
+    connection_from_async_iterator,
+    connection_from_async_slice,
+    offset_to_cursor,
+    Connection,
+    Edge,
+    PageInfo,
+)
+
+array_abcde = ["A", "B", "C", "D", "E"]
+
+cursor_a, cursor_b, cursor_c, cursor_d, cursor_e = map(offset_to_cursor, range(5))
+
+edge_a = Edge(node="A", cursor=cursor_a)
+edge_b = Edge(node="B", cursor=cursor_b)
+edge_c = Edge(node="C", cursor=cursor_c)
+edge_d = Edge(node="D", cursor=cursor_d)
+edge_e = Edge(node="E", cursor=cursor_e)
+
+
+class AsyncLetters:
+    """An asynchronous data source that records the requests sent to it."""
+
+    def __init__(self, letters: List[str]):
+        self.letters = letters
+        self.requests: List[str] = []
+
+    async def length(self) -> int:
+        self.requests.append("length")
+        await sleep(0)
+        self.requests.append("length done")
+        return len(self.letters)
+
+    async def slice(self, start: int, stop: Optional[int]) -> List[str]:
+        self.requests.append(f"slice {start}:{stop}")
+        await sleep(0)
+        self.requests.append("slice done")
+        return self.letters[start:stop]
+
+
+def describe_connection_from_async_slice():
+    @mark.asyncio
+    async def returns_all_elements_without_filters():
+        data = AsyncLetters(array_abcde)
+        c = await connection_from_async_slice(data, {})
+        assert c == Connection(
+            edges=[edge_a, edge_b, edge_c, edge_d, edge_e],
+            pageInfo=PageInfo(
+                startCursor=cursor_a,
+                endCursor=cursor_e,
+                hasPreviousPage=False,
+                hasNextPage=False,
+            ),
+        )
+
+    @mark.asyncio
+    async def ignores_invalid_cursors_like_connection_from_array():
+        for args in [
+            dict(first=2, before="invalid"),
+            dict(first=2, after="invalid"),
+            dict(last=2, after="invalid"),
+            dict(last=2, before="invalid"),
+            dict(first=2, after=offset_to_cursor(5), before="invalid"),
+            dict(last=2, after=offset_to_cursor(6), before="invalid"),
+        ]:
+            c = await connection_from_async_slice(AsyncLetters(array_abcde), args)
+            assert c == connection_from_array(array_abcde, args)
+        c = await connection_from_async_slice(
+            AsyncLetters(array_abcde),
+            dict(first=2, after=offset_to_cursor(5), before="invalid"),
+        )
+        assert c == Connection(
+            edges=[edge_a, edge_b],
+            pageInfo=PageInfo(
+                startCursor=cursor_a,
+                endCursor=cursor_b,
+                hasPreviousPage=False,
+                hasNextPage=True,
+            ),
+        )
+
+    @mark.asyncio
+    async def fetches_length_and_slice_concurrently():
+        data = AsyncLetters(array_abcde)
+        c = await connection_from_async_slice(data, dict(first=2, after=cursor_a))
+        assert c == Connection(
+            edges=[edge_b, edge_c],
+            pageInfo=PageInfo(
+                startCursor=cursor_b,
+                endCursor=cursor_c,
+                hasPreviousPage=False,
+                hasNextPage=True,
+            ),
+        )
+        assert data.requests == ["length", "slice 1:4", "length done", "slice done"]
+
+    @mark.asyncio
+    async def fetches_the_length_first_when_paginating_from_the_end():
+        data = AsyncLetters(array_abcde)
+        c = await connection_from_async_slice(data, dict(last=2))
+        assert c == Connection(
+            edges=[edge_d, edge_e],
+            pageInfo=PageInfo(
+                startCursor=cursor_d,
+                endCursor=cursor_e,
+                hasPreviousPage=True,
+                hasNextPage=False,
+            ),
+        )
+        assert data.requests == ["length", "length done", "slice 3:5", "slice done"]
+
+    @mark.asyncio
+    async def fetches_the_slice_again_for_cursors_out_of_range():
+        data = AsyncLetters(array_abcde)
+        c = await connection_from_async_slice(
+            data, dict(first=2, after=offset_to_cursor(10))
+        )
+        assert c.edges == [edge_a, edge_b]
+        assert data.requests == [
+            "length",
+            "slice 11:14",
+            "length done",
+            "slice done",
+            "slice 0:2",
+            "slice done",
+        ]
+
+    @mark.asyncio
+    async def matches_connection_from_array():
+        cursors = [cursor_a, cursor_b, cursor_c, cursor_d, cursor_e]
+        cursors.append(offset_to_cursor(10))
+        args_list: List[dict] = [{}]
+        for size in range(4):
+            args_list.extend([dict(first=size), dict(last=size)])
+        args_list.append(dict(first=3, last=2))
+        for args in args_list[:]:
+            for cursor in cursors:
+                args_list.append(dict(args, after=cursor))
+                args_list.append(dict(args, before=cursor))
+        for args in args_list:
+            assert await connection_from_async_slice(
+                AsyncLetters(array_abcde), args
+            ) == connection_from_array(array_abcde, args)
+
+
+class AsyncLetterStream:
+    """An asynchronous iterable that counts the consumed items."""
+
+    def __init__(self, letters: List[str]):
+        self.letters = letters
+        self.consumed = 0
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        try:
+            for letter in self.letters:
+                self.consumed += 1
+                await sleep(0)
+                yield letter
+        finally:
+            self.closed = True
+
+
+def describe_connection_from_async_iterator():
+    @mark.asyncio
+    async def returns_all_elements_without_filters():
+        stream = AsyncLetterStream(array_abcde)
+        c = await connection_from_async_iterator(stream, {})
+        assert c == Connection(
+            edges=[edge_a, edge_b, edge_c, edge_d, edge_e],
+            pageInfo=PageInfo(
+                startCursor=cursor_a,
+                endCursor=cursor_e,
+                hasPreviousPage=False,
+                hasNextPage=False,
+            ),
+        )
+        assert stream.consumed == 5
+        assert stream.closed
+
+    @mark.asyncio
+    async def closes_the_iterator_when_the_page_is_filled():
+        stream = AsyncLetterStream(array_abcde)
+        c = await connection_from_async_iterator(stream, dict(first=2, after=cursor_a))
+        assert c == Connection(
+            edges=[edge_b, edge_c],
+            pageInfo=PageInfo(
+                startCursor=cursor_b,
+                endCursor=cursor_c,
+                hasPreviousPage=False,
+                hasNextPage=True,
+            ),
+        )
+        assert stream.consumed == 4
+        assert stream.closed
+
+    @mark.asyncio
+    async def does_not_consume_anything_for_an_empty_window():
+        stream = AsyncLetterStream(array_abcde)
+        c = await connection_from_async_iterator(
+            stream, dict(first=2, after=cursor_c, before=cursor_b)
+        )
+        assert c.edges == []
+        assert stream.consumed == 0
+
+    @mark.asyncio
+    async def closes_the_iterator_on_errors():
+        class BrokenStream(AsyncLetterStream):
+            async def __aiter__(self) -> AsyncIterator[str]:
+                try:
+                    yield "A"
+                    raise RuntimeError("Broken stream")
+                finally:
+                    self.closed = True
+
+        stream = BrokenStream(array_abcde)
+        with raises(RuntimeError):
+            await connection_from_async_iterator(stream, dict(first=2))
+        assert stream.closed
+
+    @mark.asyncio
+    async def accepts_async_iterators_without_aclose():
+        class Letters:
+            def __init__(self) -> None:
+                self.letters = iter(array_abcde)
+
+            def __aiter__(self) -> "Letters":
+                return self
+
+            async def __anext__(self) -> str:
+                try:
+                    return next(self.letters)
+                except StopIteration:
+                    raise StopAsyncIteration
+
+        c = await connection_from_async_iterator(Letters(), dict(last=2))
+        assert c.edges == [edge_d, edge_e]
+        assert c.pageInfo.hasPreviousPage is True
+
+    @mark.asyncio
+    async def matches_connection_from_array():
+        cursors = [cursor_a, cursor_b, cursor_c, cursor_d, cursor_e, "invalid"]
+        args_list: List[dict] = [{}]
+        for size in range(4):
+            args_list.extend([dict(first=size), dict(last=size)])
+        args_list.extend([dict(first=3, last=2), dict(first=2, last=3)])
+        for args in args_list[:]:
+            for cursor in cursors:
+                args_list.append(dict(args, after=cursor))
+                args_list.append(dict(args, before=cursor))
+                for other_cursor in cursors:
+                    args_list.append(dict(args, after=cursor, before=other_cursor))
+        for args in args_list:
+            assert await connection_from_async_iterator(
+                AsyncLetterStream(array_abcde), args
+            ) == connection_from_array(array_abcde, args)
@@ -1,4 +1,4 @@
-from typing import List, NamedTuple
+from typing import Any, List, NamedTuple
 
 from graphql import (
     graphql_sync,
@@ -16,7 +16,11 @@ from graphql_relay import (
     connection_args,
     connection_definitions,
     connection_from_array,
+    connection_from_array_slice,
     forward_connection_args,
+    Connection,
+    PageInfo,
+    TotalCount,
 )
 
 from ..utils import dedent
@@ -272,3 +276,254 @@ def describe_connection_definition():
             }
             '''  # noqa: E501
         )
+
+
+letter_connection = connection_definitions(
+    GraphQLString, "Letter", include_nodes=True
+).connection_type
+
+letters = ["A", "B", "C", "D", "E"]
+
+
+def get_letter_schema(resolve: Any) -> GraphQLSchema:
+    return GraphQLSchema(
+        GraphQLObjectType(
+            "Query",
+            lambda: {
+                "letters": GraphQLField(
+                    letter_connection, args=connection_args, resolve=resolve
+                )
+            },
+        )
+    )
+
+
+def describe_connection_definition_with_nodes():
+    def includes_nodes_field():
+        source = "{ letters(first: 2) { nodes edges { node } } }"
+        schema = get_letter_schema(
+            lambda _obj, _info, **args: connection_from_array(letters, args)
+        )
+        assert graphql_sync(schema, source) == (
+            {
+                "letters": {
+                    "nodes": ["A", "B"],
+                    "edges": [{"node": "A"}, {"node": "B"}],
+                }
+            },
+            None,
+        )
+
+    def resolves_nodes_without_creating_edges():
+        class NodesConnection:
+            nodes = ["C", "D"]
+            pageInfo = PageInfo(None, None, False, False)
+
+            @property
+            def edges(self):  # pragma: no cover
+                raise RuntimeError("Edges should not be created.")
+
+        source = "{ letters { nodes } }"
+        schema = get_letter_schema(lambda _obj, _info: NodesConnection())
+        assert graphql_sync(schema, source) == (
+            {"letters": {"nodes": ["C", "D"]}},
+            None,
+        )
+
+    def resolves_nodes_of_slice_connections():
+        source = "{ letters(last: 2) { nodes pageInfo { hasPreviousPage } } }"
+        schema = get_letter_schema(
+            lambda _obj, _info, **args: connection_from_array(
+                letters, args, lazy_edges=True
+            )
+        )
+        assert graphql_sync(schema, source) == (
+            {"letters": {"nodes": ["D", "E"], "pageInfo": {"hasPreviousPage": True}}},
+            None,
+        )
+
+    def resolves_nodes_of_connections_given_as_dicts():
+        source = "{ letters { nodes } }"
+        schema = get_letter_schema(
+            lambda _obj, _info: {"edges": [{"node": "A"}, {"node": "B"}]}
+        )
+        assert graphql_sync(schema, source) == (
+            {"letters": {"nodes": ["A", "B"]}},
+            None,
+        )
+        schema = get_letter_schema(lambda _obj, _info: {"nodes": ["C"]})
+        assert graphql_sync(schema, source) == ({"letters": {"nodes": ["C"]}}, None)
+        schema = get_letter_schema(lambda _obj, _info: {"edges": None})
+        assert graphql_sync(schema, source) == ({"letters": {"nodes": None}}, None)
+
+    def resolves_missing_edges_as_null():
+        source = "{ letters { nodes } }"
+        schema = get_letter_schema(
+            lambda _obj, _info: Connection(
+                edges=None, pageInfo=PageInfo(None, None, False, False)  # type: ignore
+            )
+        )
+        assert graphql_sync(schema, source) == ({"letters": {"nodes": None}}, None)
+
+    def generates_correct_types():
+        schema = get_letter_schema(None)
+        assert print_schema(schema).endswith(
+            dedent(
+                '''
+                """A connection to a list of items."""
+                type LetterConnection {
+                  """Information to aid in pagination."""
+                  pageInfo: PageInfo!
+
+                  """A list of edges."""
+                  edges: [LetterEdge]
+
+                  """A list of nodes."""
+                  nodes: [String]
+                }
+
+                """Information about pagination in a connection."""
+                type PageInfo {
+                  """When paginating forwards, are there more items?"""
+                  hasNextPage: Boolean!
+
+                  """When paginating backwards, are there more items?"""
+                  hasPreviousPage: Boolean!
+
+                  """When paginating backwards, the cursor to continue."""
+                  startCursor: String
+
+                  """When paginating forwards, the cursor to continue."""
+                  endCursor: String
+                }
+
+                """An edge in a connection."""
+                type LetterEdge {
+                  """The item at the end of the edge"""
+                  node: String
+
+                  """A cursor for use in pagination"""
+                  cursor: String!
+                }
+                '''
+            )
+        )
+
+
+counted_letter_connection = connection_definitions(
+    GraphQLString, "CountedLetter", include_total_count=True
+).connection_type
+
+
+def get_counted_letter_schema(resolve: Any) -> GraphQLSchema:
+    return GraphQLSchema(
+        GraphQLObjectType(
+            "Query",
+            lambda: {
+                "letters": GraphQLField(
+                    counted_letter_connection, args=connection_args, resolve=resolve
+                )
+            },
+        )
+    )
+
+
+def describe_connection_definition_with_total_count():
+    def counts_only_when_total_count_is_queried():
+        counts: List[int] = []
+
+        def count() -> int:
+            counts.append(len(letters))
+            return len(letters)
+
+        schema = get_counted_letter_schema(
+            lambda _obj, _info, **args: connection_from_array_slice(
+                letters, args, array_length=5, total_count=count
+            )
+        )
+        source = "{ letters(first: 1) { edges { node } } }"
+        assert graphql_sync(schema, source) == (
+            {"letters": {"edges": [{"node": "A"}]}},
+            None,
+        )
+        assert counts == []
+        source = "{ letters(first: 1) { totalCount count: totalCount } }"
+        assert graphql_sync(schema, source) == (
+            {"letters": {"totalCount": 5, "count": 5}},
+            None,
+        )
+        assert counts == [5]
+
+    def resolves_total_count_of_connections_given_as_dicts():
+        source = "{ letters { totalCount } }"
+        schema = get_counted_letter_schema(lambda _obj, _info: {"totalCount": 3})
+        assert graphql_sync(schema, source) == ({"letters": {"totalCount": 3}}, None)
+        schema = get_counted_letter_schema(
+            lambda _obj, _info: {"totalCount": lambda: 4}
+        )
+        assert graphql_sync(schema, source) == ({"letters": {"totalCount": 4}}, None)
+
+    def resolves_missing_total_count_as_null():
+        source = "{ letters { totalCount } }"
+        schema = get_counted_letter_schema(
+            lambda _obj, _info, **args: connection_from_array(letters, args)
+        )
+        assert graphql_sync(schema, source) == (
+            {"letters": {"totalCount": None}},
+            None,
+        )
+
+    def generates_correct_types():
+        schema = get_counted_letter_schema(None)
+        assert print_schema(schema).startswith(
+            dedent(
+                '''
+                type Query {
+                  letters(
+                    """Returns the items in the list that come after the specified cursor."""
+                    after: String
+
+                    """Returns the first n items from the list."""
+                    first: Int
+
+                    """Returns the items in the list that come before the specified cursor."""
+                    before: String
+
+                    """Returns the last n items from the list."""
+                    last: Int
+                  ): CountedLetterConnection
+                }
+
+                """A connection to a list of items."""
+                type CountedLetterConnection {
+                  """Information to aid in pagination."""
+                  pageInfo: PageInfo!
+
+                  """A list of edges."""
+                  edges: [CountedLetterEdge]
+
+                  """The total number of items in the connection."""
+                  totalCount: Int
+                }
+                '''  # noqa: E501
+            )
+        )
+
+
+def describe_total_count():
+    def counts_at_most_once():
+        counts: List[int] = []
+
+        def count() -> int:
+            counts.append(42)
+            return 42
+
+        total_count = TotalCount(count)
+        assert not total_count.counted
+        assert repr(total_count) == "TotalCount(<not counted>)"
+        assert counts == []
+        assert total_count() == 42
+        assert int(total_count) == 42
+        assert total_count.counted
+        assert repr(total_count) == "TotalCount(42)"
+        assert counts == [42]
@@ -0,0 +1,180 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+from graphql_relay import connection_from_array, CountCache
+
+
+class Clock:
+    """A fake timer that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.time = 0.0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+class Letters:
+    """A sliceable with a length that counts how often it has been counted."""
+
+    def __init__(self, letters: str) -> None:
+        self.letters = list(letters)
+        self.counted = 0
+
+    def __getitem__(self, index: slice) -> List[str]:
+        return self.letters[index]
+
+    def __iter__(self) -> Any:  # pragma: no cover
+        return iter(self.letters)
+
+    def __len__(self) -> int:
+        self.counted += 1
+        return len(self.letters)
+
+
+def describe_count_cache():
+    def counts_only_once_per_ttl():
+        clock = Clock()
+        cache = CountCache(ttl=10, timer=clock)
+        letters = Letters("ABCDE")
+        assert cache.get_count(letters) == 5
+        assert cache.get_count(letters) == 5
+        assert letters.counted == 1
+        clock.time = 9.5
+        assert cache.get_count(letters) == 5
+        assert letters.counted == 1
+        letters.letters.append("F")
+        clock.time = 10
+        assert cache.get_count(letters) == 6
+        assert letters.counted == 2
+
+    def uses_a_given_count_function():
+        cache = CountCache()
+        letters = Letters("ABCDE")
+        assert cache.get_count(letters, lambda: 42) == 42
+        assert cache.get_count(letters, lambda: 0) == 42
+        assert letters.counted == 0
+
+    def is_keyed_by_source_identity():
+        cache = CountCache()
+        letters, other_letters = Letters("ABC"), Letters("ABC")
+        assert cache.get_count(letters) == 3
+        assert cache.get_count(other_letters) == 3
+        assert letters.counted == other_letters.counted == 1
+        assert len(cache) == 2
+
+    def does_not_mix_up_sources_with_reused_ids():
+        cache = CountCache()
+        assert cache.get_count(Letters("ABC")) == 3
+        # the id of the garbage collected object will likely be reused
+        assert cache.get_count(Letters("ABCDE")) == 5
+        assert cache.get_count(Letters("A")) == 1
+        assert cache.get_count(Letters("AB")) == 2
+
+    def does_not_cache_sources_that_cannot_be_weakly_referenced():
+        cache = CountCache()
+        letters = ["A", "B", "C"]
+        assert cache.get_count(letters) == 3
+        assert len(cache) == 0
+        letters.append("D")
+        assert cache.get_count(letters) == 4
+        assert cache.get_count(letters, lambda: 42) == 42
+        assert len(cache) == 0
+
+    def holds_at_most_maxsize_counts():
+        cache = CountCache(maxsize=2)
+        sources = [Letters("A"), Letters("AB"), Letters("ABC")]
+        for source in sources:
+            cache.get_count(source)
+        assert len(cache) == 2
+        cache.get_count(sources[0])
+        assert [source.counted for source in sources] == [2, 1, 1]
+
+    def does_not_cache_counts_with_maxsize_zero():
+        cache = CountCache(maxsize=0)
+        letters = Letters("ABC")
+        assert cache.get_count(letters) == 3
+        assert cache.get_count(letters) == 3
+        assert letters.counted == 2
+        assert len(cache) == 0
+
+    def can_be_invalidated():
+        cache = CountCache()
+        letters, other_letters = Letters("ABC"), Letters("ABC")
+        cache.get_count(letters)
+        cache.get_count(other_letters)
+        cache.invalidate(letters)
+        assert len(cache) == 1
+        cache.get_count(letters)
+        assert letters.counted == 2
+        cache.invalidate()
+        assert len(cache) == 0
+
+    def serves_expired_counts_while_recounting_in_approximate_mode():
+        clock = Clock()
+        cache = CountCache(ttl=10, approximate=True, timer=clock)
+        letters = Letters("ABC")
+        assert cache.get_count(letters) == 3
+        clock.time = 10
+        letters.letters.append("D")
+        recounted: List[int] = []
+
+        def count() -> int:
+            recounted.append(cache.get_count(letters))
+            return len(letters)
+
+        assert cache.get_count(letters, count) == 4
+        assert recounted == [3]
+        assert cache.get_count(letters) == 4
+
+    def recounts_concurrently_in_exact_mode():
+        clock = Clock()
+        cache = CountCache(ttl=10, timer=clock)
+        letters = Letters("ABC")
+        assert cache.get_count(letters) == 3
+        clock.time = 10
+        letters.letters.append("D")
+        recounted: List[int] = []
+
+        def count() -> int:
+            recounted.append(cache.get_count(letters))
+            return len(letters)
+
+        assert cache.get_count(letters, count) == 4
+        assert recounted == [4]
+
+    def can_be_shared_by_threads():
+        cache = CountCache(maxsize=3)
+        sources = [Letters("ABC"[: n % 3 + 1]) for n in range(10)]
+
+        def get_counts() -> List[int]:
+            return [cache.get_count(source) for source in sources * 10]
+
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(lambda _n: get_counts(), range(8)))
+        assert results == [[n % 3 + 1 for n in range(10)] * 10] * 8
+        assert len(cache) == 3
+
+
+def describe_connection_from_array_with_count_cache():
+    def counts_the_data_only_once_when_paginating():
+        cache = CountCache()
+        letters = Letters("ABCDE")
+        after = None
+        pages: List[List[str]] = []
+        while True:
+            c = connection_from_array(
+                letters, dict(first=2, after=after), count_cache=cache
+            )
+            pages.append([edge.node for edge in c.edges])
+            if c.pageInfo.hasNextPage is False:
+                break
+            after = c.pageInfo.endCursor
+        assert pages == [["A", "B"], ["C", "D"], ["E"]]
+        assert letters.counted == 1
+
+    def counts_the_data_only_once_without_a_cache():
+        letters = Letters("ABCDE")
+        c = connection_from_array(letters, dict(last=2))
+        assert [edge.node for edge in c.edges] == ["D", "E"]
+        assert letters.counted == 1
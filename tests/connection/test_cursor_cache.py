@@ -0,0 +1,125 @@
+from threading import Thread
+from typing import List, Optional
+
+from pytest import raises
+
+from graphql_relay import (
+    cursor_cache,
+    cursor_to_offset,
+    offset_to_cursor,
+    CursorCache,
+)
+from graphql_relay.utils import base64, unbase64
+
+
+def encode(offset: int) -> str:
+    return base64(f"arrayconnection:{offset}")
+
+
+def decode(cursor: str) -> Optional[int]:
+    try:
+        return int(unbase64(cursor)[len("arrayconnection:") :])
+    except ValueError:
+        return None
+
+
+class CountingCodec:
+    """Encoding and decoding functions that count how often they are called."""
+
+    def __init__(self) -> None:
+        self.encoded: List[int] = []
+        self.decoded: List[str] = []
+
+    def encode(self, offset: int) -> str:
+        self.encoded.append(offset)
+        return encode(offset)
+
+    def decode(self, cursor: str) -> Optional[int]:
+        self.decoded.append(cursor)
+        return decode(cursor)
+
+
+def describe_cursor_cache():
+    def produces_identical_cursors():
+        cache = CursorCache(encode, decode, table_size=10, maxsize=10)
+        for offset in [0, 1, 9, 10, 11, 42, 1000, -1]:
+            cursor = encode(offset)
+            assert cache.offset_to_cursor(offset) == cursor
+            assert cache.offset_to_cursor(offset) == cursor
+            assert cache.cursor_to_offset(cursor) == offset
+            assert cache.cursor_to_offset(cursor) == offset
+
+    def precomputes_cursors_for_low_offsets():
+        codec = CountingCodec()
+        cache = CursorCache(codec.encode, codec.decode, table_size=3, maxsize=0)
+        assert cache.table_size == 3
+        assert codec.encoded == [0, 1, 2]
+        assert cache.offset_to_cursor(2) == encode(2)
+        assert cache.cursor_to_offset(encode(1)) == 1
+        assert codec.encoded == [0, 1, 2]
+        assert codec.decoded == []
+        assert cache.offset_to_cursor(3) == encode(3)
+        assert cache.offset_to_cursor(3) == encode(3)
+        assert codec.encoded == [0, 1, 2, 3, 3]
+
+    def memoizes_other_conversions():
+        codec = CountingCodec()
+        cache = CursorCache(codec.encode, codec.decode, table_size=0, maxsize=2)
+        assert cache.maxsize == 2
+        for offset in [5, 6, 5, 7, 5, 6]:
+            assert cache.offset_to_cursor(offset) == encode(offset)
+        assert codec.encoded == [5, 6, 7, 6]
+        for cursor in [encode(5), "invalid", encode(5), "invalid"]:
+            cache.cursor_to_offset(cursor)
+        assert codec.decoded == [encode(5), "invalid"]
+        cache.clear()
+        cache.offset_to_cursor(5)
+        assert codec.encoded == [5, 6, 7, 6, 5]
+
+    def does_not_confuse_equal_offsets_of_different_types():
+        cache = CursorCache(encode, decode, table_size=2)
+        assert cache.offset_to_cursor(1) == encode(1)
+        assert cache.offset_to_cursor(True) == encode(True)
+        assert cache.offset_to_cursor(2.0) == encode(2.0)  # type: ignore
+        assert cache.offset_to_cursor(2) == encode(2)
+
+    def can_be_reconfigured():
+        codec = CountingCodec()
+        cache = CursorCache(codec.encode, codec.decode, table_size=2, maxsize=5)
+        cache.configure(table_size=4)
+        assert cache.table_size == 4
+        assert cache.maxsize == 5
+        cache.configure(maxsize=1)
+        assert cache.table_size == 4
+        assert cache.maxsize == 1
+        assert cache.offset_to_cursor(3) == encode(3)
+        with raises(ValueError) as exc_info:
+            cache.configure(table_size=-1)
+        assert str(exc_info.value) == "The cache sizes must be non-negative integers."
+
+    def can_be_used_from_multiple_threads():
+        cache = CursorCache(encode, decode, table_size=10, maxsize=20)
+        errors: List[int] = []
+
+        def convert() -> None:
+            for offset in range(100):
+                cursor = cache.offset_to_cursor(offset)
+                if cursor != encode(offset) or cache.cursor_to_offset(cursor) != offset:
+                    errors.append(offset)  # pragma: no cover
+
+        threads = [Thread(target=convert) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        cache.configure(table_size=5, maxsize=10)
+        for thread in threads:
+            thread.join()
+        assert errors == []
+
+    def is_used_by_default_conversion_functions():
+        assert cursor_cache.table_size > 0
+        assert cursor_cache.maxsize > 0
+        assert offset_to_cursor(0) == "YXJyYXljb25uZWN0aW9uOjA="
+        assert offset_to_cursor(123456) == encode(123456)
+        assert cursor_to_offset("YXJyYXljb25uZWN0aW9uOjA=") == 0
+        assert cursor_to_offset(encode(123456)) == 123456
+        assert cursor_to_offset("invalid") is None
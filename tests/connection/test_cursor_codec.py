@@ -0,0 +1,283 @@
+from typing import Any, AsyncIterator, List, Optional
+
+from pytest import mark, raises
+
+from graphql_relay import (
+    connection_from_array,
+    connection_from_array_slice,
+    connection_from_async_iterator,
+    connection_from_async_slice,
+    connection_from_iterable,
+    connection_from_keyset,
+    cursor_for_object_in_connection,
+    cursor_codecs,
+    get_connection_window,
+    get_cursor_codec,
+    get_offset_with_default,
+    key_to_cursor,
+    offset_to_compact_cursor,
+    offset_to_cursor,
+    offsets_to_cursors,
+    register_cursor_codec,
+    BaseCursorCodec,
+    CompactCursorCodec,
+    Connection,
+    CursorCodec,
+    Edge,
+    EdgeType,
+    KeysetCursorCodec,
+    ObjectIndex,
+    OffsetCursorCodec,
+    PageInfo,
+)
+
+
+class PlainCursorCodec(BaseCursorCodec):
+    """A codec for plain offset cursors that records the batches."""
+
+    def __init__(self) -> None:
+        self.batches: List[List[int]] = []
+
+    def encode(self, value: int) -> str:
+        return f"#{value}"
+
+    def decode(self, cursor: str) -> Optional[int]:
+        return int(cursor[1:]) if cursor[:1] == "#" and cursor[1:].isdigit() else None
+
+    def encode_batch(self, values: Any) -> List[str]:
+        values = list(values)
+        self.batches.append(values)
+        return super().encode_batch(values)
+
+
+array_abcde = ["A", "B", "C", "D", "E"]
+
+
+def plain_connection(start: int, nodes: str, **page_info: Any) -> Connection:
+    edges: List[EdgeType] = [
+        Edge(node=node, cursor=f"#{start + i}") for i, node in enumerate(nodes)
+    ]
+    return Connection(
+        edges=edges,
+        pageInfo=PageInfo(
+            startCursor=edges[0].cursor if edges else None,
+            endCursor=edges[-1].cursor if edges else None,
+            hasPreviousPage=page_info.get("hasPreviousPage", False),
+            hasNextPage=page_info.get("hasNextPage", False),
+        ),
+    )
+
+
+class AsyncLetters:
+    async def length(self) -> int:
+        return len(array_abcde)
+
+    async def slice(self, start: int, stop: Optional[int]) -> List[str]:
+        return array_abcde[start:stop]
+
+
+async def async_letters() -> AsyncIterator[str]:
+    for letter in array_abcde:
+        yield letter
+
+
+def describe_cursor_codecs():
+    def provides_offset_codec():
+        codec = get_cursor_codec("offset")
+        assert isinstance(codec, OffsetCursorCodec)
+        assert codec.encode(3) == offset_to_cursor(3)
+        assert codec.decode(offset_to_cursor(3)) == 3
+        assert codec.decode("invalid") is None
+        assert codec.encode_batch(range(2, 5)) == offsets_to_cursors(2, 3)
+        assert codec.encode_batch([4, 1]) == [offset_to_cursor(4), offset_to_cursor(1)]
+        assert codec.decode_batch([offset_to_cursor(1), "invalid"]) == [1, None]
+
+    def provides_compact_codec():
+        codec = get_cursor_codec("compact")
+        assert isinstance(codec, CompactCursorCodec)
+        assert codec.encode(3) == offset_to_compact_cursor(3)
+        assert codec.encode_batch(range(2)) == ["cAA", "cAg"]
+        assert codec.decode_batch(["cAg", offset_to_cursor(1), "cA"]) == [1, 1, None]
+
+    def provides_keyset_codec_for_composite_keys():
+        codec = get_cursor_codec("keyset")
+        assert isinstance(codec, KeysetCursorCodec)
+        assert codec.encode(42) == key_to_cursor(42)
+        assert codec.decode(key_to_cursor(42)) == 42
+        cursors = codec.encode_batch([("Alice", 1), ("Bob", 2)])
+        assert cursors == [key_to_cursor(["Alice", 1]), key_to_cursor(["Bob", 2])]
+        assert codec.decode_batch(cursors + ["invalid"]) == [
+            ("Alice", 1),
+            ("Bob", 2),
+            None,
+        ]
+
+    def can_register_custom_codecs():
+        codec = PlainCursorCodec()
+        register_cursor_codec("plain", codec)
+        try:
+            assert get_cursor_codec("plain") is codec
+        finally:
+            del cursor_codecs["plain"]
+        with raises(ValueError) as exc_info:
+            get_cursor_codec("plain")
+        assert str(exc_info.value) == "Unknown cursor codec: 'plain'."
+        with raises(TypeError) as type_exc_info:
+            register_cursor_codec("", codec)
+        assert (
+            str(type_exc_info.value)
+            == "The name of a cursor codec must be a non-empty string."
+        )
+
+    def base_codec_must_be_subclassed():
+        with raises(TypeError):
+            # noinspection PyAbstractClass
+            BaseCursorCodec()  # type: ignore
+
+        class EncodingCodec(BaseCursorCodec):
+            def encode(self, value: Any) -> str:
+                return str(value)  # pragma: no cover
+
+        with raises(TypeError):
+            # noinspection PyAbstractClass
+            EncodingCodec()  # type: ignore
+        assert repr(PlainCursorCodec()) == "PlainCursorCodec()"
+
+    def satisfy_the_protocol():
+        codecs: List[CursorCodec] = list(cursor_codecs.values())
+        assert len(codecs) == 3
+
+
+def describe_connection_helpers_with_cursor_codec():
+    def connection_from_array_uses_codec():
+        codec = PlainCursorCodec()
+        c = connection_from_array(
+            array_abcde, dict(first=2, after="#1"), cursor_codec=codec
+        )
+        assert c == plain_connection(2, "CD", hasNextPage=True)
+        assert codec.batches == [[2, 3]]
+
+    def connection_from_array_ignores_cursors_of_other_codecs():
+        codec = PlainCursorCodec()
+        c = connection_from_array(
+            array_abcde, dict(first=1, after=offset_to_cursor(1)), cursor_codec=codec
+        )
+        assert c == plain_connection(0, "A", hasNextPage=True)
+
+    def connection_from_array_with_lazy_cursors_uses_codec():
+        codec = PlainCursorCodec()
+        c = connection_from_array(
+            array_abcde, dict(last=2), cursor_codec=codec, lazy_cursors=True
+        )
+        assert [edge.cursor for edge in c.edges] == ["#3", "#4"]
+        assert c.pageInfo == plain_connection(3, "DE", hasPreviousPage=True).pageInfo
+        assert codec.batches == []
+
+    def connection_from_array_with_lazy_edges_uses_codec():
+        codec = PlainCursorCodec()
+        c = connection_from_array(
+            array_abcde, dict(before="#2"), cursor_codec=codec, lazy_edges=True
+        )
+        assert [edge.cursor for edge in c.edges] == ["#0", "#1"]
+        assert [edge.cursor for edge in c.edges[1:]] == ["#1"]
+        assert c.edges[0].cursor == "#0"
+        assert c.pageInfo == plain_connection(0, "AB").pageInfo
+
+    def connection_from_array_slice_uses_codec():
+        codec = PlainCursorCodec()
+        c = connection_from_array_slice(
+            array_abcde[2:4],
+            dict(first=1, after="#2"),
+            slice_start=2,
+            array_length=5,
+            cursor_codec=codec,
+        )
+        assert c == plain_connection(3, "D", hasNextPage=True)
+
+    def get_connection_window_uses_codec():
+        codec = PlainCursorCodec()
+        window = get_connection_window(dict(first=2, after="#1"), cursor_codec=codec)
+        assert (window.offset, window.limit) == (2, 3)
+
+    def get_offset_with_default_uses_codec():
+        codec = PlainCursorCodec()
+        assert get_offset_with_default("#3", -1, codec) == 3
+        assert get_offset_with_default(offset_to_cursor(3), -1, codec) == -1
+        assert get_offset_with_default(None, -1, codec) == -1
+
+    def cursor_for_object_in_connection_uses_codec():
+        codec = PlainCursorCodec()
+        assert (
+            cursor_for_object_in_connection(array_abcde, "C", cursor_codec=codec)
+            == "#2"
+        )
+        index = ObjectIndex(array_abcde)
+        assert (
+            cursor_for_object_in_connection(array_abcde, "D", index, cursor_codec=codec)
+            == "#3"
+        )
+        assert (
+            cursor_for_object_in_connection(array_abcde, "F", cursor_codec=codec)
+            is None
+        )
+
+    def connection_from_iterable_uses_codec():
+        codec = PlainCursorCodec()
+        c = connection_from_iterable(
+            iter(array_abcde), dict(first=2, after="#0"), cursor_codec=codec
+        )
+        assert c == plain_connection(1, "BC", hasNextPage=True)
+        assert codec.batches == [[1, 2]]
+
+    @mark.asyncio
+    async def connection_from_async_slice_uses_codec():
+        codec = PlainCursorCodec()
+        c = await connection_from_async_slice(
+            AsyncLetters(), dict(last=2, before="#4"), cursor_codec=codec
+        )
+        assert c == plain_connection(2, "CD", hasPreviousPage=True)
+
+    @mark.asyncio
+    async def connection_from_async_iterator_uses_codec():
+        codec = PlainCursorCodec()
+        c = await connection_from_async_iterator(
+            async_letters(), dict(first=1, after="#3"), cursor_codec=codec
+        )
+        assert c == plain_connection(4, "E")
+
+    def connection_from_keyset_uses_codec():
+        class LetterSource:
+            def fetch(
+                self,
+                after: Optional[Any],
+                before: Optional[Any],
+                limit: Optional[int],
+                reverse: bool,
+            ) -> List[str]:
+                rows = [
+                    letter
+                    for letter in array_abcde
+                    if (after is None or letter > after)
+                    and (before is None or letter < before)
+                ]
+                return rows if limit is None else rows[:limit]
+
+        class LetterCodec(BaseCursorCodec):
+            def encode(self, value: str) -> str:
+                return value.lower()
+
+            def decode(self, cursor: str) -> Optional[str]:
+                return cursor.upper() if cursor.islower() else None
+
+        c = connection_from_keyset(
+            LetterSource(), dict(first=2, after="b"), cursor_codec=LetterCodec()
+        )
+        assert c == Connection(
+            edges=[Edge(node="C", cursor="c"), Edge(node="D", cursor="d")],
+            pageInfo=PageInfo(
+                startCursor="c",
+                endCursor="d",
+                hasPreviousPage=False,
+                hasNextPage=True,
+            ),
+        )
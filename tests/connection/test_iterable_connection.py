@@ -0,0 +1,200 @@
+from typing import Iterator, List
+from weakref import WeakSet
+
+from pytest import raises
+
+from graphql_relay import (
+    connection_from_array,
+    connection_from_iterable,
+    offset_to_cursor,
+    Connection,
+    Edge,
+    PageInfo,
+    TotalCount,
+)
+
+array_abcde = ["A", "B", "C", "D", "E"]
+
+cursor_a, cursor_b, cursor_c, cursor_d, cursor_e = map(offset_to_cursor, range(5))
+
+edge_a = Edge(node="A", cursor=cursor_a)
+edge_b = Edge(node="B", cursor=cursor_b)
+edge_c = Edge(node="C", cursor=cursor_c)
+edge_d = Edge(node="D", cursor=cursor_d)
+edge_e = Edge(node="E", cursor=cursor_e)
+
+
+class Letters:
+    """An iterable without a length that counts the consumed items."""
+
+    def __init__(self, letters: List[str]):
+        self.letters = letters
+        self.consumed = 0
+
+    def __iter__(self) -> Iterator[str]:
+        for letter in self.letters:
+            self.consumed += 1
+            yield letter
+
+
+def describe_connection_from_iterable():
+    def returns_all_elements_without_filters():
+        letters = Letters(array_abcde)
+        c = connection_from_iterable(letters, {})
+        assert c == Connection(
+            edges=[edge_a, edge_b, edge_c, edge_d, edge_e],
+            pageInfo=PageInfo(
+                startCursor=cursor_a,
+                endCursor=cursor_e,
+                hasPreviousPage=False,
+                hasNextPage=False,
+            ),
+        )
+        assert letters.consumed == 5
+
+    def accepts_a_generator():
+        c = connection_from_iterable(iter(array_abcde), dict(first=1))
+        assert c.edges == [edge_a]
+
+    def attaches_a_lazy_total_count():
+        letters = Letters(array_abcde)
+        c = connection_from_iterable(letters, dict(first=1), total_count=lambda: 5)
+        assert isinstance(c, Connection)
+        assert c.edges == [edge_a]
+        assert letters.consumed == 2
+        total_count = c.totalCount
+        assert isinstance(total_count, TotalCount)
+        assert not total_count.counted
+        assert total_count() == 5
+        assert total_count.counted
+
+    def consumes_only_one_more_item_than_needed():
+        letters = Letters(array_abcde)
+        c = connection_from_iterable(letters, dict(first=2))
+        assert c == Connection(
+            edges=[edge_a, edge_b],
+            pageInfo=PageInfo(
+                startCursor=cursor_a,
+                endCursor=cursor_b,
+                hasPreviousPage=False,
+                hasNextPage=True,
+            ),
+        )
+        assert letters.consumed == 3
+
+    def consumes_only_one_more_item_than_needed_after_a_cursor():
+        letters = Letters(array_abcde)
+        c = connection_from_iterable(letters, dict(first=2, after=cursor_a))
+        assert c == Connection(
+            edges=[edge_b, edge_c],
+            pageInfo=PageInfo(
+                startCursor=cursor_b,
+                endCursor=cursor_c,
+                hasPreviousPage=False,
+                hasNextPage=True,
+            ),
+        )
+        assert letters.consumed == 4
+
+    def does_not_look_ahead_if_before_is_given():
+        letters = Letters(array_abcde)
+        c = connection_from_iterable(letters, dict(first=2, before=cursor_e))
+        assert c.edges == [edge_a, edge_b]
+        assert c.pageInfo.hasNextPage is True
+        assert letters.consumed == 2
+
+    def stops_at_the_before_cursor():
+        letters = Letters(array_abcde)
+        c = connection_from_iterable(letters, dict(last=2, before=cursor_d))
+        assert c == Connection(
+            edges=[edge_b, edge_c],
+            pageInfo=PageInfo(
+                startCursor=cursor_b,
+                endCursor=cursor_c,
+                hasPreviousPage=True,
+                hasNextPage=False,
+            ),
+        )
+        assert letters.consumed == 3
+
+    def keeps_only_the_last_items_in_memory_when_paginating_backward():
+        class Item:
+            def __init__(self, number: int):
+                self.number = number
+
+        live_items: WeakSet = WeakSet()
+        max_live_items = 0
+
+        def items() -> Iterator[Item]:
+            nonlocal max_live_items
+            for number in range(1000):
+                item = Item(number)
+                live_items.add(item)
+                max_live_items = max(max_live_items, len(live_items))
+                yield item
+                del item
+
+        c = connection_from_iterable(items(), dict(last=3))
+        assert [edge.node.number for edge in c.edges] == [997, 998, 999]
+        assert [edge.cursor for edge in c.edges] == [
+            offset_to_cursor(offset) for offset in (997, 998, 999)
+        ]
+        assert c.pageInfo.hasPreviousPage is True
+        assert max_live_items <= 5
+
+    def counts_the_items_when_the_last_is_zero():
+        letters = Letters(array_abcde)
+        c = connection_from_iterable(letters, dict(last=0, after=cursor_a))
+        assert c == Connection(
+            edges=[],
+            pageInfo=PageInfo(
+                startCursor=None,
+                endCursor=None,
+                hasPreviousPage=True,
+                hasNextPage=False,
+            ),
+        )
+        assert letters.consumed == 5
+
+    def returns_an_empty_page_for_cursors_beyond_the_end():
+        c = connection_from_iterable(
+            Letters(array_abcde), dict(first=2, after=offset_to_cursor(10))
+        )
+        assert c == Connection(
+            edges=[],
+            pageInfo=PageInfo(
+                startCursor=None,
+                endCursor=None,
+                hasPreviousPage=False,
+                hasNextPage=False,
+            ),
+        )
+
+    def throws_an_error_if_first_or_last_is_negative():
+        with raises(ValueError) as exc_info:
+            connection_from_iterable(Letters(array_abcde), dict(first=-1))
+        assert str(exc_info.value) == (
+            "Argument 'first' must be a non-negative integer."
+        )
+        with raises(ValueError) as exc_info:
+            connection_from_iterable(Letters(array_abcde), dict(last=-1))
+        assert str(exc_info.value) == (
+            "Argument 'last' must be a non-negative integer."
+        )
+
+    def matches_connection_from_array():
+        cursors = [cursor_a, cursor_b, cursor_c, cursor_d, cursor_e, "invalid"]
+        args_list: List[dict] = [{}]
+        for size in range(4):
+            args_list.extend([dict(first=size), dict(last=size)])
+        args_list.extend([dict(first=3, last=2), dict(first=2, last=3)])
+        for args in args_list[:]:
+            for cursor in cursors:
+                args_list.append(dict(args, after=cursor))
+                args_list.append(dict(args, before=cursor))
+                for other_cursor in cursors:
+                    args_list.append(dict(args, after=cursor, before=other_cursor))
+        for args in args_list:
+            assert connection_from_iterable(
+                Letters(array_abcde), args
+            ) == connection_from_array(array_abcde, args)
@@ -0,0 +1,296 @@
+from typing import Any, List, NamedTuple, Optional
+
+from pytest import raises
+
+from graphql_relay import (
+    connection_from_array,
+    connection_from_keyset,
+    cursor_to_key,
+    key_to_cursor,
+    offset_to_cursor,
+    Connection,
+    Edge,
+    PageInfo,
+    TotalCount,
+)
+from graphql_relay.connection.keyset_connection import (
+    KEYSET_PREFIX,
+    MAX_KEYSET_CURSOR_LENGTH,
+)
+from graphql_relay.utils import base64
+
+
+class Letter(NamedTuple):
+    id: int
+    name: str
+
+
+letters = [Letter(id=i, name=name) for i, name in enumerate("ABCDE", 1)]
+
+
+class LetterSource:
+    """A keyset source that records the requests sent to it."""
+
+    def __init__(self, data: List[Letter]):
+        self.data = data
+        self.requests: List[Any] = []
+
+    def fetch(
+        self,
+        after: Optional[int],
+        before: Optional[int],
+        limit: Optional[int],
+        reverse: bool,
+    ) -> List[Letter]:
+        self.requests.append((after, before, limit, reverse))
+        rows = [
+            letter
+            for letter in self.data
+            if (after is None or letter.id > after)
+            and (before is None or letter.id < before)
+        ]
+        if reverse:
+            rows.reverse()
+        return rows if limit is None else rows[:limit]
+
+
+def get_id(letter: Letter) -> int:
+    return letter.id
+
+
+def edge(letter: Letter) -> Edge:
+    return Edge(node=letter, cursor=key_to_cursor(letter.id))
+
+
+letter_a, letter_b, letter_c, letter_d, letter_e = letters
+cursor_a, cursor_b, cursor_c, cursor_d, cursor_e = (
+    key_to_cursor(letter.id) for letter in letters
+)
+edge_a, edge_b, edge_c, edge_d, edge_e = (edge(letter) for letter in letters)
+
+
+def describe_keyset_cursors():
+    def encodes_and_decodes_scalar_keys():
+        assert key_to_cursor(1) == "a2V5c2V0OjE="
+        assert cursor_to_key("a2V5c2V0OjE=") == 1
+        assert cursor_to_key(key_to_cursor("abc")) == "abc"
+
+    def encodes_and_decodes_composite_keys():
+        cursor = key_to_cursor(("2022-04-01", 42))
+        assert cursor_to_key(cursor) == ("2022-04-01", 42)
+
+    def returns_none_for_invalid_cursors():
+        assert cursor_to_key("") is None
+        assert cursor_to_key("invalid") is None
+        assert cursor_to_key(offset_to_cursor(1)) is None
+        assert cursor_to_key(key_to_cursor(1)[:-4]) is None
+
+    def rejects_nested_keys():
+        assert cursor_to_key(key_to_cursor({"a": 1})) is None
+        assert cursor_to_key(key_to_cursor([1, [2]])) is None
+        assert cursor_to_key(key_to_cursor([1, {"a": 2}])) is None
+        assert cursor_to_key(key_to_cursor([1, None, "a", 2.5, True])) == (
+            1,
+            None,
+            "a",
+            2.5,
+            True,
+        )
+
+    def rejects_deeply_nested_keys_without_recursion_errors():
+        cursor = base64(KEYSET_PREFIX + "[" * 100_000)
+        assert cursor_to_key(cursor, max_length=len(cursor)) is None
+
+    def rejects_overly_long_cursors_without_decoding():
+        long_key = "x" * MAX_KEYSET_CURSOR_LENGTH
+        cursor = key_to_cursor(long_key)
+        assert cursor_to_key(cursor) is None
+        assert cursor_to_key(cursor, max_length=len(cursor)) == long_key
+        assert cursor_to_key(key_to_cursor(1), max_length=4) is None
+
+    def ignores_malicious_cursors_in_connections():
+        cursor = base64(KEYSET_PREFIX + "[" * 100_000)
+        source = LetterSource(letters)
+        c = connection_from_keyset(source, dict(first=1, after=cursor), get_id)
+        assert c.edges == [edge_a]
+        assert source.requests == [(None, None, 2, False)]
+
+
+def describe_connection_from_keyset():
+    def returns_all_elements_without_filters():
+        source = LetterSource(letters)
+        c = connection_from_keyset(source, {}, get_id)
+        assert c == Connection(
+            edges=[edge_a, edge_b, edge_c, edge_d, edge_e],
+            pageInfo=PageInfo(
+                startCursor=cursor_a,
+                endCursor=cursor_e,
+                hasPreviousPage=False,
+                hasNextPage=False,
+            ),
+        )
+        assert source.requests == [(None, None, None, False)]
+
+    def respects_a_smaller_first():
+        source = LetterSource(letters)
+        c = connection_from_keyset(source, dict(first=2), get_id)
+        assert c == Connection(
+            edges=[edge_a, edge_b],
+            pageInfo=PageInfo(
+                startCursor=cursor_a,
+                endCursor=cursor_b,
+                hasPreviousPage=False,
+                hasNextPage=True,
+            ),
+        )
+        assert source.requests == [(None, None, 3, False)]
+
+    def respects_an_overly_large_first():
+        c = connection_from_keyset(LetterSource(letters), dict(first=10), get_id)
+        assert c.edges == [edge_a, edge_b, edge_c, edge_d, edge_e]
+        assert c.pageInfo.hasNextPage is False
+
+    def respects_a_smaller_last():
+        source = LetterSource(letters)
+        c = connection_from_keyset(source, dict(last=2), get_id)
+        assert c == Connection(
+            edges=[edge_d, edge_e],
+            pageInfo=PageInfo(
+                startCursor=cursor_d,
+                endCursor=cursor_e,
+                hasPreviousPage=True,
+                hasNextPage=False,
+            ),
+        )
+        assert source.requests == [(None, None, 3, True)]
+
+    def respects_first_and_after():
+        source = LetterSource(letters)
+        c = connection_from_keyset(source, dict(first=2, after=cursor_b), get_id)
+        assert c == Connection(
+            edges=[edge_c, edge_d],
+            pageInfo=PageInfo(
+                startCursor=cursor_c,
+                endCursor=cursor_d,
+                hasPreviousPage=False,
+                hasNextPage=True,
+            ),
+        )
+        assert source.requests == [(2, None, 3, False)]
+
+    def respects_last_and_before():
+        source = LetterSource(letters)
+        c = connection_from_keyset(source, dict(last=2, before=cursor_d), get_id)
+        assert c == Connection(
+            edges=[edge_b, edge_c],
+            pageInfo=PageInfo(
+                startCursor=cursor_b,
+                endCursor=cursor_c,
+                hasPreviousPage=True,
+                hasNextPage=False,
+            ),
+        )
+        assert source.requests == [(None, 4, 3, True)]
+
+    def respects_first_and_after_and_before():
+        source = LetterSource(letters)
+        c = connection_from_keyset(
+            source, dict(first=2, after=cursor_a, before=cursor_e), get_id
+        )
+        assert c.edges == [edge_b, edge_c]
+        assert c.pageInfo.hasNextPage is True
+        assert source.requests == [(1, 5, 3, False)]
+
+    def respects_first_and_last():
+        c = connection_from_keyset(LetterSource(letters), dict(first=3, last=2), get_id)
+        assert c == Connection(
+            edges=[edge_b, edge_c],
+            pageInfo=PageInfo(
+                startCursor=cursor_b,
+                endCursor=cursor_c,
+                hasPreviousPage=True,
+                hasNextPage=True,
+            ),
+        )
+
+    def returns_no_elements_if_first_is_zero():
+        c = connection_from_keyset(LetterSource(letters), dict(first=0), get_id)
+        assert c == Connection(
+            edges=[],
+            pageInfo=PageInfo(
+                startCursor=None,
+                endCursor=None,
+                hasPreviousPage=False,
+                hasNextPage=True,
+            ),
+        )
+
+    def throws_an_error_if_first_or_last_is_negative():
+        with raises(ValueError) as exc_info:
+            connection_from_keyset(LetterSource(letters), dict(first=-1), get_id)
+        assert str(exc_info.value) == (
+            "Argument 'first' must be a non-negative integer."
+        )
+        with raises(ValueError) as exc_info:
+            connection_from_keyset(LetterSource(letters), dict(last=-1), get_id)
+        assert str(exc_info.value) == (
+            "Argument 'last' must be a non-negative integer."
+        )
+
+    def ignores_invalid_cursors():
+        source = LetterSource(letters)
+        c = connection_from_keyset(
+            source, dict(first=2, after="invalid", before=offset_to_cursor(3)), get_id
+        )
+        assert c.edges == [edge_a, edge_b]
+        assert source.requests == [(None, None, 3, False)]
+
+    def attaches_a_lazy_total_count():
+        counts: List[int] = []
+
+        def count() -> int:
+            counts.append(len(letters))
+            return len(letters)
+
+        c = connection_from_keyset(
+            LetterSource(letters), dict(first=2), get_id, total_count=count
+        )
+        assert isinstance(c, Connection)
+        assert c.edges == [edge_a, edge_b]
+        total_count = c.totalCount
+        assert isinstance(total_count, TotalCount)
+        assert counts == []
+        assert total_count() == 5
+        assert total_count() == 5
+        assert counts == [5]
+
+    def uses_the_node_itself_as_default_key():
+        c = connection_from_keyset(LetterSource(letters), dict(first=1))
+        assert cursor_to_key(c.edges[0].cursor) == (1, "A")
+
+    def matches_offset_pagination_on_static_data():
+        args_list: List[dict] = [{}]
+        for size in range(4):
+            args_list.extend([dict(first=size), dict(last=size)])
+        for args in args_list[:]:
+            for position in range(5):
+                args_list.append(dict(args, after=position))
+                args_list.append(dict(args, before=position))
+        for args in args_list:
+            keyset_args = {
+                name: key_to_cursor(letters[value].id)
+                if name in ("after", "before")
+                else value
+                for name, value in args.items()
+            }
+            offset_args = {
+                name: offset_to_cursor(value) if name in ("after", "before") else value
+                for name, value in args.items()
+            }
+            keyset = connection_from_keyset(LetterSource(letters), keyset_args, get_id)
+            offset = connection_from_array(letters, offset_args)
+            assert [edge.node for edge in keyset.edges] == [
+                edge.node for edge in offset.edges
+            ]
+            assert keyset.pageInfo.hasPreviousPage == offset.pageInfo.hasPreviousPage
+            assert keyset.pageInfo.hasNextPage == offset.pageInfo.hasNextPage
@@ -0,0 +1,102 @@
+from typing import Any, List, NamedTuple
+
+from graphql_relay import ObjectIndex
+
+
+class Letter(NamedTuple):
+    id: int
+    name: str
+
+
+class CountingList(list):
+    """A list that counts how often its items are accessed."""
+
+    accessed = 0
+
+    def __getitem__(self, index: Any) -> Any:
+        self.accessed += 1
+        return super().__getitem__(index)
+
+
+def describe_object_index():
+    def finds_offsets_of_objects():
+        index = ObjectIndex(["A", "B", "C", "B"])
+        assert index.offset_of("A") == 0
+        assert index.offset_of("B") == 1
+        assert index.offset_of("C") == 2
+        assert index.offset_of("D") is None
+
+    def finds_offsets_by_key():
+        letters = [Letter(1, "A"), Letter(2, "B")]
+        index = ObjectIndex(letters, key=lambda letter: letter.id)
+        assert index.key is not None
+        assert index.offset_of(Letter(2, "changed")) == 1
+        assert index.offset_of(Letter(3, "B")) is None
+
+    def builds_the_index_only_once():
+        letters = CountingList("ABCDE")
+        index = ObjectIndex(letters)
+        assert index.offset_of("E") == 4
+        accessed = letters.accessed
+        assert index.offset_of("D") == 3
+        assert index.offset_of("E") == 4
+        assert index.offset_of("F") is None
+        # only the found objects are checked
+        assert letters.accessed == accessed + 2
+
+    def indexes_appended_objects():
+        letters = CountingList("ABC")
+        index = ObjectIndex(letters)
+        assert index.offset_of("C") == 2
+        letters.append("D")
+        accessed = letters.accessed
+        assert index.offset_of("D") == 3
+        # only the new object is indexed and then checked
+        assert letters.accessed == accessed + 2
+        assert repr(index) == "<ObjectIndex of 4 objects>"
+
+    def rebuilds_the_index_after_changes():
+        letters = ["A", "B", "C"]
+        index = ObjectIndex(letters)
+        assert index.offset_of("B") == 1
+        letters.remove("A")
+        assert index.offset_of("B") == 0
+        letters.insert(0, "X")
+        assert index.offset_of("B") == 1
+        letters[1] = "Y"
+        assert index.offset_of("B") is None
+        assert index.offset_of("Y") == 1
+
+    def finds_inserted_objects():
+        letters = ["A", "B", "C"]
+        index = ObjectIndex(letters)
+        assert index.offset_of("B") == 1
+        letters.insert(0, "X")
+        assert index.offset_of("X") == 0
+        assert index.offset_of("C") == 3
+        letters.insert(2, "Y")
+        assert index.offset_of("Y") == 2
+        assert index.offset_of("Z") is None
+
+    def can_be_invalidated():
+        letters = ["A", "B", "C"]
+        index = ObjectIndex(letters)
+        assert index.offset_of("B") == 1
+        letters[1] = "X"
+        assert index.offset_of("X") is None
+        index.invalidate()
+        assert index.offset_of("X") == 1
+        assert index.offset_of("B") is None
+
+    def searches_unhashable_objects():
+        lists: List[Any] = [["A"], ["B"]]
+        index = ObjectIndex(lists)
+        assert index.offset_of(["B"]) == 1
+        assert index.offset_of(["C"]) is None
+
+    def searches_sequences_with_unhashable_objects():
+        items: List[Any] = [["A"], "B", "C"]
+        index = ObjectIndex(items)
+        assert index.offset_of("B") == 1
+        assert index.offset_of(["A"]) == 0
+        assert index.offset_of("D") is None
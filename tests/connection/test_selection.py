@@ -0,0 +1,187 @@
+from typing import Any, List
+
+from graphql import (
+    graphql_sync,
+    GraphQLField,
+    GraphQLInt,
+    GraphQLObjectType,
+    GraphQLSchema,
+    GraphQLString,
+)
+
+from graphql_relay import (
+    connection_args,
+    connection_definitions,
+    connection_from_array,
+    get_connection_selection,
+    ConnectionSelection,
+    OffsetEdge,
+    SliceConnection,
+)
+
+letter_connection = connection_definitions(
+    GraphQLString,
+    "Letter",
+    connection_fields={
+        "totalCount": GraphQLField(GraphQLInt),
+        "label": GraphQLField(GraphQLString),
+    },
+    include_nodes=True,
+).connection_type
+
+letters = ["A", "B", "C", "D", "E"]
+
+
+class Letters(List[str]):
+    """A list of letters that records whether it has been sliced."""
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.sliced = False
+
+    def __getitem__(self, index: Any) -> Any:
+        self.sliced = True
+        return super().__getitem__(index)
+
+
+def get_selection(source: str) -> ConnectionSelection:
+    selections: List[ConnectionSelection] = []
+
+    def resolve(_obj, info, **args):
+        selections.append(get_connection_selection(info))
+        return connection_from_array(letters, args)
+
+    schema = GraphQLSchema(
+        GraphQLObjectType(
+            "Query",
+            lambda: {
+                "letters": GraphQLField(
+                    letter_connection, args=connection_args, resolve=resolve
+                )
+            },
+        )
+    )
+    result = graphql_sync(schema, source)
+    assert result.errors is None
+    (selection,) = selections
+    return selection
+
+
+def describe_get_connection_selection():
+    def detects_page_info_only():
+        assert get_selection(
+            "{ letters(first: 2) { pageInfo { hasNextPage } } }"
+        ) == ConnectionSelection(edges=False, nodes=False, cursors=False)
+
+    def detects_nodes_only():
+        assert get_selection(
+            "{ letters { __typename nodes pageInfo { endCursor } } }"
+        ) == ConnectionSelection(edges=False, nodes=True, cursors=False)
+
+    def detects_edges_without_cursors():
+        assert get_selection(
+            "{ letters { edges { __typename node } } }"
+        ) == ConnectionSelection(edges=True, nodes=False, cursors=False)
+
+    def detects_edges_with_cursors():
+        assert get_selection(
+            "{ letters { nodes edges { cursor } } }"
+        ) == ConnectionSelection(edges=True, nodes=True, cursors=True)
+
+    def detects_total_count_only():
+        assert get_selection(
+            "{ letters(first: 2) { totalCount } }"
+        ) == ConnectionSelection(edges=False, nodes=False, cursors=False)
+
+    def assumes_unknown_fields_need_edges():
+        assert get_selection("{ letters { totalCount label } }") == (
+            ConnectionSelection(edges=True, nodes=False, cursors=False)
+        )
+
+    def looks_into_fragments():
+        source = """
+            {
+              letters {
+                ... on LetterConnection { pageInfo { hasNextPage } }
+                ...LetterEdges
+                ...LetterEdges
+              }
+            }
+            fragment LetterEdges on LetterConnection {
+              edges { ... on LetterEdge { node } ...LetterCursor }
+            }
+            fragment LetterCursor on LetterEdge { cursor }
+            """
+        assert get_selection(source) == ConnectionSelection(
+            edges=True, nodes=False, cursors=True
+        )
+
+
+def describe_connection_from_array_with_selection():
+    def does_not_slice_data_if_only_page_info_is_selected():
+        data = Letters(letters)
+        selection = ConnectionSelection(edges=False, nodes=False, cursors=False)
+        c = connection_from_array(data, dict(first=2), selection=selection)
+        assert isinstance(c, SliceConnection)
+        assert not data.sliced
+        assert c.pageInfo == connection_from_array(letters, dict(first=2)).pageInfo
+
+    def creates_only_nodes_if_edges_are_not_selected():
+        data = Letters(letters)
+        selection = ConnectionSelection(edges=False, nodes=True, cursors=False)
+        c = connection_from_array(data, dict(last=2), selection=selection)
+        assert isinstance(c, SliceConnection)
+        assert data.sliced
+        assert c.nodes == ["D", "E"]
+        assert c.pageInfo == connection_from_array(letters, dict(last=2)).pageInfo
+
+    def creates_edges_with_lazy_cursors_if_cursors_are_not_selected():
+        selection = ConnectionSelection(edges=True, nodes=False, cursors=False)
+        c = connection_from_array(letters, dict(first=2), selection=selection)
+        assert c.edges == [OffsetEdge("A", 0), OffsetEdge("B", 1)]
+        assert c.pageInfo == connection_from_array(letters, dict(first=2)).pageInfo
+
+    def creates_full_connection_if_cursors_are_selected():
+        selection = ConnectionSelection(edges=True, nodes=False, cursors=True)
+        c = connection_from_array(letters, dict(first=2), selection=selection)
+        assert c == connection_from_array(letters, dict(first=2))
+        assert not isinstance(c.edges[0], OffsetEdge)
+
+    def resolves_queries_using_the_selection():
+        def resolve(_obj, info, **args):
+            return connection_from_array(
+                letters, args, selection=get_connection_selection(info)
+            )
+
+        schema = GraphQLSchema(
+            GraphQLObjectType(
+                "Query",
+                lambda: {
+                    "letters": GraphQLField(
+                        letter_connection, args=connection_args, resolve=resolve
+                    )
+                },
+            )
+        )
+        source = """
+            {
+              letters(first: 2) {
+                nodes
+                edges { node }
+                pageInfo { startCursor hasNextPage }
+              }
+            }
+            """
+        assert graphql_sync(schema, source) == (
+            {
+                "letters": {
+                    "nodes": ["A", "B"],
+                    "edges": [{"node": "A"}, {"node": "B"}],
+                    "pageInfo": {
+                        "startCursor": "YXJyYXljb25uZWN0aW9uOjA=",
+                        "hasNextPage": True,
+                    },
+                }
+            },
+            None,
+        )
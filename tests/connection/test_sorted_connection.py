@@ -0,0 +1,165 @@
+from typing import Any, List, NamedTuple
+
+from graphql_relay import (
+    connection_from_sorted_array,
+    cursor_for_object_in_sorted_connection,
+    get_cursor_codec,
+    key_to_cursor,
+    Connection,
+    Edge,
+    EdgeType,
+    PageInfo,
+    SortedSequenceSource,
+)
+
+
+class Event(NamedTuple):
+    time: int
+    name: str
+
+
+events = [Event(time, name) for time, name in zip(range(10, 60, 10), "ABCDE")]
+
+
+def get_time(event: Event) -> int:
+    return event.time
+
+
+class CountingKey:
+    """A key function that counts how often it is called."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, event: Event) -> int:
+        self.calls += 1
+        return event.time
+
+
+def connection(
+    nodes: List[Event], has_previous_page: bool = False, has_next_page: bool = False
+) -> Connection:
+    edges: List[EdgeType] = [
+        Edge(node=node, cursor=key_to_cursor(node.time)) for node in nodes
+    ]
+    return Connection(
+        edges=edges,
+        pageInfo=PageInfo(
+            startCursor=edges[0].cursor if edges else None,
+            endCursor=edges[-1].cursor if edges else None,
+            hasPreviousPage=has_previous_page,
+            hasNextPage=has_next_page,
+        ),
+    )
+
+
+event_a, event_b, event_c, event_d, event_e = events
+
+
+def describe_sorted_sequence_source():
+    def fetches_nodes_between_keys():
+        source = SortedSequenceSource(events, get_time)
+        assert source.fetch(None, None, None, False) == events
+        assert source.fetch(20, 50, None, False) == [event_c, event_d]
+        assert source.fetch(15, 45, None, False) == [event_b, event_c, event_d]
+        assert source.fetch(20, None, 2, False) == [event_c, event_d]
+        assert source.fetch(None, 40, 2, True) == [event_c, event_b]
+        assert source.fetch(40, 20, None, False) == []
+        assert source.fetch(None, None, 0, False) == []
+
+    def uses_binary_search():
+        key = CountingKey()
+        many_events = [Event(time, "") for time in range(100_000)]
+        source = SortedSequenceSource(many_events, key)
+        assert source.fetch(50_000, None, 1, False) == [Event(50_001, "")]
+        assert key.calls <= 20
+
+    def uses_nodes_as_keys_by_default():
+        source = SortedSequenceSource([1, 3, 5, 7])
+        assert source.fetch(3, None, None, False) == [5, 7]
+        assert source.fetch(None, 5, None, True) == [3, 1]
+
+
+def describe_connection_from_sorted_array():
+    def returns_all_elements_without_filters():
+        c = connection_from_sorted_array(events, {}, get_time)
+        assert c == connection(events)
+
+    def respects_first_and_after():
+        c = connection_from_sorted_array(
+            events, dict(first=2, after=key_to_cursor(20)), get_time
+        )
+        assert c == connection([event_c, event_d], has_next_page=True)
+
+    def respects_last_and_before():
+        c = connection_from_sorted_array(
+            events, dict(last=2, before=key_to_cursor(40)), get_time
+        )
+        assert c == connection([event_b, event_c], has_previous_page=True)
+
+    def accepts_cursors_of_removed_nodes():
+        data = [event for event in events if event is not event_b]
+        c = connection_from_sorted_array(
+            data, dict(first=1, after=key_to_cursor(20)), get_time
+        )
+        assert c == connection([event_c], has_next_page=True)
+
+    def ignores_invalid_cursors():
+        c = connection_from_sorted_array(
+            events, dict(first=1, after="invalid"), get_time
+        )
+        assert c == connection([event_a], has_next_page=True)
+
+    def ignores_cursors_with_keys_of_a_different_type():
+        for cursor in [key_to_cursor("x"), key_to_cursor((1, 2))]:
+            c = connection_from_sorted_array(
+                events, dict(first=1, after=cursor), get_time
+            )
+            assert c == connection([event_a], has_next_page=True)
+            c = connection_from_sorted_array(
+                events, dict(last=1, before=cursor), get_time
+            )
+            assert c == connection([event_e], has_previous_page=True)
+
+    def supports_composite_keys():
+        def composite_key(event: Event) -> Any:
+            return (event.name, event.time)
+
+        c = connection_from_sorted_array(
+            events,
+            dict(first=1, after=key_to_cursor(("B", 20))),
+            composite_key,
+            cursor_codec=get_cursor_codec("keyset"),
+        )
+        assert c.edges == [Edge(node=event_c, cursor=key_to_cursor(("C", 30)))]
+
+
+def describe_cursor_for_object_in_sorted_connection():
+    def returns_the_cursor_of_a_member_object():
+        cursor = cursor_for_object_in_sorted_connection(events, event_c, get_time)
+        assert cursor == key_to_cursor(30)
+
+    def returns_null_for_a_non_member_object():
+        for event in [Event(5, ""), Event(35, ""), Event(60, "")]:
+            assert (
+                cursor_for_object_in_sorted_connection(events, event, get_time) is None
+            )
+
+    def returns_null_for_an_object_with_a_key_of_a_different_type():
+        assert cursor_for_object_in_sorted_connection([1, 2, 3], "x") is None
+
+    def uses_binary_search():
+        key = CountingKey()
+        many_events = [Event(time, "") for time in range(100_000)]
+        cursor = cursor_for_object_in_sorted_connection(
+            many_events, Event(12_345, ""), key
+        )
+        assert cursor == key_to_cursor(12_345)
+        assert key.calls <= 20
+
+    def can_use_a_cursor_codec():
+        codec = get_cursor_codec("keyset")
+        cursor = cursor_for_object_in_sorted_connection(
+            [1, 2, 3], 2, cursor_codec=codec
+        )
+        assert cursor == key_to_cursor(2)
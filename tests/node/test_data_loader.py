@@ -0,0 +1,137 @@
+from asyncio import sleep
+from typing import Any, Dict, List
+
+from pytest import mark, raises
+
+from graphql.pyutils import is_awaitable
+
+from graphql_relay import DataLoader
+
+
+class Backend:
+    """A batch load function recording the batches."""
+
+    def __init__(self) -> None:
+        self.batches: List[List[Any]] = []
+
+    def load_squares(self, keys: List[int]) -> List[int]:
+        self.batches.append(keys)
+        return [key * key for key in keys]
+
+    async def load_squares_async(self, keys: List[int]) -> Dict[int, int]:
+        self.batches.append(keys)
+        await sleep(0)
+        return {key: key * key for key in keys if key >= 0}
+
+    def fail(self, keys: List[int]) -> List[int]:
+        self.batches.append(keys)
+        raise RuntimeError("Cannot load.")
+
+
+def describe_data_loader():
+    @mark.asyncio
+    async def loads_keys_of_the_same_tick_in_one_batch():
+        backend = Backend()
+        loader = DataLoader(backend.load_squares)
+        one, two = loader.load(1), loader.load(2)
+        assert await loader.load_many([3, 1, 2]) == [9, 1, 4]
+        assert await one == 1
+        assert await two == 4
+        assert backend.batches == [[1, 2, 3]]
+        assert await loader.load(4) == 16
+        assert backend.batches == [[1, 2, 3], [4]]
+
+    @mark.asyncio
+    async def accepts_async_batch_functions_returning_mappings():
+        backend = Backend()
+        loader = DataLoader(backend.load_squares_async)
+        assert await loader.load_many([2, -1, 3]) == [4, None, 9]
+        assert backend.batches == [[2, -1, 3]]
+
+    @mark.asyncio
+    async def passes_the_info_of_the_first_key_of_a_batch():
+        infos: List[Any] = []
+
+        def load_with_info(keys: List[int], info: Any) -> List[int]:
+            infos.append(info)
+            return keys
+
+        loader = DataLoader(load_with_info)
+        one = loader.load(1, "first")
+        assert await loader.load_many([2, 3], "second") == [2, 3]
+        assert await one == 1
+        assert await loader.load(4, "third") == 4
+        assert infos == ["first", "third"]
+
+    @mark.asyncio
+    async def caches_values():
+        backend = Backend()
+        loader = DataLoader(backend.load_squares)
+        assert await loader.load(2) == 4
+        assert await loader.load_many([2, 3]) == [4, 9]
+        assert backend.batches == [[2], [3]]
+        loader.prime(4, 42)
+        assert await loader.load(4) == 42
+        assert repr(loader) == "<DataLoader with 3 cached values>"
+        loader.clear(2)
+        assert await loader.load(2) == 4
+        loader.clear()
+        assert await loader.load(3) == 9
+        assert backend.batches == [[2], [3], [2], [3]]
+
+    @mark.asyncio
+    async def can_disable_the_cache():
+        backend = Backend()
+        loader = DataLoader(backend.load_squares, cache=False)
+        assert await loader.load_many([2, 2]) == [4, 4]
+        assert await loader.load(2) == 4
+        loader.prime(3, 42)
+        assert await loader.load(3) == 9
+        assert backend.batches == [[2], [2], [3]]
+
+    @mark.asyncio
+    async def propagates_errors_without_caching_them():
+        backend = Backend()
+        loader = DataLoader(backend.fail)
+        with raises(RuntimeError) as exc_info:
+            await loader.load(1)
+        assert str(exc_info.value) == "Cannot load."
+        loader.batch_load = backend.load_squares
+        assert await loader.load(1) == 1
+        assert backend.batches == [[1], [1]]
+
+    @mark.asyncio
+    async def ignores_cancelled_loads():
+        backend = Backend()
+        loader = DataLoader(backend.load_squares)
+        one, two = loader.load(1), loader.load(2)
+        one.cancel()
+        assert await two == 4
+        assert one.cancelled()
+        assert backend.batches == [[1, 2]]
+
+    @mark.asyncio
+    async def ignores_cancelled_loads_when_propagating_errors():
+        backend = Backend()
+        loader = DataLoader(backend.fail, cache=False)
+        one, two = loader.load(1), loader.load(2)
+        one.cancel()
+        with raises(RuntimeError) as exc_info:
+            await two
+        assert str(exc_info.value) == "Cannot load."
+        assert one.cancelled()
+        assert backend.batches == [[1, 2]]
+
+    @mark.asyncio
+    async def can_load_within_an_event_loop():
+        assert DataLoader.can_load()
+
+    @mark.asyncio
+    async def cannot_load_if_futures_are_not_awaited():
+        assert DataLoader.can_load(is_awaitable)
+        assert not DataLoader.can_load(lambda _value: False)
+
+    def cannot_load_without_an_event_loop():
+        assert not DataLoader.can_load()
+        with raises(RuntimeError):
+            DataLoader(Backend().load_squares).load(1)
@@ -13,7 +13,12 @@ from graphql import (
     GraphQLString,
 )
 
-from graphql_relay import from_global_id, global_id_field, node_definitions
+from graphql_relay import (
+    from_global_id,
+    global_id_field,
+    node_definitions,
+    to_global_id,
+)
 
 
 class User(NamedTuple):
@@ -214,3 +219,21 @@ def describe_global_id_fields():
         assert from_global_id("Og==") == ("", "")
         assert from_global_id("bad!") == ("", "")
         assert from_global_id("invalid") == ("", "")
+
+    def rejects_overly_long_global_ids_without_decoding(monkeypatch):
+        from graphql_relay.node import node
+
+        def fail_to_decode(s):  # pragma: no cover
+            raise RuntimeError("Should not be decoded.")
+
+        long_id = to_global_id("User", "x" * 1000)
+        assert len(long_id) > node.MAX_GLOBAL_ID_LENGTH
+        assert from_global_id(long_id, max_length=len(long_id)) == (
+            "User",
+            "x" * 1000,
+        )
+        monkeypatch.setattr(node, "unbase64", fail_to_decode)
+        assert from_global_id(long_id) == ("", "")
+        assert from_global_id("Zm9vOmJhcg==", max_length=11) == ("", "")
+        monkeypatch.setattr(node, "MAX_GLOBAL_ID_LENGTH", 11)
+        assert from_global_id("Zm9vOmJhcg==") == ("", "")
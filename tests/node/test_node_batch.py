@@ -0,0 +1,611 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import current_thread, Barrier
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from pytest import mark, raises
+
+from graphql import (
+    graphql,
+    graphql_sync,
+    GraphQLField,
+    GraphQLID,
+    GraphQLInt,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLResolveInfo,
+    GraphQLSchema,
+    GraphQLString,
+)
+
+from graphql_relay import global_id_field, node_definitions, to_global_id
+
+
+class User(NamedTuple):
+    id: str
+    name: str
+
+
+class Photo(NamedTuple):
+    id: str
+    width: int
+
+
+user_data = {
+    "1": User(id="1", name="John Doe"),
+    "2": User(id="2", name="Jane Smith"),
+    "3": User(id="3", name="Joe Bloggs"),
+}
+
+photo_data = {"1": Photo(id="1", width=300), "2": Photo(id="2", width=400)}
+
+
+class Fetchers:
+    """Fetch functions recording the IDs they were called with.
+
+    The fetch functions wait until the given number of parties is waiting,
+    so that they can only finish when they are run concurrently.
+    """
+
+    def __init__(self, parties: int = 1) -> None:
+        self.fetched: List[str] = []
+        self.batches: List[Tuple[str, List[str]]] = []
+        self.barrier = Barrier(parties, timeout=5)
+        self.threads: Set[str] = set()
+
+    def wait(self) -> None:
+        self.threads.add(current_thread().name)
+        self.barrier.wait()
+
+    @property
+    def type_fetchers(self) -> Dict[str, Any]:
+        return {"User": self.fetch_users, "Photo": self.fetch_photos}
+
+    def fetch_user(self, id_: str, _info: GraphQLResolveInfo) -> Optional[User]:
+        self.wait()
+        self.fetched.append(id_)
+        if id_ == "fail":
+            raise RuntimeError("Cannot fetch.")
+        return user_data.get(id_)
+
+    def fetch_users(
+        self, ids: List[str], _info: GraphQLResolveInfo
+    ) -> List[Optional[User]]:
+        self.wait()
+        self.batches.append(("User", ids))
+        return [user_data.get(id_) for id_ in ids]
+
+    def fetch_users_as_dict(
+        self, ids: List[str], _info: GraphQLResolveInfo
+    ) -> Dict[str, User]:
+        self.wait()
+        self.batches.append(("User", ids))
+        return {id_: user_data[id_] for id_ in ids if id_ in user_data}
+
+    def fetch_photos(
+        self, ids: List[str], _info: GraphQLResolveInfo
+    ) -> Dict[str, Photo]:
+        self.wait()
+        self.batches.append(("Photo", ids))
+        return {id_: photo_data[id_] for id_ in ids if id_ in photo_data}
+
+    async def fetch_user_async(
+        self, id_: str, info: GraphQLResolveInfo
+    ) -> Optional[User]:
+        return self.fetch_user(id_, info)
+
+    async def fetch_users_async(
+        self, ids: List[str], info: GraphQLResolveInfo
+    ) -> Dict[str, User]:
+        return self.fetch_users_as_dict(ids, info)
+
+    async def fetch_photos_async(
+        self, ids: List[str], info: GraphQLResolveInfo
+    ) -> Dict[str, Photo]:
+        return self.fetch_photos(ids, info)
+
+
+def create_schema(**options: Any) -> GraphQLSchema:
+    """Create a schema with users and photos using the given node definitions.
+
+    The options are passed to `node_definitions`. The nodes have global IDs
+    if `type_fetchers` are passed, otherwise they have the plain IDs.
+    """
+    global_ids = "type_fetchers" in options
+    user_type: GraphQLObjectType
+    photo_type: GraphQLObjectType
+
+    node_interface, node_field, nodes_field = node_definitions(
+        type_resolver=lambda obj, _info, _type: (
+            user_type if isinstance(obj, User) else photo_type
+        ).name,
+        **options,
+    )
+
+    def id_field() -> GraphQLField:
+        return (
+            global_id_field() if global_ids else GraphQLField(GraphQLNonNull(GraphQLID))
+        )
+
+    def resolve_friend(user: User, info: GraphQLResolveInfo) -> Any:
+        id_ = str(int(user.id) % 3 + 1)
+        if global_ids:
+            id_ = to_global_id("User", id_)
+        return node_field.resolve(user, info, id=id_)  # type: ignore
+
+    user_type = GraphQLObjectType(
+        "User",
+        lambda: {
+            "id": id_field(),
+            "name": GraphQLField(GraphQLString),
+            "friend": GraphQLField(node_interface, resolve=resolve_friend),
+        },
+        interfaces=[node_interface],
+    )
+
+    photo_type = GraphQLObjectType(
+        "Photo",
+        lambda: {"id": id_field(), "width": GraphQLField(GraphQLInt)},
+        interfaces=[node_interface],
+    )
+
+    query_type = GraphQLObjectType(
+        "Query", lambda: {"node": node_field, "nodes": nodes_field}
+    )
+
+    return GraphQLSchema(query=query_type, types=[user_type, photo_type])
+
+
+class Request:
+    """A context object for a request."""
+
+
+user_source = """
+  {
+    node(id: "1") {
+      ... on User {
+        name
+        friend {
+          ... on User {
+            name
+          }
+        }
+      }
+    }
+    nodes(ids: ["2", "1", "2", "5", "5"]) {
+      ... on User {
+        name
+      }
+    }
+  }
+"""
+
+user_expected = (
+    {
+        "node": {"name": "John Doe", "friend": {"name": "Jane Smith"}},
+        "nodes": [
+            {"name": "Jane Smith"},
+            {"name": "John Doe"},
+            {"name": "Jane Smith"},
+            None,
+            None,
+        ],
+    },
+    None,
+)
+
+user_1, user_3 = to_global_id("User", "1"), to_global_id("User", "3")
+photo_1, photo_2 = to_global_id("Photo", "1"), to_global_id("Photo", "2")
+unknown_1 = to_global_id("Unknown", "1")
+
+mixed_source = f"""
+  {{
+    nodes(ids: [
+      "{photo_2}", "{user_1}", "{unknown_1}", "{photo_1}", "{user_3}", "{photo_2}"
+    ]) {{
+      id
+      ... on User {{
+        name
+      }}
+      ... on Photo {{
+        width
+      }}
+    }}
+  }}
+"""
+
+mixed_expected = (
+    {
+        "nodes": [
+            {"id": photo_2, "width": 400},
+            {"id": user_1, "name": "John Doe"},
+            None,
+            {"id": photo_1, "width": 300},
+            {"id": user_3, "name": "Joe Bloggs"},
+            {"id": photo_2, "width": 400},
+        ]
+    },
+    None,
+)
+
+
+def describe_node_definitions_with_batch_fetcher():
+    def fetches_nodes_with_a_single_call_returning_a_mapping():
+        fetchers = Fetchers()
+        schema = create_schema(
+            fetch_by_id=fetchers.fetch_user,
+            fetch_by_ids=fetchers.fetch_users_as_dict,
+        )
+        assert graphql_sync(schema, user_source) == user_expected
+        assert fetchers.batches == [("User", ["2", "1", "5"])]
+        assert fetchers.fetched == ["1", "2"]
+
+    def fetches_nodes_with_a_single_call_returning_a_sequence():
+        fetchers = Fetchers()
+        schema = create_schema(
+            fetch_by_id=fetchers.fetch_user, fetch_by_ids=fetchers.fetch_users
+        )
+        assert graphql_sync(schema, user_source) == user_expected
+        assert fetchers.batches == [("User", ["2", "1", "5"])]
+        assert fetchers.fetched == ["1", "2"]
+
+    def fetches_no_nodes_for_empty_ids():
+        fetchers = Fetchers()
+        schema = create_schema(
+            fetch_by_id=fetchers.fetch_user, fetch_by_ids=fetchers.fetch_users
+        )
+        assert graphql_sync(schema, "{ nodes(ids: []) { id } }") == (
+            {"nodes": []},
+            None,
+        )
+        assert fetchers.batches == [("User", [])]
+
+    @mark.asyncio
+    async def fetches_nodes_with_a_single_async_call():
+        fetchers = Fetchers()
+        schema = create_schema(
+            fetch_by_id=fetchers.fetch_user, fetch_by_ids=fetchers.fetch_users_async
+        )
+        assert await graphql(schema, user_source) == user_expected
+        assert fetchers.batches == [("User", ["2", "1", "5"])]
+        assert fetchers.fetched == ["1", "2"]
+
+
+def describe_node_definitions_with_type_fetchers():
+    def fetches_nodes_with_one_call_per_type():
+        fetchers = Fetchers()
+        schema = create_schema(type_fetchers=fetchers.type_fetchers)
+        assert graphql_sync(schema, mixed_source) == mixed_expected
+        assert fetchers.batches == [("Photo", ["2", "1"]), ("User", ["1", "3"])]
+
+    def fetches_a_single_node():
+        fetchers = Fetchers()
+        schema = create_schema(type_fetchers=fetchers.type_fetchers)
+        source = f'{{ node(id: "{photo_1}") {{ id ... on Photo {{ width }} }} }}'
+        assert graphql_sync(schema, source) == (
+            {"node": {"id": photo_1, "width": 300}},
+            None,
+        )
+        source = f'{{ node(id: "{unknown_1}") {{ id }} }}'
+        assert graphql_sync(schema, source) == ({"node": None}, None)
+        assert fetchers.batches == [("Photo", ["1"])]
+
+    @mark.asyncio
+    async def awaits_async_fetchers_concurrently():
+        fetchers = Fetchers()
+        schema = create_schema(
+            type_fetchers={
+                "User": fetchers.fetch_users,
+                "Photo": fetchers.fetch_photos_async,
+            }
+        )
+        assert await graphql(schema, mixed_source) == mixed_expected
+        assert sorted(fetchers.batches) == [("Photo", ["2", "1"]), ("User", ["1", "3"])]
+        source = f'{{ node(id: "{photo_2}") {{ id }} }}'
+        assert await graphql(schema, source) == ({"node": {"id": photo_2}}, None)
+
+    def prefers_a_given_fetch_function_for_the_node_field():
+        fetchers = Fetchers()
+        fetched: List[str] = []
+
+        def fetch_node(id_: str, _info: GraphQLResolveInfo) -> Any:
+            fetched.append(id_)
+            return photo_data["1"]
+
+        schema = create_schema(
+            fetch_by_id=fetch_node, type_fetchers=fetchers.type_fetchers
+        )
+        source = f'{{ node(id: "{user_1}") {{ id }} }}'
+        assert graphql_sync(schema, source) == ({"node": {"id": photo_1}}, None)
+        assert fetched == [user_1]
+        assert graphql_sync(schema, mixed_source) == mixed_expected
+        assert fetched == [user_1]
+        assert fetchers.batches == [("Photo", ["2", "1"]), ("User", ["1", "3"])]
+
+    def prefers_a_given_batch_function_for_the_nodes_field():
+        fetchers = Fetchers()
+        batches: List[List[str]] = []
+
+        def fetch_nodes(ids: List[str], _info: GraphQLResolveInfo) -> List[Any]:
+            batches.append(ids)
+            return [photo_data["1"] for _id in ids]
+
+        schema = create_schema(
+            fetch_by_ids=fetch_nodes, type_fetchers=fetchers.type_fetchers
+        )
+        source = f'{{ nodes(ids: ["{user_1}", "{user_1}"]) {{ id }} }}'
+        assert graphql_sync(schema, source) == (
+            {"nodes": [{"id": photo_1}, {"id": photo_1}]},
+            None,
+        )
+        assert batches == [[user_1]]
+        assert fetchers.batches == []
+        source = f'{{ node(id: "{user_1}") {{ id }} }}'
+        assert graphql_sync(schema, source) == ({"node": {"id": user_1}}, None)
+        assert batches == [[user_1]]
+        assert fetchers.batches == [("User", ["1"])]
+
+    def needs_a_fetch_function_or_type_fetchers():
+        with raises(TypeError) as exc_info:
+            node_definitions()
+        assert str(exc_info.value) == (
+            "Either fetch_by_id or type_fetchers must be passed."
+        )
+
+
+def describe_node_definitions_with_batch_loading():
+    @mark.asyncio
+    async def collects_node_fetches_of_a_request():
+        fetchers = Fetchers()
+        schema = create_schema(type_fetchers=fetchers.type_fetchers, batch_loading=True)
+        source = f"""
+          {{
+            first: node(id: "{user_1}") {{
+              id
+            }}
+            second: node(id: "{photo_1}") {{
+              id
+            }}
+            all: nodes(ids: ["{user_1}", "{user_3}", "{unknown_1}"]) {{
+              ... on User {{
+                name
+                friend {{
+                  ... on User {{
+                    name
+                  }}
+                }}
+              }}
+            }}
+          }}
+        """
+        result = await graphql(schema, source, context_value=Request())
+        assert result == (
+            {
+                "first": {"id": user_1},
+                "second": {"id": photo_1},
+                "all": [
+                    {"name": "John Doe", "friend": {"name": "Jane Smith"}},
+                    {"name": "Joe Bloggs", "friend": {"name": "John Doe"}},
+                    None,
+                ],
+            },
+            None,
+        )
+        assert sorted(fetchers.batches) == [
+            ("Photo", ["1"]),
+            ("User", ["1", "3"]),
+            ("User", ["2"]),
+        ]
+
+    @mark.asyncio
+    async def passes_the_info_of_the_first_field_of_each_batch():
+        fetchers = Fetchers()
+        paths: List[List[Any]] = []
+
+        def fetch_users(ids: List[str], info: GraphQLResolveInfo) -> List[Any]:
+            paths.append(info.path.as_list())
+            return fetchers.fetch_users(ids, info)
+
+        schema = create_schema(type_fetchers={"User": fetch_users}, batch_loading=True)
+        source = f"""
+          {{
+            node(id: "{user_1}") {{
+              ... on User {{
+                friend {{
+                  id
+                }}
+              }}
+            }}
+          }}
+        """
+        result = await graphql(schema, source, context_value=Request())
+        assert result == (
+            {"node": {"friend": {"id": to_global_id("User", "2")}}},
+            None,
+        )
+        assert paths == [["node"], ["node", "friend"]]
+
+    @mark.asyncio
+    async def caches_nodes_per_request():
+        fetchers = Fetchers()
+        schema = create_schema(type_fetchers=fetchers.type_fetchers, batch_loading=True)
+        source = f'{{ node(id: "{user_1}") {{ id }} }}'
+        context: Dict[str, Any] = {}
+        assert await graphql(schema, source, context_value=context) == (
+            {"node": {"id": user_1}},
+            None,
+        )
+        assert await graphql(schema, source, context_value=context) == (
+            {"node": {"id": user_1}},
+            None,
+        )
+        assert await graphql(schema, source, context_value={}) == (
+            {"node": {"id": user_1}},
+            None,
+        )
+        assert fetchers.batches == [("User", ["1"]), ("User", ["1"])]
+
+    @mark.asyncio
+    async def fetches_without_loader_if_context_cannot_hold_it():
+        fetchers = Fetchers()
+        schema = create_schema(type_fetchers=fetchers.type_fetchers, batch_loading=True)
+        source = (
+            f'{{ a: node(id: "{user_1}") {{ id }} b: node(id: "{user_3}") {{ id }} }}'
+        )
+        assert await graphql(schema, source) == (
+            {"a": {"id": user_1}, "b": {"id": user_3}},
+            None,
+        )
+        assert fetchers.batches == [("User", ["1"]), ("User", ["3"])]
+
+    def fetches_without_loader_if_executed_synchronously():
+        fetchers = Fetchers()
+        schema = create_schema(type_fetchers=fetchers.type_fetchers, batch_loading=True)
+        source = f'{{ nodes(ids: ["{user_1}", "{photo_2}"]) {{ id }} }}'
+        assert graphql_sync(schema, source, context_value=Request()) == (
+            {"nodes": [{"id": user_1}, {"id": photo_2}]},
+            None,
+        )
+        assert fetchers.batches == [("User", ["1"]), ("Photo", ["2"])]
+
+    @mark.asyncio
+    async def fetches_without_loader_if_executed_synchronously_in_an_event_loop():
+        fetchers = Fetchers()
+        schema = create_schema(type_fetchers=fetchers.type_fetchers, batch_loading=True)
+        source = f'{{ nodes(ids: ["{user_1}", "{photo_2}"]) {{ id }} }}'
+        assert graphql_sync(schema, source, context_value=Request()) == (
+            {"nodes": [{"id": user_1}, {"id": photo_2}]},
+            None,
+        )
+        assert fetchers.batches == [("User", ["1"]), ("Photo", ["2"])]
+
+    def needs_a_batch_function():
+        with raises(TypeError) as exc_info:
+            node_definitions(lambda id_, info: None, batch_loading=True)
+        assert str(exc_info.value) == (
+            "Batch loading needs fetch_by_ids or type_fetchers."
+        )
+
+
+def describe_node_definitions_with_executor():
+    def runs_type_fetchers_concurrently():
+        fetchers = Fetchers(2)
+        with ThreadPoolExecutor(2) as executor:
+            schema = create_schema(
+                type_fetchers=fetchers.type_fetchers, executor=executor
+            )
+            assert graphql_sync(schema, mixed_source) == mixed_expected
+        assert len(fetchers.threads) == 2
+
+    def runs_single_fetches_concurrently():
+        fetchers = Fetchers(3)
+        with ThreadPoolExecutor(3) as executor:
+            schema = create_schema(fetch_by_id=fetchers.fetch_user, executor=executor)
+            source = '{ nodes(ids: ["3", "1", "3", "5"]) { ... on User { name } } }'
+            assert graphql_sync(schema, source) == (
+                {
+                    "nodes": [
+                        {"name": "Joe Bloggs"},
+                        {"name": "John Doe"},
+                        {"name": "Joe Bloggs"},
+                        None,
+                    ]
+                },
+                None,
+            )
+            assert len(fetchers.threads) == 3
+
+            # a single ID is fetched directly
+            fetchers.threads.clear()
+            fetchers.barrier = Barrier(1)
+            source = '{ nodes(ids: ["1", "1"]) { ... on User { name } } }'
+            assert graphql_sync(schema, source) == (
+                {"nodes": [{"name": "John Doe"}, {"name": "John Doe"}]},
+                None,
+            )
+            assert fetchers.threads == {current_thread().name}
+
+    def cannot_use_executor_with_a_batch_function():
+        with ThreadPoolExecutor(2) as executor, raises(TypeError) as exc_info:
+            node_definitions(
+                lambda id_, info: None,
+                fetch_by_ids=lambda ids, info: [],
+                executor=executor,
+            )
+        assert str(exc_info.value) == "An executor cannot be used with fetch_by_ids."
+
+
+def describe_node_definitions_with_identity_map():
+    def fetches_every_id_only_once_per_request():
+        fetchers = Fetchers()
+        schema = create_schema(fetch_by_id=fetchers.fetch_user, identity_map=True)
+        assert graphql_sync(schema, user_source, context_value={}) == user_expected
+        assert fetchers.fetched == ["1", "2", "5"]
+        assert (
+            graphql_sync(schema, user_source, context_value=Request()) == user_expected
+        )
+        assert fetchers.fetched == ["1", "2", "5"] * 2
+
+    def fetches_missing_ids_with_the_batch_function():
+        fetchers = Fetchers()
+        schema = create_schema(
+            fetch_by_id=fetchers.fetch_user,
+            fetch_by_ids=fetchers.fetch_users,
+            identity_map=True,
+        )
+        assert graphql_sync(schema, user_source, context_value={}) == user_expected
+        assert fetchers.fetched == ["1", "2"]
+        assert fetchers.batches == [("User", ["5"])]
+
+    def does_not_fetch_nodes_that_are_all_remembered():
+        fetchers = Fetchers()
+        schema = create_schema(
+            fetch_by_id=fetchers.fetch_user,
+            fetch_by_ids=fetchers.fetch_users,
+            identity_map=True,
+        )
+        source = '{ node(id: "1") { id } nodes(ids: ["1", "1"]) { id } }'
+        assert graphql_sync(schema, source, context_value={}) == (
+            {"node": {"id": "1"}, "nodes": [{"id": "1"}, {"id": "1"}]},
+            None,
+        )
+        assert fetchers.fetched == ["1"]
+        assert fetchers.batches == []
+
+    def fetches_without_identity_map_if_context_cannot_hold_it():
+        fetchers = Fetchers()
+        schema = create_schema(fetch_by_id=fetchers.fetch_user, identity_map=True)
+        assert graphql_sync(schema, user_source) == user_expected
+        assert fetchers.fetched == ["1", "2", "2", "1", "2", "5", "5"]
+
+    @mark.asyncio
+    async def remembers_async_fetches():
+        fetchers = Fetchers()
+        schema = create_schema(fetch_by_id=fetchers.fetch_user_async, identity_map=True)
+        assert await graphql(schema, user_source, context_value={}) == user_expected
+        assert sorted(fetchers.fetched) == ["1", "2", "5"]
+
+    @mark.asyncio
+    async def remembers_async_batch_fetches():
+        fetchers = Fetchers()
+        schema = create_schema(
+            fetch_by_id=fetchers.fetch_user_async,
+            fetch_by_ids=fetchers.fetch_users_async,
+            identity_map=True,
+        )
+        assert await graphql(schema, user_source, context_value={}) == user_expected
+        fetched = fetchers.fetched + [
+            id_ for _type, ids in fetchers.batches for id_ in ids
+        ]
+        assert sorted(fetched) == ["1", "2", "5"]
+
+    @mark.asyncio
+    async def forgets_failed_async_fetches():
+        fetchers = Fetchers()
+        schema = create_schema(fetch_by_id=fetchers.fetch_user_async, identity_map=True)
+        context: Dict[str, Any] = {}
+        source = '{ node(id: "fail") { id } }'
+        for _attempt in range(2):
+            result = await graphql(schema, source, context_value=context)
+            assert result.data == {"node": None}
+            assert result.errors and result.errors[0].message == "Cannot fetch."
+        assert fetchers.fetched == ["fail", "fail"]
@@ -1,3 +1,7 @@
+from base64 import b64decode, b64encode
+
+from pytest import raises
+
 from graphql_relay.utils import base64, unbase64
 
 
@@ -31,3 +35,27 @@ def describe_base64_conversion():
         assert unbase64(bytes_example_code) == example_unicode  # type: ignore
         bytearray_example_code = bytearray(bytes_example_code)
         assert unbase64(bytearray_example_code) == example_unicode  # type: ignore
+
+    def matches_the_base64_module():
+        for s in ["", "a", "ab", "abc", "arrayconnection:42", example_unicode]:
+            encoded = b64encode(s.encode("utf-8")).decode("ascii")
+            assert base64(s) == encoded
+            for invalid_or_not in [
+                encoded,
+                encoded[1:],
+                encoded[:-1],
+                " " + encoded + "\n",
+                encoded + "=",
+                "!" + encoded,
+            ]:
+                try:
+                    decoded = b64decode(invalid_or_not).decode("utf-8")
+                except ValueError:
+                    decoded = ""
+                assert unbase64(invalid_or_not) == decoded
+
+    def raises_type_errors_for_other_types():
+        with raises(TypeError):
+            base64(None)  # type: ignore
+        with raises(TypeError):
+            unbase64(None)  # type: ignore
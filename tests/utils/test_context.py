@@ -0,0 +1,35 @@
+from typing import Any, Dict, NamedTuple
+
+from graphql_relay.utils import ContextStorage
+
+
+class Context:
+    pass
+
+
+class TupleContext(NamedTuple):
+    user: str
+
+
+def describe_context_storage():
+    def stores_values_in_dict_contexts():
+        storage = ContextStorage()
+        context: Dict[Any, Any] = {"user": "admin"}
+        value = storage.get(context, list)
+        assert value == []
+        assert storage.get(context, list) is value
+        assert context[storage] is value
+        assert ContextStorage().get(context, list) is not value
+
+    def stores_values_for_other_contexts():
+        storage = ContextStorage()
+        context = Context()
+        value = storage.get(context, list)
+        assert value == []
+        assert storage.get(context, list) is value
+        assert storage.get(Context(), list) is not value
+
+    def cannot_store_values_for_contexts_without_weak_references():
+        storage = ContextStorage()
+        assert storage.get(None, list) is None
+        assert storage.get(TupleContext("admin"), list) is None